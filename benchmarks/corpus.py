@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE: str = os.path.join(ROOT, "benchmarks", "baseline.json")
+VMS: List[int] = [5, 10, 20]
+# Relative increase of wall time or peak RSS over the baseline reported as a regression
+THRESHOLD: float = 0.10
+# Cases shorter than this are too noisy to flag on wall time
+MIN_SECONDS: float = 0.05
+PHASES: List[str] = ["parse", "plan", "cluster", "simulate"]
+
+
+def timed(owner: type, method: str, phases: Dict[str, float], phase: str) -> None:
+    function: Callable = getattr(owner, method)
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start: float = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            phases[phase] += time.perf_counter() - start
+
+    setattr(owner, method, wrapper)
+
+
+def run_case(dax: str, vms: int) -> Dict[str, Any]:
+    # Runs in a fresh interpreter, so that peak RSS belongs to this case alone
+    import resource
+    sys.path.insert(0, ROOT)
+    from cloudsim.core import CloudSim
+    from workflowsim.ClusteringEngine import ClusteringEngine
+    from workflowsim.WorkflowParser import WorkflowParser
+    from workflowsim.WorkflowPlanner import WorkflowPlanner
+    from workflowsim.experiment import Experiment
+
+    phases: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+    timed(WorkflowParser, "parse", phases, "parse")
+    timed(WorkflowPlanner, "process_planning", phases, "plan")
+    timed(ClusteringEngine, "process_clustering", phases, "cluster")
+    timed(ClusteringEngine, "process_data_staging", phases, "cluster")
+    # The future queue is replaced when the simulation finishes, read its serial before
+    events: List[int] = [0]
+    finish: Callable = CloudSim.finish_simulation
+
+    def finish_simulation() -> None:
+        events[0] = CloudSim.future.serial
+        finish()
+
+    CloudSim.finish_simulation = staticmethod(finish_simulation)
+
+    start: float = time.perf_counter()
+    result: Dict[str, Any] = Experiment.run({"dax": dax, "vms": vms})
+    wallTime: float = time.perf_counter() - start
+    phases["simulate"] = wallTime - phases["parse"] - phases["plan"] - phases["cluster"]
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss = rss // 1024 if sys.platform == "darwin" else rss
+    return {"dax": os.path.basename(dax), "vms": vms, "wallTime": wallTime, "phases": phases, "peakRssKb": rss,
+            "events": events[0], "jobs": result["jobs"], "makespan": result["makespan"], "digest": result["digest"]}
+
+
+def measure(dax: str, vms: int, repeat: int) -> Dict[str, Any]:
+    # Best of repeat runs, each in its own interpreter
+    best: Dict[str, Any] = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--case", dax, str(vms)],
+                             cwd=ROOT, capture_output=True, text=True, check=True)
+        result: Dict[str, Any] = json.loads(out.stdout.strip().splitlines()[-1])
+        if best is None or result["wallTime"] < best["wallTime"]:
+            best = result
+    return best
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float) -> List[str]:
+    # Slower or bigger than the baseline by more than threshold, or a different outcome
+    previous: Dict[tuple, Dict[str, Any]] = {(r["dax"], r["vms"]): r for r in baseline}
+    problems: List[str] = []
+    for r in results:
+        old: Dict[str, Any] = previous.get((r["dax"], r["vms"]))
+        if old is None:
+            continue
+        case: str = f"{r['dax']} vms={r['vms']}"
+        if r["wallTime"] > MIN_SECONDS and r["wallTime"] > old["wallTime"] * (1 + threshold):
+            problems.append(f"{case}: wall time {old['wallTime']:.3f}s -> {r['wallTime']:.3f}s")
+        if r["peakRssKb"] > old["peakRssKb"] * (1 + threshold):
+            problems.append(f"{case}: peak RSS {old['peakRssKb']} KB -> {r['peakRssKb']} KB")
+        if r["digest"] != old["digest"] or r["events"] != old["events"]:
+            problems.append(f"{case}: results changed, makespan {old['makespan']:.4f} -> {r['makespan']:.4f}, "
+                            f"events {old['events']} -> {r['events']}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark parse, plan, cluster and simulate over the DAX corpus")
+    parser.add_argument("dax", nargs="*", default=[os.path.join(ROOT, "data", "*.xml")],
+                        help="DAX files or glob patterns, all of data/ by default")
+    parser.add_argument("--vms", type=int, nargs="+", default=VMS, help="VM counts to run every DAX with")
+    parser.add_argument("-n", "--repeat", type=int, default=1, help="runs per case, the fastest is kept")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline to compare with")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="relative increase flagged as a regression")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--case", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case[0], int(args.case[1]))))
+        return
+
+    daxes: List[str] = sorted({path for pattern in args.dax for path in glob.glob(pattern)})
+    results: List[Dict[str, Any]] = []
+    if not args.json:
+        print(f"{'dax':<22}{'vms':>4}{'wall (s)':>10}" + "".join(f"{phase:>10}" for phase in PHASES)
+              + f"{'RSS (MB)':>10}{'events':>9}{'makespan':>14}")
+    for dax in daxes:
+        for vms in args.vms:
+            r: Dict[str, Any] = measure(dax, vms, args.repeat)
+            results.append(r)
+            if not args.json:
+                print(f"{r['dax']:<22}{vms:>4}{r['wallTime']:>10.3f}"
+                      + "".join(f"{r['phases'][phase]:>10.3f}" for phase in PHASES)
+                      + f"{r['peakRssKb'] / 1024:>10.1f}{r['events']:>9}{r['makespan']:>14.2f}", flush=True)
+
+    problems: List[str] = []
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as file:
+            problems = compare(results, json.load(file), args.threshold)
+    if args.json:
+        print(json.dumps({"results": results, "regressions": problems}, indent=2))
+    else:
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+    if args.save:
+        # Cases not run this time keep their baseline
+        saved: Dict[tuple, Dict[str, Any]] = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                saved = {(r["dax"], r["vms"]): r for r in json.load(file)}
+        saved.update({(r["dax"], r["vms"]): r for r in results})
+        with open(args.baseline, "w") as file:
+            json.dump(sorted(saved.values(), key=lambda r: (r["dax"], r["vms"])), file, indent=1)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
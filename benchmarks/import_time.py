@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# Modules a heft.py-style driver pulls in before the first event is simulated
+ENTRY_POINTS: List[str] = [
+    "heft",
+    "heftv1",
+    "workflowsim.WorkflowPlanner",
+    "workflowsim.WorkflowScheduler",
+    "workflowsim.failure",
+]
+
+# Optional heavy dependencies that should stay unloaded on the default path
+HEAVY_MODULES: List[str] = ["numpy", "scipy", "scipy.stats", "tabulate"]
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE: str = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, repeat: int) -> Dict:
+    samples: List[float] = []
+    loaded: List[str] = []
+    for _ in range(repeat):
+        # A fresh interpreter per sample, otherwise everything is already cached
+        out = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                             cwd=ROOT, capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        samples.append(result["elapsed"])
+        loaded = result["loaded"]
+    return {"module": module, "min": min(samples), "median": statistics.median(samples), "loaded": loaded}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure cold import time of the simulator entry points")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="fresh interpreters per entry point")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeat) for module in ENTRY_POINTS]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'module':<32}{'min (ms)':>10}{'median (ms)':>14}  heavy modules loaded")
+    for r in results:
+        print(f"{r['module']:<32}{r['min'] * 1000:>10.1f}{r['median'] * 1000:>14.1f}  {', '.join(r['loaded']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAX: str = os.path.join(ROOT, "data", "Montage_1000.xml")
+
+
+def run_case(dax: str, vms: int) -> Dict[str, Any]:
+    # Runs in a fresh interpreter. The DAX document is parsed before tracing starts, so
+    # only the tasks, their files and the simulation state built from them are counted.
+    import tracemalloc
+    sys.path.insert(0, ROOT)
+    from cloudsim.context import SimulationContext
+    from workflowsim.WorkflowParser import WorkflowParser
+    from workflowsim.experiment import Experiment
+    from workflowsim.utils.Parameters import Parameters
+    from workflowsim.utils.ReplicaCatalog import ReplicaCatalog
+
+    WorkflowParser.preload(dax)
+    with SimulationContext():
+        Parameters.init(vm=vms, dax=dax, runtime=None, datasize=None, op=Experiment.create_overheads(),
+                        cp=Experiment.create_clustering(None), scheduler=None, planner=None, rMethod=None, dl=0)
+        ReplicaCatalog.init(fs=ReplicaCatalog.FileSystem.LOCAL)
+        parser: WorkflowParser = WorkflowParser(0)
+        tracemalloc.start()
+        parser.parse()
+        parsed: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        tasks: int = len(parser.get_taskList())
+        files: int = sum(len(task.get_fileList()) for task in parser.get_taskList())
+        del parser
+
+    tracemalloc.start()
+    Experiment.run({"dax": dax, "vms": vms})
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"dax": os.path.basename(dax), "tasks": tasks, "files": files, "parsedBytes": parsed,
+            "bytesPerTask": parsed / tasks, "simulationPeakBytes": peak, "peakBytesPerTask": peak / tasks}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the memory held per task of a workflow")
+    parser.add_argument("dax", nargs="*", default=[DAX], help="DAX files, Montage_1000 by default")
+    parser.add_argument("--vms", type=int, default=20, help="VMs of the simulation")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--case", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case[0], int(args.case[1]))))
+        return
+
+    results: List[Dict[str, Any]] = []
+    for dax in args.dax:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--case", dax, str(args.vms)],
+                             cwd=ROOT, capture_output=True, text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'dax':<22}{'tasks':>7}{'files':>8}{'parsed (KB)':>13}{'bytes/task':>12}{'peak (KB)':>11}{'peak/task':>11}")
+    for r in results:
+        print(f"{r['dax']:<22}{r['tasks']:>7}{r['files']:>8}{r['parsedBytes'] / 1024:>13.1f}{r['bytesPerTask']:>12.0f}"
+              f"{r['simulationPeakBytes'] / 1024:>11.1f}{r['peakBytesPerTask']:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
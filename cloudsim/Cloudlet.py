@@ -6,6 +6,8 @@ from cloudsim.UtilizationModel import UtilizationModel
 
 
 class StringBuffer:
+    __slots__ = ("history",)
+
     def __init__(self):
         self.history = []
 
@@ -21,6 +23,9 @@ class StringBuffer:
 
 class Cloudlet:
     class Resource:
+        __slots__ = ("submissionTime", "wallClockTime", "actualCPUTime", "costPerSec", "resourceId", "resourceName",
+                     "finishedSoFar")
+
         def __init__(self):
             # Cloudlet's submission time to a CloudResource.
             self.submissionTime: float = 0.0
@@ -52,10 +57,17 @@ class Cloudlet:
     newline: str = '\n'
     num = "{:.2f}"
 
+    # Workflows hold one Task per node, so instances have no __dict__. The history and
+    # the resource records are only allocated once something is written to them.
+    __slots__ = ("userId", "status", "cloudletId", "numberOfPes", "execStartTime", "finishTime", "classType", "netToS",
+                 "cloudletLength", "cloudletFileSize", "cloudletOutputSize", "resList", "index", "reservationId", "record",
+                 "history", "vmId", "accumulatedBwCost", "costPerBw", "requiredFiles", "utilizationModelCpu",
+                 "utilizationModelRam", "utilizationModelBw")
+
     # Initialization
     def __init__(self, cloudletId: int, cloudletLength: int, pesNumber: int, cloudletFileSize: int, cloudletOutputSize: int,
         utilizationModelCpu: UtilizationModel, utilizationModelRam: UtilizationModel, utilizationModelBw: UtilizationModel,
-        record: bool=False, fileList: List[str]=list()):
+        record: bool=False, fileList: List[str]=None):
 
         self.userId: int = -1
         self.status: int = Cloudlet.CREATED
@@ -70,17 +82,18 @@ class Cloudlet:
         self.cloudletFileSize: Final[int] = max(1, cloudletFileSize)
         self.cloudletOutputSize: Final[int] = max(1, cloudletOutputSize)
 
-        self.resList: List[Cloudlet.Resource] = list() # [None]*2
+        # Replaced by a list by the first set_resource_parameter
+        self.resList: List[Cloudlet.Resource] = ()
         self.index: int = -1
         self.reservationId: int = -1
         self.record: bool = record
-        self.history: StringBuffer = StringBuffer()
+        self.history: StringBuffer = None
         self.vmId: int = -1
         self.accumulatedBwCost: float = 0
         self.costPerBw: float = 0.0
         self.requiredFiles: List[str] = fileList
 
-        self.utilizationModelCPU: UtilizationModel = utilizationModelCpu
+        self.utilizationModelCpu: UtilizationModel = utilizationModelCpu
         self.utilizationModelRam: UtilizationModel = utilizationModelRam
         self.utilizationModelBw: UtilizationModel = utilizationModelBw
 
@@ -97,7 +110,7 @@ class Cloudlet:
     
 
     def has_researved(self) -> bool:
-        if (Cloudlet.reservationId == -1):
+        if (self.reservationId == -1):
             return False
         return True
     
@@ -222,6 +235,8 @@ class Cloudlet:
         res.costPerSec = cost_per_cpu
         res.resourceName = CloudSim.get_entity_name(resource_id)
         # Add into a list if moving to a new grid resource
+        if (not self.resList):
+            self.resList = []
         self.resList.append(res)
         if (self.index == -1 and self.record):
             self.write(f"Allocates this Cloudlet to {res.resourceName} (ID #{resource_id}) with cost = ${cost_per_cpu}/sec")
@@ -241,7 +256,7 @@ class Cloudlet:
         res : Cloudlet.Resource = self.resList[self.index]
         res.submissionTime = clockTime
         if (self.record):
-            self.write(f"sets the submission time to {Cloudlet.num(clockTime)}")
+            self.write(f"sets the submission time to {Cloudlet.num.format(clockTime)}")
     
 
     def get_submission_time(self, resId: int=None) -> float:
@@ -259,7 +274,7 @@ class Cloudlet:
     def set_exec_start_time(self, clcokTime: float) -> None:
         self.execStartTime = clcokTime
         if (self.record):
-            self.write(f"Sets the execution start time to {Cloudlet.num(clcokTime)}")
+            self.write(f"Sets the execution start time to {Cloudlet.num.format(clcokTime)}")
 
 
     def get_exec_start_time(self) ->float:
@@ -273,7 +288,7 @@ class Cloudlet:
         res.wallClockTime = wallTime
         res.actualCPUTime = actualTime
         if (self.record):
-            self.write(f"Sets the wall clock time to {Cloudlet.num(wallTime)} and the actual CPU time to {Cloudlet.num(actualTime)}")
+            self.write(f"Sets the wall clock time to {Cloudlet.num.format(wallTime)} and the actual CPU time to {Cloudlet.num.format(actualTime)}")
 
 
     def set_cloudlet_status(self, status: int) -> None:
@@ -397,18 +412,19 @@ class Cloudlet:
     def write(self, s: str) -> None:
         if (not self.record):
             return
-        if (Cloudlet.num is None or Cloudlet.history is None):
-            Cloudlet.history.append("TIme below denotes the simulation time.")
-            Cloudlet.history.append(Cloudlet.newline)
-            Cloudlet.history.append(f"Time (sec) Description Cloudlet #{self.cloudletId}")
-            Cloudlet.history.append(Cloudlet.newline)
-            Cloudlet.history.append("-------------------------------------------------")
-            Cloudlet.history.append(Cloudlet.newline)
-            Cloudlet.history.append(f"{Cloudlet.num(CloudSim.clock())}")
-            Cloudlet.history.append(f"\tCreates Cloudlet ID #{self.cloudletId}")
-            Cloudlet.history.append(Cloudlet.newline)
-        Cloudlet.history.append(Cloudlet.num(CloudSim.clock()))
-        Cloudlet.history.append(f"\t{s}{Cloudlet.newline}")
+        if (self.history is None):
+            self.history = StringBuffer()
+            self.history.append("Time below denotes the simulation time.")
+            self.history.append(Cloudlet.newline)
+            self.history.append(f"Time (sec) Description Cloudlet #{self.cloudletId}")
+            self.history.append(Cloudlet.newline)
+            self.history.append("-------------------------------------------------")
+            self.history.append(Cloudlet.newline)
+            self.history.append(Cloudlet.num.format(CloudSim.clock()))
+            self.history.append(f"\tCreates Cloudlet ID #{self.cloudletId}")
+            self.history.append(Cloudlet.newline)
+        self.history.append(Cloudlet.num.format(CloudSim.clock()))
+        self.history.append(f"\t{s}{Cloudlet.newline}")
 
 
     def get_status(self) -> int:
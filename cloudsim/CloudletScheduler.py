@@ -62,6 +62,12 @@ class CloudletScheduler(ABC):
         pass
 
 
+    @abstractmethod
+    def is_idle(self) -> bool:
+        # No cloudlet running, waiting, paused or finished but not yet collected
+        pass
+
+
     @abstractmethod
     def migrate_cloudlet(self) -> Cloudlet:
         pass
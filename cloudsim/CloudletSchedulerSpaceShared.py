@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import List
+import heapq
+from collections import deque
+from typing import List, Deque, Dict, Tuple
 from cloudsim.CloudletScheduler import CloudletScheduler
 from cloudsim.ResCloudlet import ResCloudlet
 from cloudsim.Cloudlet import Cloudlet
@@ -8,75 +10,116 @@ from cloudsim.core import CloudSim
 
 
 class CloudletSchedulerSpaceShared(CloudletScheduler):
+    # Work (MI per PE) below which a projected finish counts as reached, it absorbs
+    # the float error of turning the projection into an event time and back
+    FINISH_TOLERANCE: float = 1e-6
+
     def __init__(self):
         super().__init__()
-        self.cloudletWaitingList: List[ResCloudlet] = []
+        self.cloudletWaitingList: Deque[ResCloudlet] = deque()
         self.cloudletExecList: List[ResCloudlet] = []
         self.cloudletPausedList: List[ResCloudlet] = []
         self.cloudletFinishedList: List[ResCloudlet] = []
         self.usedPes: int = 0
         self.currentCpus: int = 0
+        # Every running cloudlet gets the same MI per PE, so progress is kept as one
+        # counter and a cloudlet is only brought up to date when it starts, stops or finishes
+        self.workDone: float = 0.0
+        # rcl -> (workDone its finishedSoFar was last brought up to, sequence of its heap entry)
+        self.workMark: Dict[ResCloudlet, Tuple[float, int]] = {}
+        # (workDone at which the cloudlet completes, sequence, rcl), entries of stopped cloudlets are stale
+        self.finishHeap: List[Tuple[float, int, ResCloudlet]] = []
+        self.sequence: int = 0
 
 
-    def update_vm_processing(self, currentTime: float, mipsShare: List[float]) -> float:
-        self.set_current_mips_share(mipsShare)
-        timeSpam: float = currentTime - self.get_previous_time()
+    def get_capacity(self, mipsShare: List[float]) -> float:
         capacity: float = 0.0
         cpus: int = 0
-
         for mips in mipsShare:  # count the CPUs available to the VMM
             capacity += mips
             if mips > 0:
                 cpus += 1
         self.currentCpus = cpus
-        capacity /= cpus  # average capacity of each cpu
+        return capacity / cpus  # average capacity of each cpu
+
+
+    def advance_cloudlet(self, rcl: ResCloudlet) -> None:
+        mark, sequence = self.workMark[rcl]
+        rcl.update_cloudlet_finished_so_far(int((self.workDone - mark) * rcl.get_number_of_pes() * 1e6))
+        self.workMark[rcl] = (self.workDone, sequence)
+
+
+    def start_cloudlet(self, rcl: ResCloudlet) -> None:
+        rcl.set_cloudlet_status(Cloudlet.INEXEC)
+        for i in range(rcl.get_number_of_pes()):
+            rcl.set_machine_and_pe_id(0, i)
+        self.get_cloudlet_exec_list().append(rcl)
+        self.usedPes += rcl.get_number_of_pes()
+        self.track_cloudlet(rcl)
+
+
+    def track_cloudlet(self, rcl: ResCloudlet) -> None:
+        # Called again whenever the cloudlet's length changes
+        self.sequence += 1
+        self.workMark[rcl] = (self.workDone, self.sequence)
+        finishWork: float = self.workDone + rcl.get_remaining_cloudlet_length() / rcl.get_number_of_pes()
+        heapq.heappush(self.finishHeap, (finishWork, self.sequence, rcl))
+
+
+    def stop_cloudlet(self, rcl: ResCloudlet) -> None:
+        # Brings the cloudlet up to date and leaves its heap entry stale
+        self.advance_cloudlet(rcl)
+        del self.workMark[rcl]
+        self.get_cloudlet_exec_list().remove(rcl)
+
+
+    def is_stale(self, entry: Tuple[float, int, ResCloudlet]) -> bool:
+        mark = self.workMark.get(entry[2])
+        return mark is None or mark[1] != entry[1]
+
+
+    def update_vm_processing(self, currentTime: float, mipsShare: List[float]) -> float:
+        self.set_current_mips_share(mipsShare)
+        timeSpam: float = currentTime - self.get_previous_time()
+        capacity: float = self.get_capacity(mipsShare)
+        self.workDone += capacity * timeSpam
 
-        # each machine in the exec list has the same amount of cpu
-        for rcl in self.get_cloudlet_exec_list():
-            rcl.update_cloudlet_finished_so_far(int(capacity * timeSpam * rcl.get_number_of_pes() * 1e6))
-        
         # no more cloudlets in this scheduler
         if len(self.get_cloudlet_exec_list()) == 0 and len(self.get_cloudlet_waiting_list()) == 0:
             self.set_previous_time(currentTime)
             return 0.0
-        
-        # update each cloudlet
-        finished: int = 0
-        toRemove: List[ResCloudlet] = []
-        for rcl in self.get_cloudlet_exec_list():
-            # finished anyway, rounding issue...
-            if rcl.get_remaining_cloudlet_length() == 0:
-                toRemove.append(rcl)
-                self.cloudlet_finish(rcl)
-                finished += 1
-        for rcl in toRemove:
-            self.get_cloudlet_exec_list().remove(rcl)
-
-        # for each finished cloudlet, add a new one from the waiting list
-        if len(self.get_cloudlet_waiting_list()) > 0:
-            for i in range(finished):
-                toRemove.clear()
-                for rcl in self.get_cloudlet_waiting_list():
-                    if (self.currentCpus - self.usedPes) >= rcl.get_number_of_pes():
-                        rcl.set_cloudlet_status(Cloudlet.INEXEC)
-                        for k in range(rcl.get_number_of_pes()):
-                            rcl.set_machine_and_pe_id(0, i)
-                        self.get_cloudlet_exec_list().append(rcl)
-                        self.usedPes += rcl.get_number_of_pes()
-                        toRemove.append(rcl)
-                        break
-                for rcl in toRemove:
-                    self.get_cloudlet_waiting_list().remove(rcl)
-
-        # estimate finish time of cloudlets in the execution queue
+
+        # only the cloudlets whose projected finish has been reached change state
+        heap = self.finishHeap
+        while heap and heap[0][0] <= self.workDone + CloudletSchedulerSpaceShared.FINISH_TOLERANCE:
+            entry = heapq.heappop(heap)
+            if self.is_stale(entry):
+                continue
+            rcl: ResCloudlet = entry[2]
+            self.stop_cloudlet(rcl)
+            self.cloudlet_finish(rcl)
+
+        # FIFO admission while PEs are free, a cloudlet that needs more PEs than
+        # are left doesn't hold back the smaller ones behind it
+        waiting: Deque[ResCloudlet] = self.get_cloudlet_waiting_list()
+        skipped: List[ResCloudlet] = []
+        while waiting and self.currentCpus > self.usedPes:
+            rcl = waiting.popleft()
+            if (self.currentCpus - self.usedPes) >= rcl.get_number_of_pes():
+                self.start_cloudlet(rcl)
+            else:
+                skipped.append(rcl)
+        waiting.extendleft(reversed(skipped))
+
+        # the next event is the earliest projected finish
+        while heap and self.is_stale(heap[0]):
+            heapq.heappop(heap)
         nextEvent: float = float('inf')
-        for rcl in self.get_cloudlet_exec_list():
-            remainingLength: float = rcl.get_remaining_cloudlet_length()
-            estimatedFinishTime: float = currentTime + (remainingLength / (capacity * rcl.get_number_of_pes()))
-            if estimatedFinishTime - currentTime < CloudSim.get_min_time_between_events():
-                estimatedFinishTime = currentTime + CloudSim.get_min_time_between_events()
-            if estimatedFinishTime < nextEvent:
-                nextEvent = estimatedFinishTime
+        if heap:
+            capacity = self.get_capacity(mipsShare)
+            nextEvent = currentTime + (heap[0][0] - self.workDone) / capacity
+            if nextEvent - currentTime < CloudSim.get_min_time_between_events():
+                nextEvent = currentTime + CloudSim.get_min_time_between_events()
         self.set_previous_time(currentTime)
         return nextEvent
 
@@ -91,11 +134,13 @@ class CloudletSchedulerSpaceShared(CloudletScheduler):
         # Then searches in the exec list
         for rcl in self.get_cloudlet_exec_list():
             if rcl.get_cloudlet_id() == cloudletId:
-                self.get_cloudlet_exec_list().remove(rcl)
+                self.stop_cloudlet(rcl)
                 if rcl.get_remaining_cloudlet_length() == 0:
                     self.cloudlet_finish(rcl)
                 else:
                     rcl.set_cloudlet_status(Cloudlet.CANCELED)
+                    # Give the PEs back, otherwise the VM never runs anything again
+                    self.usedPes -= rcl.get_number_of_pes()
                 return rcl.get_cloudlet()
             
         # Now, looks in the paused queue
@@ -114,43 +159,28 @@ class CloudletSchedulerSpaceShared(CloudletScheduler):
 
 
     def cloudlet_pause(self, cloudletId: int) -> bool:
-        found: bool = False
-        position: int = 0
         # first, looks for the cloudlet in the exec list
-        for rcl in self.get_cloudlet_exec_list():
-            if rcl.get_cloudlet_id() == cloudletId:
-                found = True
-                break
-            position += 1
-            
-        if found:
-            # moves to the paused list
-            rgl: ResCloudlet = self.get_cloudlet_exec_list().pop(position)
-            if rgl.get_remaining_cloudlet_length() == 0:
-                self.cloudlet_finish(rgl)
-            else:
-                rgl.set_cloudlet_status(Cloudlet.PAUSED)
-                self.get_cloudlet_paused_list().append(rgl)
-            return True
-        
-        # now, look for the cloudlet in the waiting list
-        position = 0
-        found = False
-        for rcl in self.get_cloudlet_waiting_list():
-            if rcl.get_cloudlet_id() == cloudletId:
-                found = True
-                break
-            position += 1
+        for rgl in self.get_cloudlet_exec_list():
+            if rgl.get_cloudlet_id() == cloudletId:
+                # moves to the paused list
+                self.stop_cloudlet(rgl)
+                if rgl.get_remaining_cloudlet_length() == 0:
+                    self.cloudlet_finish(rgl)
+                else:
+                    rgl.set_cloudlet_status(Cloudlet.PAUSED)
+                    # PEs of a paused cloudlet are free for the others
+                    self.usedPes -= rgl.get_number_of_pes()
+                    self.get_cloudlet_paused_list().append(rgl)
+                return True
 
-        if found:
-            # moves to the paused list
-            rgl: ResCloudlet = self.get_cloudlet_waiting_list().pop(position)
-            if rgl.get_remaining_cloudlet_length() == 0:
-                self.cloudlet_finish(rgl)
-            else:
+        # now, look for the cloudlet in the waiting list
+        for rgl in self.get_cloudlet_waiting_list():
+            if rgl.get_cloudlet_id() == cloudletId:
+                # moves to the paused list
+                self.get_cloudlet_waiting_list().remove(rgl)
                 rgl.set_cloudlet_status(Cloudlet.PAUSED)
                 self.get_cloudlet_paused_list().append(rgl)
-            return True
+                return True
         return False
 
 
@@ -173,33 +203,18 @@ class CloudletSchedulerSpaceShared(CloudletScheduler):
 
         if found:
             rcl: ResCloudlet = self.get_cloudlet_paused_list().pop(position)
+            size: float = rcl.get_remaining_cloudlet_length() * rcl.get_number_of_pes()
+            rcl.get_cloudlet().set_cloudlet_length(size)
             # it can go to the exec list
             if (self.currentCpus - self.usedPes) >= rcl.get_number_of_pes():
-                rcl.set_cloudlet_status(Cloudlet.INEXEC)
-                for i in range(rcl.get_number_of_pes()):
-                    rcl.set_machine_and_pe_id(0, i)
-                size: float = rcl.get_remaining_cloudlet_length() * rcl.get_number_of_pes()
-                rcl.get_cloudlet().set_cloudlet_length(size)
-                self.get_cloudlet_exec_list().append(rcl)
-                self.usedPes += rcl.get_number_of_pes()
-
+                self.start_cloudlet(rcl)
                 # calculate the expected time for cloudlet completion
-                capacity: float = 0.0
-                cpus: int = 0
-                for mips in self.get_current_mips_share():
-                    capacity += mips
-                    if mips > 0:
-                        cpus += 1
-                self.currentCpus = cpus
-                capacity /= cpus
-
+                capacity: float = self.get_capacity(self.get_current_mips_share())
                 remainingLength: float = rcl.get_remaining_cloudlet_length()
                 return CloudSim.clock() + (remainingLength / (capacity * rcl.get_number_of_pes()))
             
             else: # no enough free PEs: go to the waiting queue
                 rcl.set_cloudlet_status(Cloudlet.QUEUED)
-                size: float = rcl.get_remaining_cloudlet_length() * rcl.get_number_of_pes()
-                rcl.get_cloudlet().set_cloudlet_length(size)
                 self.get_cloudlet_waiting_list().append(rcl)
                 return 0.0
             
@@ -208,35 +223,20 @@ class CloudletSchedulerSpaceShared(CloudletScheduler):
     
     
     def cloudlet_submit(self, cloudlet: Cloudlet, fileTransferTime: float=0.0) -> float:
-        # Check if there are enough free PEs
-        if (self.currentCpus - self.usedPes) >= cloudlet.get_number_of_pes():
-            rcl: ResCloudlet = ResCloudlet(cloudlet)
-            rcl.set_cloudlet_status(Cloudlet.INEXEC)
-            for i in range(cloudlet.get_number_of_pes()):
-                rcl.set_machine_and_pe_id(0, i)
-            self.get_cloudlet_exec_list().append(rcl)
-            self.usedPes += cloudlet.get_number_of_pes()
-        else:  # Not enough free PEs: go to the waiting queue
-            rcl = ResCloudlet(cloudlet)
+        rcl: ResCloudlet = ResCloudlet(cloudlet)
+        # Not enough free PEs: go to the waiting queue
+        if (self.currentCpus - self.usedPes) < cloudlet.get_number_of_pes():
             rcl.set_cloudlet_status(Cloudlet.QUEUED)
             self.get_cloudlet_waiting_list().append(rcl)
             return 0.0
-        
-        # Calculate the expected time for cloudlet completion
-        capacity: float = 0.0
-        cpus: int = 0
-        for mips in self.get_current_mips_share():
-            capacity += mips
-            if mips > 0:
-                cpus += 1
-        self.currentCpus = cpus
-        capacity /= cpus
 
         # Use the current capacity to estimate the extra amount of
         # time for file transferring. It must be added to the cloudlet length
+        capacity: float = self.get_capacity(self.get_current_mips_share())
         extra_size: float = capacity * fileTransferTime
         length: int = cloudlet.get_cloudlet_length() + extra_size
         cloudlet.set_cloudlet_length(length)
+        self.start_cloudlet(rcl)
         return cloudlet.get_cloudlet_length() / capacity
     
 
@@ -278,10 +278,16 @@ class CloudletSchedulerSpaceShared(CloudletScheduler):
 
     def running_cloudlets(self) -> int:
         return len(self.get_cloudlet_exec_list())
+
+
+    def is_idle(self) -> bool:
+        return not (self.cloudletExecList or self.cloudletWaitingList or self.cloudletPausedList
+                    or self.cloudletFinishedList)
     
 
     def migrate_cloudlet(self):
-        rcl: ResCloudlet = self.get_cloudlet_exec_list().pop(0)
+        rcl: ResCloudlet = self.get_cloudlet_exec_list()[0]
+        self.stop_cloudlet(rcl)
         rcl.finalize_cloudlet()
         cl: Cloudlet = rcl.get_cloudlet()
         self.usedPes -= cl.get_number_of_pes()
@@ -289,15 +295,19 @@ class CloudletSchedulerSpaceShared(CloudletScheduler):
 
 
     def set_cloudlet_waiting_list(self, cloudWaitingList: List[ResCloudlet]) -> None:
-        self.cloudletWaitingList = cloudWaitingList
+        self.cloudletWaitingList = deque(cloudWaitingList)
 
 
-    def get_cloudlet_waiting_list(self) -> List[ResCloudlet]:
+    def get_cloudlet_waiting_list(self) -> Deque[ResCloudlet]:
         return self.cloudletWaitingList
     
     
     def set_cloudlet_exec_list(self, cloudExecList: List[ResCloudlet]) -> None:
         self.cloudletExecList = cloudExecList
+        self.workMark.clear()
+        self.finishHeap.clear()
+        for rcl in cloudExecList:
+            self.track_cloudlet(rcl)
 
 
     def get_cloudlet_exec_list(self) -> List[ResCloudlet]:
@@ -329,15 +339,7 @@ class CloudletSchedulerSpaceShared(CloudletScheduler):
     
 
     def get_total_current_available_mips_for_cloudlet(self, rcl: ResCloudlet, mipsShare: List[float]) -> float:
-        capacity = 0.0
-        cpus = 0
-        for mips in mipsShare:
-            capacity += mips
-            if mips > 0:
-                cpus += 1
-        self.currentCpus = cpus
-        capacity /= cpus
-        return capacity
+        return self.get_capacity(mipsShare)
     
     
     def get_total_current_allocated_mips_for_cloudlet(self, rcl: ResCloudlet, time: float) -> float:
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import List
+from cloudsim.CloudletSchedulerSpaceShared import CloudletSchedulerSpaceShared
+from cloudsim.ResCloudlet import ResCloudlet
+from cloudsim.Cloudlet import Cloudlet
+from cloudsim.core import CloudSim
+
+
+class CloudletSchedulerTimeShared(CloudletSchedulerSpaceShared):
+    # Processor sharing: every submitted cloudlet runs at once and the VM's PEs are
+    # shared evenly when more PEs are requested than the VM has. Running cloudlets
+    # still progress at the same rate per PE, so the finish heap of the space-shared
+    # scheduler is reused and only the share changes.
+
+    def get_capacity(self, mipsShare: List[float]) -> float:
+        capacity: float = super().get_capacity(mipsShare)
+        if self.usedPes > self.currentCpus:
+            capacity *= self.currentCpus / self.usedPes
+        return capacity
+
+
+    def advance_to(self, currentTime: float) -> None:
+        # The share changes with the running set, bank the work done at the old share first
+        mipsShare: List[float] = self.get_current_mips_share()
+        if mipsShare and currentTime > self.get_previous_time():
+            self.workDone += self.get_capacity(mipsShare) * (currentTime - self.get_previous_time())
+            self.set_previous_time(currentTime)
+
+
+    def cloudlet_cancel(self, cloudletId: int) -> Cloudlet:
+        self.advance_to(CloudSim.clock())
+        return super().cloudlet_cancel(cloudletId)
+
+
+    def cloudlet_pause(self, cloudletId: int) -> bool:
+        self.advance_to(CloudSim.clock())
+        return super().cloudlet_pause(cloudletId)
+
+
+    def cloudlet_resume(self, cloudletId: int) -> float:
+        for rcl in self.get_cloudlet_paused_list():
+            if rcl.get_cloudlet_id() == cloudletId:
+                self.advance_to(CloudSim.clock())
+                self.get_cloudlet_paused_list().remove(rcl)
+                size: float = rcl.get_remaining_cloudlet_length() * rcl.get_number_of_pes()
+                rcl.get_cloudlet().set_cloudlet_length(size)
+                self.start_cloudlet(rcl)
+                capacity: float = self.get_capacity(self.get_current_mips_share())
+                remainingLength: float = rcl.get_remaining_cloudlet_length()
+                return CloudSim.clock() + (remainingLength / (capacity * rcl.get_number_of_pes()))
+        return 0.0
+
+
+    def cloudlet_submit(self, cloudlet: Cloudlet, fileTransferTime: float=0.0) -> float:
+        self.advance_to(CloudSim.clock())
+        rcl: ResCloudlet = ResCloudlet(cloudlet)
+        self.start_cloudlet(rcl)
+
+        # The file transfer time is charged at the share the cloudlet gets now
+        capacity: float = self.get_capacity(self.get_current_mips_share())
+        extra_size: float = capacity * fileTransferTime
+        length: int = cloudlet.get_cloudlet_length() + extra_size
+        cloudlet.set_cloudlet_length(length)
+        self.track_cloudlet(rcl)
+        return cloudlet.get_cloudlet_length() / capacity
@@ -505,8 +505,8 @@ class Datacenter(SimEntity):
                 status = self.get_vm_allocation_policy().get_host(vm_id, userId).get_vm(vm_id, userId) \
                     .get_cloudlet_scheduler().get_cloudlet_status(cloudlet_id)
             except Exception as e:
-                Log.print_line(f"Error in processing CloudletStatus with ID {cloudlet_id}: {e}")
-                Log.print_line(str(e))
+                Log.error("Error in processing CloudletStatus with ID %s: %s", cloudlet_id, e)
+                Log.error("%s", e)
                 return
             
         array: Tuple[int, int, int] = [self.get_id(), cloudlet_id, status]
@@ -516,7 +516,7 @@ class Datacenter(SimEntity):
 
     def process_other_event(self, ev: SimEvent) -> None:
         if ev is None:
-            Log.print_line(f"{self.get_name()}.process_other_event(): Error - an event is null.")
+            Log.error("%s.process_other_event(): Error - an event is null.", self.get_name())
 
 
     def process_vm_create(self, ev: SimEvent, ack: bool) -> None:
@@ -566,7 +566,7 @@ class Datacenter(SimEntity):
         result: bool = self.get_vm_allocation_policy().allocate_host_for_vm(vm, host)
         
         if not result:
-            Log.print_line("[Datacenter.processVmMigrate] VM allocation to the destination host failed")
+            Log.warning("[Datacenter.processVmMigrate] VM allocation to the destination host failed")
             sys.exit(0)
 
         if ack:
@@ -601,12 +601,12 @@ class Datacenter(SimEntity):
                 userId = cl.get_user_id()
                 vm_id = cl.get_vm_id()
             except Exception as e:
-                Log.print_line(self.get_name() + ": Error in processing Cloudlet")
-                Log.print_line(str(e))
+                Log.error("%s: Error in processing Cloudlet", self.get_name())
+                Log.error("%s", e)
                 return
         except Exception as e:
-            Log.print_line(self.get_name() + ": Error in processing Cloudlet")
-            Log.print_line(str(e))
+            Log.error("%s: Error in processing Cloudlet", self.get_name())
+            Log.error("%s", e)
             return
 
         # begins executing ....
@@ -677,10 +677,10 @@ class Datacenter(SimEntity):
             # checks whether this Cloudlet has finished or not
             if cl.is_finished():
                 name: str = CloudSim.get_entity_name(cl.get_user_id())
-                Log.print_line(self.get_name() + ": Warning - Cloudlet #" + str(cl.get_cloudlet_id()) +
-                               " owned by " + name + " is already completed/finished.")
-                Log.print_line("Therefore, it is not being executed again")
-                Log.print_line()
+                Log.warning("%s: Warning - Cloudlet #%s owned by %s is already completed/finished.", self.get_name(),
+                            cl.get_cloudlet_id(), name)
+                Log.warning("Therefore, it is not being executed again")
+                Log.warning("")
 
                 if ack:
                     data: List[int] = [self.get_id(), cl.get_cloudlet_id(), CloudSimTags.FALSE]
@@ -721,14 +721,16 @@ class Datacenter(SimEntity):
                 self.send_now(cl.get_user_id(), tag, data)
 
         except Exception as e:
-            Log.print_line(self.get_name() + ".process_cloudlet_submit(): " + "Exception error.")
-            Log.print_line(str(e))
+            Log.error("%s.process_cloudlet_submit(): Exception error.", self.get_name())
+            Log.error("%s", e)
 
         self.check_cloudlet_completion()
 
 
     def predict_file_transfer_time(self, required_files: List[str]) -> float:
         time: float = 0.0
+        if required_files is None:
+            return time
         files: Iterator[str] = iter(required_files)
         for file_name in files:
             for i in range(len(self.get_storage_list())):
@@ -861,11 +863,11 @@ class Datacenter(SimEntity):
     
     
     def shutdown_entity(self) -> None:
-        Log.print_line(f"{self.get_name()} is shutting down...")
+        Log.info("%s is shutting down...", self.get_name())
     
 
     def start_entity(self):
-        Log.print_line(f"{self.get_name()} is starting...")
+        Log.info("%s is starting...", self.get_name())
 
         gis_id: int = CloudSim.get_entity_id(self.regionalCisName)
         if gis_id == -1:
@@ -68,7 +68,8 @@ class DatacenterBroker(SimEntity):
     def process_resource_characteristics_request(self, ev: SimEvent) -> None:
         self.datacenterIdsList = CloudSim.get_cloud_resource_list()
         self.datacenterCharacteristicsList = {}
-        Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: Cloud Resource List received with {len(self.datacenterIdsList)} resource(s)")
+        Log.info("%s: %s: Cloud Resource List received with %s resource(s)", CloudSim.clock(), self.get_name(),
+                 len(self.datacenterIdsList))
         for datacenterId in self.datacenterIdsList:
             self.send_now(datacenterId, CloudSimTags.RESOURCE_CHARACTERISTICS, self.get_id())
 
@@ -81,10 +82,12 @@ class DatacenterBroker(SimEntity):
         if result == CloudSimTags.TRUE:
             self.vmsToDatacentersMap[vmId] = datacenterId
             self.vmsCreatedList.append(VmList.get_by_id(self.vmList, vmId))
-            Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: VM #{vmId} has been created in Datacenter #{datacenterId}, Host #\
-                  {VmList.get_by_id(self.vmsCreatedList, vmId).get_host().get_id()}")
+            if Log.is_enabled_for(Log.DEBUG):
+                Log.debug("%s: %s: VM #%s has been created in Datacenter #%s, Host #\
+                  %s", CloudSim.clock(), self.get_name(), vmId, datacenterId,
+                          VmList.get_by_id(self.vmsCreatedList, vmId).get_host().get_id())
         else:
-            Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: Creation of VM #{vmId} failed in Datacenter #{datacenterId}")
+            Log.warning("%s: %s: Creation of VM #%s failed in Datacenter #%s", CloudSim.clock(), self.get_name(), vmId, datacenterId)
 
         self.increment_vms_acks()
 
@@ -100,17 +103,17 @@ class DatacenterBroker(SimEntity):
                 if len(self.vmsCreatedList) > 0:
                     self.submit_cloudlets()
                 else:
-                    Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: none of the required VMs could be created. Aborting")
+                    Log.error("%s: %s: none of the required VMs could be created. Aborting", CloudSim.clock(), self.get_name())
                     self.finish_execution()
 
     def process_cloudlet_return(self, ev: SimEvent) -> None:
         cloudlet: Cloudlet = cast(Cloudlet, ev.get_data())
         self.cloudletReceivedList.append(cloudlet)
-        Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: Cloudlet {cloudlet.get_cloudlet_id()} received")
+        Log.debug("%s: %s: Cloudlet %s received", CloudSim.clock(), self.get_name(), cloudlet.get_cloudlet_id())
         self.cloudletsSubmitted -= 1
 
         if len(self.cloudletList) == 0 and self.cloudletsSubmitted == 0:
-            Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: All Cloudlets executed. Finishing...")
+            Log.info("%s: %s: All Cloudlets executed. Finishing...", CloudSim.clock(), self.get_name())
             self.clear_datacenters()
             self.finish_execution()
         else:
@@ -120,17 +123,17 @@ class DatacenterBroker(SimEntity):
 
     def process_other_event(self, ev: SimEvent) -> None:
         if ev is None:
-            Log.print_line(f"{self.get_name()}.processOtherEvent(): Error - an event is null.")
+            Log.error("%s.processOtherEvent(): Error - an event is null.", self.get_name())
             return
 
-        Log.print_line(f"{self.get_name()}.processOtherEvent(): Error - event unknown by this DatacenterBroker.")
+        Log.error("%s.processOtherEvent(): Error - event unknown by this DatacenterBroker.", self.get_name())
 
     def create_vms_in_datacenter(self, datacenterId: int) -> None:
         requestedVms: int = 0
         datacenterName: str = CloudSim.get_entity_name(datacenterId)
         for vm in self.vmList:
             if vm.get_id() not in self.vmsToDatacentersMap:
-                Log.print_line(f"{CloudSim.clock()}: {self.get_name()} Trying to Create VM #{vm.get_id()} in {datacenterName}")
+                Log.debug("%s: %s Trying to Create VM #%s in %s", CloudSim.clock(), self.get_name(), vm.get_id(), datacenterName)
                 self.send_now(datacenterId, CloudSimTags.VM_CREATE_ACK, vm)
                 requestedVms += 1
 
@@ -146,11 +149,11 @@ class DatacenterBroker(SimEntity):
             else:
                 vm = VmList.get_by_id(self.vmsCreatedList, cloudlet.get_vm_id())
                 if vm is None:
-                    Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: Postponing execution of cloudlet \
-                          {cloudlet.get_cloudlet_id()}: bound VM not available")
+                    Log.warning("%s: %s: Postponing execution of cloudlet \
+                          %s: bound VM not available", CloudSim.clock(), self.get_name(), cloudlet.get_cloudlet_id())
                     continue
 
-            Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: Sending cloudlet {cloudlet.get_cloudlet_id()} to VM #{vm.get_id()}")
+            Log.debug("%s: %s: Sending cloudlet %s to VM #%s", CloudSim.clock(), self.get_name(), cloudlet.get_cloudlet_id(), vm.get_id())
             cloudlet.set_vm_id(vm.get_id())
             self.send_now(self.vmsToDatacentersMap[vm.get_id()], CloudSimTags.CLOUDLET_SUBMIT, cloudlet)
             self.cloudletsSubmitted += 1
@@ -160,7 +163,7 @@ class DatacenterBroker(SimEntity):
 
     def clear_datacenters(self) -> None:
         for vm in self.vmsCreatedList:
-            Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: Destroying VM #{vm.get_id()}")
+            Log.debug("%s: %s: Destroying VM #%s", CloudSim.clock(), self.get_name(), vm.get_id())
             self.send_now(self.vmsToDatacentersMap[vm.get_id()], CloudSimTags.VM_DESTROY, vm)
         self.vmsCreatedList.clear()
 
@@ -168,10 +171,10 @@ class DatacenterBroker(SimEntity):
         self.send_now(self.get_id(), CloudSimTags.END_OF_SIMULATION)
 
     def shutdown_entity(self) -> None:
-        Log.print_line(f"{self.get_name()} is shutting down...")
+        Log.info("%s is shutting down...", self.get_name())
 
     def start_entity(self) -> None:
-        Log.print_line(f"{self.get_name()} is starting...")
+        Log.info("%s is starting...", self.get_name())
         self.schedule(self.get_id(), 0, CloudSimTags.RESOURCE_CHARACTERISTICS_REQUEST)
 
     def get_vm_list(self) -> List[Vm.Vm]:
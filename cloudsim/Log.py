@@ -1,11 +1,45 @@
 from __future__ import annotations
+import atexit
 import sys
+from cloudsim.context import SimulationContext
+
+
+class BufferedOutput:
+    # Collects what is logged and writes it to the wrapped output in blocks of about
+    # capacity characters, instead of one write per line
+    def __init__(self, output, capacity=1 << 16):
+        self.output = output
+        self.capacity = capacity
+        self.parts = []
+        self.size = 0
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.capacity:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            self.output.write(''.join(self.parts))
+            self.parts = []
+            self.size = 0
+        self.output.flush()
 
 
 class Log:
     LINE_SEPARATOR = '\n'
-    output = sys.stdout
+    # Levels, with the values of the logging module
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+    # None writes to whatever sys.stdout is when the first line is printed
+    output = None
     disabled = False
+    # Everything is printed by default, as before there were levels
+    level = DEBUG
+    flushAtExit = False
 
     @classmethod
     def print(cls, message):
@@ -30,8 +64,51 @@ class Log:
         if not cls.is_disabled():
             cls.print_line(format_string % args)
 
+    @classmethod
+    def is_enabled_for(cls, level):
+        # Guard for messages whose arguments are expensive to compute:
+        #   if Log.is_enabled_for(Log.DEBUG):
+        #       Log.debug("%s", expensive())
+        return not cls.disabled and level >= cls.level
+
+    @classmethod
+    def log(cls, level, format_string, *args):
+        # format_string is only formatted, with %, when the level is enabled
+        if not cls.disabled and level >= cls.level:
+            cls.print_line(format_string % args if args else format_string)
+
+    @classmethod
+    def debug(cls, format_string, *args):
+        if not cls.disabled and cls.DEBUG >= cls.level:
+            cls.print_line(format_string % args if args else format_string)
+
+    @classmethod
+    def info(cls, format_string, *args):
+        if not cls.disabled and cls.INFO >= cls.level:
+            cls.print_line(format_string % args if args else format_string)
+
+    @classmethod
+    def warning(cls, format_string, *args):
+        if not cls.disabled and cls.WARNING >= cls.level:
+            cls.print_line(format_string % args if args else format_string)
+
+    @classmethod
+    def error(cls, format_string, *args):
+        if not cls.disabled and cls.ERROR >= cls.level:
+            cls.print_line(format_string % args if args else format_string)
+
+    @classmethod
+    def set_level(cls, _level):
+        cls.level = _level
+
+    @classmethod
+    def get_level(cls):
+        return cls.level
+
     @classmethod
     def set_output(cls, _output):
+        if isinstance(cls.output, BufferedOutput):
+            cls.output.flush()
         cls.output = _output
 
     @classmethod
@@ -40,6 +117,27 @@ class Log:
             cls.set_output(sys.stdout)
         return cls.output
 
+    @classmethod
+    def set_buffered(cls, buffered=True, capacity=1 << 16):
+        # Buffers the current output, whatever is left is written by flush or at exit
+        output = cls.get_output()
+        if buffered and not isinstance(output, BufferedOutput):
+            cls.set_output(BufferedOutput(output, capacity))
+            if not cls.flushAtExit:
+                atexit.register(cls.flush)
+                cls.flushAtExit = True
+        elif not buffered and isinstance(output, BufferedOutput):
+            cls.set_output(output.output)
+
+    @classmethod
+    def is_buffered(cls):
+        return isinstance(cls.output, BufferedOutput)
+
+    @classmethod
+    def flush(cls):
+        if cls.output is not None:
+            cls.output.flush()
+
     @classmethod
     def set_disabled(cls, _disabled):
         cls.disabled = _disabled
@@ -55,3 +153,6 @@ class Log:
     @classmethod
     def enable(cls):
         cls.set_disabled(False)
+
+
+SimulationContext.register(Log, ('output', 'disabled', 'level'))
@@ -1,71 +1,252 @@
 from __future__ import annotations
 
-from typing import Dict, List
-from cloudsim.network import GraphReaderBrite
+import hashlib
+import math
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Tuple, TYPE_CHECKING
+from cloudsim.network import GraphReaderBrite, TopologicalGraph, DelayMatrix_Float, get_path
 from cloudsim.network import TopologicalNode, TopologicalLink
 from cloudsim.Log import Log
+from cloudsim.context import SimulationContext
+
+if TYPE_CHECKING:
+    import numpy as np
 
 class NetworkTopology:
     nextIdx: int = 0
     networkEnabled: bool = False
-    delayMatrix: List[List[float]] = []
-    bwMatrix: List[List[float]] = []
-    graph: List[List[float]] = []
+    # Shortest path delays, predecessors and link bandwidths, indexed by topology node
+    delayMatrix: np.ndarray = None
+    predecessors: np.ndarray = None
+    bwMatrix: np.ndarray = None
+    graph: TopologicalGraph = None
     map: Dict[int, int] = {}
+    # Delay of the direct link between two nodes, both directions are stored
+    linkDelay: Dict[Tuple[int, int], float] = {}
+    # Depth of nested batch() blocks, matrices are only generated when it drops to 0
+    batchDepth: int = 0
+    # Set when links were added while the matrices were not up to date
+    dirty: bool = False
+    # Compiled topologies are cached here. Setting it turns the cache on, left at None the
+    # cache is only used when asked for, under the user's cache directory
+    cacheDir: str = None
+    # Bumped whenever the layout of the cached arrays changes
+    CACHE_VERSION: int = 1
+    # (src, dest, delay, bw) rows of a topology loaded from the cache, the graph is only rebuilt on demand
+    cachedLinks: np.ndarray = None
+    # Resolved lookups per (src, dest) entity pair, cleared whenever the matrices or the mapping change
+    delayCache: Dict[Tuple[int, int], float] = {}
+    pathBwCache: Dict[Tuple[int, int], float] = {}
+
+    @classmethod
+    def set_cache_dir(cls, cacheDir: str) -> None:
+        cls.cacheDir = cacheDir
 
     @classmethod
-    def build_network_topology(cls, fileName: str) -> None:
-        Log.print_line("Topology file:", fileName)
-        reader = GraphReaderBrite()
+    def build_network_topology(cls, fileName: str, useCache: bool = None) -> None:
+        Log.print_line(f"Topology file: {fileName}")
 
+        if useCache is None:
+            useCache = cls.cacheDir is not None
         try:
-            cls.graph = reader.read_graph_file(fileName)
             cls.map = {}
+            cls.linkDelay = {}
+            cls.cachedLinks = None
+            if useCache and cls.load_cache(fileName):
+                return
+            reader = GraphReaderBrite()
+            cls.graph = reader.read_graph_file(fileName)
+            cls.nextIdx = cls.graph.get_number_of_nodes()
+            for link in cls.graph.get_link_iterator():
+                cls.set_link_delay(link.get_src_node_id(), link.get_dest_node_id(), link.get_link_delay())
             cls.generate_matrices()
+            if useCache:
+                cls.save_cache(fileName)
         except IOError as e:
-            Log.print_line("Problem in processing BRITE file. Network simulation is disabled. Error:", str(e))
+            Log.print_line(f"Problem in processing BRITE file. Network simulation is disabled. Error: {e}")
+
+    @classmethod
+    def get_cache_prefix(cls, fileName: str) -> str:
+        # Keyed by content, so an edited topology file never hits a stale entry
+        digest = hashlib.sha256()
+        with open(fileName, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+        return os.path.join(cls.get_cache_dir(), f"{digest.hexdigest()}.v{cls.CACHE_VERSION}")
+
+    @classmethod
+    def get_cache_dir(cls) -> str:
+        if cls.cacheDir is not None:
+            return cls.cacheDir
+        cacheHome: str = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(cacheHome, "workflowsim", "topology")
+
+    @classmethod
+    def load_cache(cls, fileName: str) -> bool:
+        # The arrays are memory mapped read-only: the OS shares the pages between the
+        # processes of a sweep and they are only copied if links are added later
+        import numpy as np
+        prefix: str = cls.get_cache_prefix(fileName)
+        try:
+            delayMatrix = np.load(prefix + ".delay.npy", mmap_mode='r')
+            predecessors = np.load(prefix + ".pred.npy", mmap_mode='r')
+            bwMatrix = np.load(prefix + ".bw.npy", mmap_mode='r')
+            links = np.load(prefix + ".links.npy")
+        except (OSError, ValueError):
+            return False
+        cls.delayMatrix = delayMatrix
+        cls.predecessors = predecessors
+        cls.bwMatrix = bwMatrix
+        cls.cachedLinks = links
+        cls.clear_caches()
+        cls.graph = None
+        cls.nextIdx = delayMatrix.shape[0]
+        cls.dirty = False
+        cls.networkEnabled = True
+        return True
+
+    @classmethod
+    def save_cache(cls, fileName: str) -> None:
+        import numpy as np
+        prefix: str = cls.get_cache_prefix(fileName)
+        links = np.array([(link.get_src_node_id(), link.get_dest_node_id(), link.get_link_delay(), link.get_link_bw())
+                          for link in cls.graph.get_link_iterator()], dtype=float).reshape(-1, 4)
+        try:
+            os.makedirs(os.path.dirname(prefix), exist_ok=True)
+            # links goes last, load_cache requires all four so a partial entry is a miss
+            for suffix, array in ((".delay.npy", cls.delayMatrix), (".pred.npy", cls.predecessors),
+                                  (".bw.npy", cls.bwMatrix), (".links.npy", links)):
+                # Written under a unique name and renamed, concurrent workers never see a partial file
+                tmpName: str = f"{prefix}{suffix}.{os.getpid()}.tmp"
+                with open(tmpName, 'wb') as file:
+                    np.save(file, array)
+                os.replace(tmpName, prefix + suffix)
+        except OSError as e:
+            Log.print_line(f"Topology cache not written: {e}")
+
+    @classmethod
+    def get_graph(cls) -> TopologicalGraph:
+        # Rebuild the graph of a cached topology the first time it is modified
+        if cls.graph is None:
+            cls.graph = TopologicalGraph()
+            if cls.cachedLinks is not None:
+                for node in range(cls.delayMatrix.shape[0]):
+                    cls.graph.add_node(TopologicalNode(node, str(node), 0, 0))
+                for src, dest, lat, bw in cls.cachedLinks:
+                    cls.graph.add_link(TopologicalLink(int(src), int(dest), float(lat), float(bw)))
+                    cls.set_link_delay(int(src), int(dest), float(lat))
+                cls.cachedLinks = None
+        return cls.graph
 
     @classmethod
     def generate_matrices(cls) -> None:
-        cls.delayMatrix = [[0.0 for _ in range(len(cls.graph))] for _ in range(len(cls.graph))]
-        cls.bwMatrix = cls.create_bw_matrix(cls.graph, False)
+        graph: TopologicalGraph = cls.get_graph()
+        delay = DelayMatrix_Float(graph, False)
+        cls.delayMatrix = delay.mDelayMatrix
+        cls.predecessors = delay.mPredecessors
+        cls.bwMatrix = cls.create_bw_matrix(graph, False)
+        cls.clear_caches()
+        cls.dirty = False
         cls.networkEnabled = True
 
+    @classmethod
+    @contextmanager
+    def batch(cls) -> Iterator[None]:
+        # Links added inside the block are collected and the matrices are built once on exit
+        cls.batchDepth += 1
+        try:
+            yield
+        finally:
+            cls.batchDepth -= 1
+            if cls.batchDepth == 0 and cls.dirty:
+                cls.generate_matrices()
+
+    @classmethod
+    def add_links(cls, links: Iterable[Tuple[int, int, float, float]]) -> None:
+        with cls.batch():
+            for srcId, destId, bw, lat in links:
+                cls.add_link(srcId, destId, bw, lat)
+
     @classmethod
     def add_link(cls, srcId: int, destId: int, bw: float, lat: float) -> None:
-        if cls.graph is None:
-            cls.graph = []
+        cls.get_graph()
 
         if cls.map is None:
             cls.map = {}
 
-        if srcId not in cls.map:
-            cls.graph.append(TopologicalNode(cls.nextIdx))
-            cls.map[srcId] = cls.nextIdx
-            cls.nextIdx += 1
+        for entityId in (srcId, destId):
+            if entityId not in cls.map:
+                cls.graph.add_node(TopologicalNode(cls.nextIdx, str(cls.nextIdx), 0, 0))
+                cls.map[entityId] = cls.nextIdx
+                cls.nextIdx += 1
 
-        if destId not in cls.map:
-            cls.graph.append(TopologicalNode(cls.nextIdx))
-            cls.map[destId] = cls.nextIdx
-            cls.nextIdx += 1
+        src: int = cls.map[srcId]
+        dest: int = cls.map[destId]
+        previous: float = cls.linkDelay.get((src, dest))
+        cls.graph.add_link(TopologicalLink(src, dest, float(lat), float(bw)))
+        cls.set_link_delay(src, dest, float(lat))
 
-        cls.graph.append(TopologicalLink(cls.map[srcId], cls.map[destId], float(lat), float(bw)))
-        cls.generate_matrices()
+        if cls.batchDepth > 0 or cls.dirty or cls.delayMatrix is None:
+            cls.dirty = True
+            if cls.batchDepth == 0:
+                cls.generate_matrices()
+        elif previous is not None and previous != 0 and (float(lat) > previous or float(lat) == 0):
+            # A slower link can lengthen existing paths, which relaxation can't express
+            cls.generate_matrices()
+        else:
+            cls.update_matrices(src, dest, float(bw), float(lat))
 
     @classmethod
-    def create_bw_matrix(cls, graph: List[List[float]], directed: bool) -> List[List[float]]:
-        nodes = len(graph)
-        mtx = [[0.0 for _ in range(nodes)] for _ in range(nodes)]
+    def set_link_delay(cls, src: int, dest: int, lat: float) -> None:
+        cls.linkDelay[(src, dest)] = lat
+        cls.linkDelay[(dest, src)] = lat
 
-        for i in range(nodes):
-            for j in range(nodes):
-                mtx[i][j] = 0.0
+    @classmethod
+    def update_matrices(cls, src: int, dest: int, bw: float, lat: float) -> None:
+        # Incremental update for a new or faster link, only paths through it can improve
+        import numpy as np
+        if not cls.delayMatrix.flags.writeable:
+            # Copy on write for matrices memory mapped from the cache
+            cls.delayMatrix = np.array(cls.delayMatrix)
+            cls.predecessors = np.array(cls.predecessors)
+            cls.bwMatrix = np.array(cls.bwMatrix)
+        cls.clear_caches()
+        nodes: int = cls.graph.get_number_of_nodes()
+        grow: int = nodes - cls.delayMatrix.shape[0]
+        if grow > 0:
+            cls.delayMatrix = np.pad(cls.delayMatrix, ((0, grow), (0, grow)), constant_values=np.inf)
+            cls.predecessors = np.pad(cls.predecessors, ((0, grow), (0, grow)), constant_values=-1)
+            cls.bwMatrix = np.pad(cls.bwMatrix, ((0, grow), (0, grow)), constant_values=0.0)
+            for i in range(nodes - grow, nodes):
+                cls.delayMatrix[i, i] = 0.0
+        cls.bwMatrix[src, dest] = bw
+        cls.bwMatrix[dest, src] = bw
+        if lat == 0:
+            # Same convention as DelayMatrix_Float, a zero delay is no link
+            return
+        D = cls.delayMatrix
+        P = cls.predecessors
+        for u, v in ((src, dest), (dest, src)):
+            through = D[:, u, None] + lat + D[None, v, :]
+            shorter = through < D
+            np.fill_diagonal(shorter, False)
+            pred = P[v].copy()
+            pred[v] = u
+            np.copyto(D, through, where=shorter)
+            np.copyto(P, pred, where=shorter)
 
-        for edge in graph:
-            mtx[edge[0]][edge[1]] = edge[3]
+    @classmethod
+    def create_bw_matrix(cls, graph: TopologicalGraph, directed: bool) -> np.ndarray:
+        import numpy as np
+        nodes = graph.get_number_of_nodes()
+        mtx = np.zeros((nodes, nodes))
+
+        for edge in graph.get_link_iterator():
+            mtx[edge.get_src_node_id(), edge.get_dest_node_id()] = edge.get_link_bw()
 
             if not directed:
-                mtx[edge[1]][edge[0]] = edge[3]
+                mtx[edge.get_dest_node_id(), edge.get_src_node_id()] = edge.get_link_bw()
 
         return mtx
 
@@ -76,31 +257,78 @@ class NetworkTopology:
                 if cloudSimEntityID not in cls.map:
                     if briteID not in cls.map.values():
                         cls.map[cloudSimEntityID] = briteID
+                        cls.clear_caches()
                     else:
-                        Log.print_line("Error in network mapping. BRITE node", briteID, "already in use.")
+                        Log.print_line(f"Error in network mapping. BRITE node {briteID} already in use.")
                 else:
-                    Log.print_line("Error in network mapping. CloudSim entity", cloudSimEntityID, "already mapped.")
+                    Log.print_line(f"Error in network mapping. CloudSim entity {cloudSimEntityID} already mapped.")
             except Exception as e:
-                Log.print_line("Error in network mapping. CloudSim node", cloudSimEntityID, "not mapped to BRITE node", briteID, ".", str(e))
+                Log.print_line(f"Error in network mapping. CloudSim node {cloudSimEntityID} not mapped to BRITE node {briteID}. {e}")
 
     @classmethod
     def unmap_node(cls, cloudSimEntityID: int) -> None:
         if cls.networkEnabled:
             try:
                 cls.map.pop(cloudSimEntityID)
+                cls.clear_caches()
             except Exception as e:
-                Log.print_line("Error in network unmapping. CloudSim node:", cloudSimEntityID, ".", str(e))
+                Log.print_line(f"Error in network unmapping. CloudSim node: {cloudSimEntityID}. {e}")
+
+    @classmethod
+    def clear_caches(cls) -> None:
+        cls.delayCache = {}
+        cls.pathBwCache = {}
 
     @classmethod
     def get_delay(cls, srcID: int, destID: int) -> float:
+        if not cls.networkEnabled:
+            return 0.0
+        delay: float = cls.delayCache.get((srcID, destID))
+        if delay is None:
+            delay = 0.0
+            src = cls.map.get(srcID)
+            dest = cls.map.get(destID)
+            if src is not None and dest is not None:
+                delay = float(cls.delayMatrix[src, dest])
+                if math.isinf(delay):
+                    # Unreachable pairs behave like unmapped ones instead of never delivering
+                    delay = 0.0
+            cls.delayCache[(srcID, destID)] = delay
+        return delay
+
+    @classmethod
+    def get_path_bw(cls, srcID: int, destID: int) -> float:
+        # Bottleneck bandwidth along the shortest delay path, 0 if there is no path
+        if not cls.networkEnabled:
+            return 0.0
+        bw: float = cls.pathBwCache.get((srcID, destID))
+        if bw is None:
+            bw = 0.0
+            src = cls.map.get(srcID)
+            dest = cls.map.get(destID)
+            if src is not None and dest is not None:
+                path = get_path(cls.predecessors, src, dest)
+                if len(path) > 1:
+                    bw = min(float(cls.bwMatrix[u, v]) for u, v in zip(path, path[1:]))
+                elif path:
+                    bw = float('inf')
+            cls.pathBwCache[(srcID, destID)] = bw
+        return bw
+
+    @classmethod
+    def get_bw(cls, srcID: int, destID: int) -> float:
         if cls.networkEnabled:
-            try:
-                delay = cls.delayMatrix[cls.map[srcID]][cls.map[destID]]
-                return delay
-            except Exception as e:
-                pass
+            src = cls.map.get(srcID)
+            dest = cls.map.get(destID)
+            if src is not None and dest is not None:
+                return float(cls.bwMatrix[src, dest])
         return 0.0
 
     @classmethod
     def is_network_enabled(cls) -> bool:
         return cls.networkEnabled
+
+
+SimulationContext.register(NetworkTopology, ('nextIdx', 'networkEnabled', 'delayMatrix', 'predecessors', 'bwMatrix',
+                                             'graph', 'map', 'linkDelay', 'batchDepth', 'dirty', 'cacheDir',
+                                             'cachedLinks', 'delayCache', 'pathBwCache'))
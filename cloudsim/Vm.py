@@ -211,17 +211,17 @@ class Host:
 
         if vm not in self.vmsMigratingIn:
             if self.storage < vm.get_size():
-                Log.print_line(f"[VmScheduler.addMigratingInVm] Allocation of VM #{vm.get_id()} to Host #{self.id} failed by storage")
+                Log.warning("[VmScheduler.addMigratingInVm] Allocation of VM #%s to Host #%s failed by storage", vm.get_id(), self.id)
                 exit(0)
             if not self.ramProvisioner.allocate_ram_for_vm(vm, vm.get_current_requested_ram()):
-                Log.print_line(f"[VmScheduler.addMigratingInVm] Allocation of VM #{vm.get_id()} to Host #{self.id} failed by RAM")
+                Log.warning("[VmScheduler.addMigratingInVm] Allocation of VM #%s to Host #%s failed by RAM", vm.get_id(), self.id)
                 exit(0)
             if not self.bwProvisioner.allocate_bw_for_vm(vm, vm.get_current_requested_bw()):
-                Log.print_line(f"[VmScheduler.addMigratingInVm] Allocation of VM #{vm.get_id()} to Host #{self.id} failed by BW")
+                Log.warning("[VmScheduler.addMigratingInVm] Allocation of VM #%s to Host #%s failed by BW", vm.get_id(), self.id)
                 exit(0)
             self.vmScheduler.get_vms_migrating_in().append(vm.get_id())
             if not self.vmScheduler.allocate_pes_for_vm(vm, vm.get_current_requested_mips()):
-                Log.print_line(f"[VmScheduler.addMigratingInVm] Allocation of VM #{vm.get_id()} to Host #{self.id} failed by MIPS")
+                Log.warning("[VmScheduler.addMigratingInVm] Allocation of VM #%s to Host #%s failed by MIPS", vm.get_id(), self.id)
                 exit(0)
 
             self.storage -= vm.get_size()
@@ -258,20 +258,20 @@ class Host:
 
     def vm_create(self, vm: Vm) -> bool:
         if self.storage < vm.get_size():
-            Log.print_line(f"[VmScheduler.vmCreate] Allocation of VM #{vm.get_id()} to Host #{self.id} failed by storage")
+            Log.warning("[VmScheduler.vmCreate] Allocation of VM #%s to Host #%s failed by storage", vm.get_id(), self.id)
             return False
 
         if not self.ramProvisioner.allocate_ram_for_vm(vm, vm.get_current_requested_ram()):
-            Log.print_line(f"[VmScheduler.vmCreate] Allocation of VM #{vm.get_id()} to Host #{self.id} failed by RAM")
+            Log.warning("[VmScheduler.vmCreate] Allocation of VM #%s to Host #%s failed by RAM", vm.get_id(), self.id)
             return False
 
         if not self.bwProvisioner.allocate_bw_for_vm(vm, vm.get_current_requested_bw()):
-            Log.print_line(f"[VmScheduler.vmCreate] Allocation of VM #{vm.get_id()} to Host #{self.id} failed by BW")
+            Log.warning("[VmScheduler.vmCreate] Allocation of VM #%s to Host #%s failed by BW", vm.get_id(), self.id)
             self.ramProvisioner.deallocate_ram_for_vm(vm)
             return False
         # Error present
         if not self.vmScheduler.allocate_pes_for_vm(vm, vm.get_current_requested_mips()):
-            Log.print_line(f"[VmScheduler.vmCreate] Allocation of VM #{vm.get_id()} to Host #{self.id} failed by MIPS")
+            Log.warning("[VmScheduler.vmCreate] Allocation of VM #%s to Host #%s failed by MIPS", vm.get_id(), self.id)
             self.ramProvisioner.deallocate_ram_for_vm(vm)
             self.bwProvisioner.deallocate_bw_for_vm(vm)
             return False
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import copy
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class SimulationContext:
+    # Owns the state the simulator keeps in class attributes: CloudSim's entity table,
+    # queues and clock, Parameters, ReplicaCatalog, FailureMonitor, NetworkTopology...
+    # The static API stays the way to reach it. Activating a context swaps its state
+    # into the registered classes and deactivating it saves the state back, so the
+    # event loop pays nothing for it. One context is active at a time, a thread that
+    # activates another context waits until the active one is deactivated.
+    #
+    #     context = SimulationContext()
+    #     with context:
+    #         CloudSim.init(...)
+    #         ...
+    #         CloudSim.start_simulation()
+
+    # (class, state fields, values the class was defined with)
+    registry: List[Tuple[type, Tuple[str, ...], Dict[str, Any]]] = []
+    lock: threading.RLock = threading.RLock()
+    active: SimulationContext = None
+    # Holds whatever the classes contained before a context was first activated
+    default: SimulationContext = None
+    # Contexts to restore when the active one is deactivated
+    stack: List[SimulationContext] = []
+
+    def __init__(self) -> None:
+        self.state: Dict[type, Dict[str, Any]] = {}
+
+
+    @staticmethod
+    def register(owner: type, fields: Tuple[str, ...]) -> None:
+        defaults: Dict[str, Any] = {field: copy.deepcopy(getattr(owner, field)) for field in fields}
+        SimulationContext.registry.append((owner, tuple(fields), defaults))
+
+
+    @staticmethod
+    def get_current() -> SimulationContext:
+        if SimulationContext.active is not None:
+            return SimulationContext.active
+        if SimulationContext.default is None:
+            SimulationContext.default = SimulationContext()
+        return SimulationContext.default
+
+
+    def is_active(self) -> bool:
+        return SimulationContext.get_current() is self
+
+
+    def get_state(self, owner: type) -> Dict[str, Any]:
+        state: Dict[str, Any] = self.state.get(owner)
+        if state is None:
+            for registered, _, defaults in SimulationContext.registry:
+                if registered is owner:
+                    state = copy.deepcopy(defaults)
+                    self.state[owner] = state
+                    break
+        return state
+
+
+    def get(self, owner: type, field: str) -> Any:
+        if self.is_active():
+            return getattr(owner, field)
+        return self.get_state(owner)[field]
+
+
+    def save(self) -> None:
+        for owner, fields, _ in SimulationContext.registry:
+            self.state[owner] = {field: getattr(owner, field) for field in fields}
+
+
+    def restore(self) -> None:
+        for owner, _, _ in SimulationContext.registry:
+            for field, value in self.get_state(owner).items():
+                setattr(owner, field, value)
+
+
+    def activate(self) -> SimulationContext:
+        SimulationContext.lock.acquire()
+        current: SimulationContext = SimulationContext.get_current()
+        SimulationContext.stack.append(current)
+        if current is not self:
+            current.save()
+            self.restore()
+            SimulationContext.active = self
+        return self
+
+
+    def deactivate(self) -> None:
+        if not self.is_active() or not SimulationContext.stack:
+            raise RuntimeError("Only the active simulation context can be deactivated")
+        previous: SimulationContext = SimulationContext.stack.pop()
+        if previous is not self:
+            self.save()
+            previous.restore()
+            SimulationContext.active = None if previous is SimulationContext.default else previous
+        SimulationContext.lock.release()
+
+
+    def run(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self:
+            return function(*args, **kwargs)
+
+
+    def __enter__(self) -> SimulationContext:
+        return self.activate()
+
+
+    def __exit__(self, *exc: Any) -> None:
+        self.deactivate()
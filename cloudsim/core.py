@@ -8,6 +8,8 @@ import math
 import copy
 from cloudsim.TreeSet import TreeSet
 from cloudsim.NetworkTopology import NetworkTopology
+from cloudsim.context import SimulationContext
+from cloudsim.profiler import EventProfiler
 from cloudsim.Log import Log
 
 
@@ -233,6 +235,9 @@ class FutureQueue:
     def __init__(self):
         self.sortedSet: TreeSet[SimEvent] = TreeSet()  # set
         self.serial: int = 0
+        # Events added first get serials below every other one, so that events at the
+        # same time are always in a strict order
+        self.firstSerial: int = -(1 << 62)
 
 
     def __len__(self) -> int:
@@ -254,8 +259,9 @@ class FutureQueue:
 
 
     def add_event_first(self, newEvent: SimEvent) -> None:
-        newEvent.set_serial(0)
+        newEvent.set_serial(self.firstSerial)
         self.sortedSet.add(newEvent)
+        self.firstSerial += 1
 
 
     def iterator(self) -> Iterator[SimEvent]:
@@ -490,7 +496,7 @@ class SimEntity(ABC):
             raise ValueError("Invalid entity type")
 
         if entityId < 0:
-            Log.print_line(f"{self.get_name()}.send(): Error - invalid entity id {entityId}")
+            Log.error("%s.send(): Error - invalid entity id %s", self.get_name(), entityId)
             return
         # If delay is negative or infinite, reset it to 0.0
         if delay < 0 or math.isinf(delay):
@@ -609,18 +615,12 @@ class SimEvent():
 
 
     def __lt__(self, other: SimEvent=None):
+        # Earlier time first, then the order in which the events were scheduled
         if other is None:
-            return 0
-        elif self.time < other.time:
-            return 1
-        elif self.time > other.time:
-            return -1
-        elif self.serial < other.serial:
-            return 1
-        elif self == other:
-            return 1
-        else:
-            return 0
+            return False
+        if self.time != other.time:
+            return self.time < other.time
+        return self.serial < other.serial
         
 
 
@@ -728,7 +728,7 @@ class CloudInformationService(SimEntity):
     
 
     def notify_all_entity(self) -> None:
-        Log.print_line(self.get_name() + ": Notify all CloudSim entities for shutting down.")
+        Log.info("%s: Notify all CloudSim entities for shutting down.", self.get_name())
         self.signal_shutdown(self.resList)
         self.signal_shutdown(self.gisList)
         self.resList.clear()
@@ -764,6 +764,7 @@ class CloudSim:
     paused: bool = False
     pauseAt: int = -1
     abruptTerminate: bool = False
+    profiler: EventProfiler = None
 
     def __init__(self) -> None:
         pass
@@ -823,6 +824,19 @@ class CloudSim:
             CloudSim.run_stop()
         except ValueError:
             raise ValueError("CloudSim.stopCloudSimulation(): Error - can't stop Cloud Simulation.")
+        if CloudSim.profiler is not None:
+            CloudSim.profiler.stop()
+
+
+    @staticmethod
+    def set_profiler(profiler: EventProfiler) -> None:
+        # None turns profiling off
+        CloudSim.profiler = profiler
+
+
+    @staticmethod
+    def get_profiler() -> EventProfiler:
+        return CloudSim.profiler
 
 
     @staticmethod
@@ -938,16 +952,23 @@ class CloudSim:
         if e is None:
              raise ValueError("Adding null entity.")
         else:
-            CloudSim.print_message(f"Adding: {e.get_name()}")
+            Log.info("Adding: %s", e.get_name())
         e.start_entity()
 
 
     @staticmethod
     def run_clock_tick() -> bool:
         queueEmpty: bool = False
-        for ent in CloudSim.entities:
-            if ent.get_state() == SimEntity.RUNNABLE:
-                ent.run()
+        profiler: EventProfiler = CloudSim.profiler
+        if profiler is None:
+            for ent in CloudSim.entities:
+                if ent.get_state() == SimEntity.RUNNABLE:
+                    ent.run()
+        else:
+            for ent in CloudSim.entities:
+                if ent.get_state() == SimEntity.RUNNABLE:
+                    profiler.run_entity(ent)
+            profiler.sample_queues(CloudSim._clock, CloudSim.future.size(), CloudSim.deferred.size())
         if CloudSim.future.size() > 0:
             to_remove: List[SimEvent] = []
             fit: TreeSet[SimEvent] = CloudSim.future.sortedSet
@@ -1107,6 +1128,8 @@ class CloudSim:
     @staticmethod
     def run_start() -> None:
         CloudSim._running = True
+        if CloudSim.profiler is not None:
+            CloudSim.profiler.begin()
         # Start all the entities
         for ent in CloudSim.entities:
             ent.start_entity()
@@ -1194,9 +1217,16 @@ class CloudSim:
 
     @staticmethod
     def print_message(message: str) -> None:
-        Log.print_line(message)
+        Log.info(message)
 
 
     @staticmethod
     def is_paused() -> bool:
         return CloudSim.paused
+
+
+SimulationContext.register(CloudSim, ('cisId', 'shutdownId', 'cis', 'traceFlag', 'calendar', 'terminateAt',
+                                      'minTimeBetweenEvents', 'entities', 'entitiesByName', 'future', 'deferred',
+                                      '_clock', '_running', 'waitPredicates', 'paused', 'pauseAt', 'abruptTerminate',
+                                      'profiler'))
+EventProfiler.register_tags(CloudSimTags)
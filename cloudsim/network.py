@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from typing import Final, List, Iterator
+from typing import Final, List, Iterator, Union, TYPE_CHECKING
 import math
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class TopologicalLink:
     def __init__(self, srcNode: int, destNode: int, delay: float, bw: float):
@@ -155,75 +158,109 @@ class GraphReaderBrite:
 
 
 class FloydWarshall_Float:
+    # Dense all-pairs shortest paths. A zero or infinite entry in the adjacency
+    # matrix means there is no link. Distances and predecessors are NumPy arrays,
+    # Pk[i][j] is the node before j on the shortest path from i, -1 if there is none.
     def __init__(self) -> None:
         self.numVertices: int = 0
-        self.Dk: List[List[float]] = []
-        self.Dk_minus_one: List[List[float]] = []
-        self.Pk: List[List[int]] = []
-        self.Pk_minus_one: List[List[int]] = []
+        self.Dk: np.ndarray = None
+        self.Pk: np.ndarray = None
 
     def initialize(self, numVertices: int) -> None:
+        import numpy as np
         self.numVertices = numVertices
+        self.Dk = np.zeros((numVertices, numVertices))
+        self.Pk = np.full((numVertices, numVertices), -1, dtype=np.int64)
+
+    def all_pairs_shortest_paths(self, adjMatrix: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+        import numpy as np
+        adj = np.array(adjMatrix, dtype=float).reshape(self.numVertices, self.numVertices)
+        linked = (adj != 0) & np.isfinite(adj)
+        D = np.where(linked, adj, np.inf)
+        P = np.where(linked, np.arange(self.numVertices)[:, None], -1)
+        np.fill_diagonal(D, 0.0)
+        np.fill_diagonal(P, -1)
+        through = np.empty_like(D)
+        shorter = np.empty(D.shape, dtype=bool)
+        for k in range(self.numVertices):
+            # Relax every pair through k at once, only strictly shorter paths win
+            np.add(D[:, k, None], D[None, k, :], out=through)
+            np.less(through, D, out=shorter)
+            # Row k and column k never change in step k, so updating in place is safe
+            np.copyto(D, through, where=shorter)
+            np.copyto(P, P[k], where=shorter)
+        self.Dk = D
+        self.Pk = P
+        return self.Dk
 
-        self.Dk = [[0.0] * numVertices for _ in range(numVertices)]
-        self.Dk_minus_one = [[0.0] * numVertices for _ in range(numVertices)]
+    def get_Pk(self) -> np.ndarray:
+        return self.Pk
 
-        self.Pk = [[0] * numVertices for _ in range(numVertices)]
-        self.Pk_minus_one = [[0] * numVertices for _ in range(numVertices)]
 
-    def all_pairs_shortest_paths(self, adjMatrix: List[List[float]]) -> List[List[float]]:
-        for i in range(self.numVertices):
-            for j in range(self.numVertices):
-                if adjMatrix[i][j] != 0:
-                    self.Dk_minus_one[i][j] = adjMatrix[i][j]
-                    self.Pk_minus_one[i][j] = i
-                else:
-                    self.Dk_minus_one[i][j] = float('inf')
-                    self.Pk_minus_one[i][j] = -1
+class Dijkstra_Float:
+    # Same interface as FloydWarshall_Float, but runs Dijkstra from every source on a
+    # sparse copy of the graph. Much faster when links are few compared to N^2.
+    def __init__(self) -> None:
+        self.numVertices: int = 0
+        self.Dk: np.ndarray = None
+        self.Pk: np.ndarray = None
 
-        for k in range(self.numVertices):
-            for i in range(self.numVertices):
-                for j in range(self.numVertices):
-                    if i != j:
-                        if self.Dk_minus_one[i][j] <= self.Dk_minus_one[i][k] + self.Dk_minus_one[k][j]:
-                            self.Dk[i][j] = self.Dk_minus_one[i][j]
-                            self.Pk[i][j] = self.Pk_minus_one[i][j]
-                        else:
-                            self.Dk[i][j] = self.Dk_minus_one[i][k] + self.Dk_minus_one[k][j]
-                            self.Pk[i][j] = self.Pk_minus_one[k][j]
-                    else:
-                        self.Pk[i][j] = -1
-
-            for i in range(self.numVertices):
-                for j in range(self.numVertices):
-                    self.Dk_minus_one[i][j] = self.Dk[i][j]
-                    self.Pk_minus_one[i][j] = self.Pk[i][j]
+    def initialize(self, numVertices: int) -> None:
+        self.numVertices = numVertices
 
+    def all_pairs_shortest_paths(self, adjMatrix: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+        import numpy as np
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import dijkstra
+        adj = np.array(adjMatrix, dtype=float).reshape(self.numVertices, self.numVertices)
+        adj[~np.isfinite(adj)] = 0.0
+        # A directed matrix is passed, DelayMatrix_Float already mirrors undirected links
+        self.Dk, P = dijkstra(csr_matrix(adj), directed=True, return_predecessors=True)
+        self.Pk = np.where(P < 0, -1, P).astype(np.int64)
         return self.Dk
 
-    def get_Pk(self) -> List[List[int]]:
+    def get_Pk(self) -> np.ndarray:
         return self.Pk
 
 
+def get_path(Pk: np.ndarray, srcID: int, destID: int) -> List[int]:
+    # Rebuilds the node sequence of a shortest path from a predecessor matrix
+    if srcID == destID:
+        return [srcID]
+    if Pk[srcID][destID] < 0:
+        return []
+    path: List[int] = [destID]
+    while path[-1] != srcID:
+        path.append(int(Pk[srcID][path[-1]]))
+    path.reverse()
+    return path
+
+
 class DelayMatrix_Float:
-    def __init__(self, graph: TopologicalGraph, directed: bool) -> None:
-        self.mDelayMatrix: List[List[float]] = []
+    # Graphs with fewer links than this fraction of N^2 use Dijkstra instead of Floyd-Warshall
+    SPARSE_DENSITY: float = 0.05
+
+    def __init__(self, graph: TopologicalGraph, directed: bool, method: str = "auto") -> None:
+        self.mDelayMatrix: np.ndarray = None
+        self.mPredecessors: np.ndarray = None
         self.mTotalNodeNum: int = 0
+        self.mLinkNum: int = 0
         self.create_delay_matrix(graph, directed)
-        self.calculate_shortest_path()
+        self.calculate_shortest_path(method)
 
     def get_delay(self, srcID: int, destID: int) -> float:
         if srcID > self.mTotalNodeNum or destID > self.mTotalNodeNum:
             raise ValueError("srcID or destID is higher than the highest stored node-ID!")
         return self.mDelayMatrix[srcID][destID]
 
+    def get_path(self, srcID: int, destID: int) -> List[int]:
+        return get_path(self.mPredecessors, srcID, destID)
+
     def create_delay_matrix(self, graph: TopologicalGraph, directed: bool) -> None:
+        import numpy as np
         self.mTotalNodeNum = graph.get_number_of_nodes()
-        self.mDelayMatrix = [[float('inf') for _ in range(self.mTotalNodeNum)] for _ in range(self.mTotalNodeNum)]
-        
-        for row in range(self.mTotalNodeNum):
-            for col in range(self.mTotalNodeNum):
-                self.mDelayMatrix[row][col] = float('inf')
+        self.mLinkNum = graph.get_number_of_links()
+        self.mDelayMatrix = np.full((self.mTotalNodeNum, self.mTotalNodeNum), np.inf)
 
         itr: Iterator[TopologicalLink] = graph.get_link_iterator()
 
@@ -233,10 +270,19 @@ class DelayMatrix_Float:
             if not directed:
                 self.mDelayMatrix[edge.get_dest_node_id()][edge.get_src_node_id()] = edge.get_link_delay()
 
-    def calculate_shortest_path(self) -> None:
-        floyd = FloydWarshall_Float()
-        floyd.initialize(self.mTotalNodeNum)
-        self.mDelayMatrix = floyd.all_pairs_shortest_paths(self.mDelayMatrix)
+    def calculate_shortest_path(self, method: str = "auto") -> None:
+        if method == "auto":
+            sparse: bool = self.mLinkNum < DelayMatrix_Float.SPARSE_DENSITY * self.mTotalNodeNum * self.mTotalNodeNum
+            method = "dijkstra" if sparse else "floyd"
+        if method == "dijkstra":
+            solver = Dijkstra_Float()
+        elif method == "floyd":
+            solver = FloydWarshall_Float()
+        else:
+            raise ValueError(f"Unknown shortest path method: {method}")
+        solver.initialize(self.mTotalNodeNum)
+        self.mDelayMatrix = solver.all_pairs_shortest_paths(self.mDelayMatrix)
+        self.mPredecessors = solver.get_Pk()
 
     def __str__(self) -> str:
         buffer = []
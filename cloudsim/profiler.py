@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cloudsim.core import SimEntity, SimEvent
+
+
+class EventProfiler:
+    # Times the event handlers of the simulation, per entity and per tag, and samples the
+    # size of the future and deferred queues once per simulated time step. Set it with
+    # CloudSim.set_profiler before start_simulation, it is written to its path when the
+    # simulation is stopped. The event loop only checks for a profiler once per clock
+    # tick, so a simulation without one runs as before.
+    #
+    #     profiler = EventProfiler("profile.json")
+    #     CloudSim.set_profiler(profiler)
+    #     CloudSim.start_simulation()
+    #     CloudSim.stop_simulation()
+    #     profiler.get_handlers()[0]  # the most expensive handler
+
+    # Classes whose int constants name the event tags, see register_tags
+    tagClasses: List[type] = []
+    # Constants of the tag classes that are not tags, besides the ...BASE ones
+    NOT_TAGS: Tuple[str, ...] = ("TRUE", "FALSE", "DEFAULT_BAUD_RATE")
+
+    def __init__(self, path: str = None):
+        # .csv writes the handlers to path and the queue sizes next to it, anything else JSON
+        self.path: str = path
+        # (entity, tag) -> [events, seconds]
+        self.handlers: Dict[Tuple[str, int], List[float]] = {}
+        # (simulation time, future queue size, deferred queue size)
+        self.queues: List[Tuple[float, int, int]] = []
+        self.start: float = time.perf_counter()
+        self.wallTime: float = 0.0
+
+
+    @staticmethod
+    def register_tags(tags: type) -> None:
+        EventProfiler.tagClasses.append(tags)
+
+
+    @staticmethod
+    def get_tag_names() -> Dict[int, str]:
+        names: Dict[int, str] = {}
+        for tags in EventProfiler.tagClasses:
+            for name, value in vars(tags).items():
+                if (isinstance(value, int) and not name.startswith("_") and not name.endswith("BASE")
+                        and name not in EventProfiler.NOT_TAGS):
+                    names.setdefault(value, name)
+        return names
+
+
+    def begin(self) -> None:
+        self.start = time.perf_counter()
+
+
+    def run_entity(self, entity: SimEntity) -> None:
+        # SimEntity.run with every process_event call timed
+        ev: SimEvent = entity.evbuf if entity.evbuf is not None else entity.get_next_event()
+        handlers: Dict[Tuple[str, int], List[float]] = self.handlers
+        name: str = entity.get_name()
+        while ev is not None:
+            start: float = time.perf_counter()
+            entity.process_event(ev)
+            elapsed: float = time.perf_counter() - start
+            stats: List[float] = handlers.get((name, ev.get_tag()))
+            if stats is None:
+                handlers[(name, ev.get_tag())] = [1, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+            if entity.get_state() != entity.RUNNABLE:
+                break
+            ev = entity.get_next_event()
+        entity.evbuf = None
+
+
+    def sample_queues(self, clock: float, future: int, deferred: int) -> None:
+        if self.queues and self.queues[-1][0] == clock:
+            self.queues[-1] = (clock, future, deferred)
+        else:
+            self.queues.append((clock, future, deferred))
+
+
+    def get_handlers(self) -> List[Dict[str, Any]]:
+        # Most expensive first
+        names: Dict[int, str] = EventProfiler.get_tag_names()
+        rows: List[Dict[str, Any]] = [{"entity": entity, "tag": tag, "tagName": names.get(tag, str(tag)),
+                                       "events": int(count), "seconds": seconds, "mean": seconds / count}
+                                      for (entity, tag), (count, seconds) in self.handlers.items()]
+        rows.sort(key=lambda row: row["seconds"], reverse=True)
+        return rows
+
+
+    def get_report(self) -> Dict[str, Any]:
+        return {
+            "wallTime": self.wallTime,
+            "events": sum(int(count) for count, _ in self.handlers.values()),
+            "handlers": self.get_handlers(),
+            "queues": [list(sample) for sample in self.queues],
+        }
+
+
+    def stop(self) -> None:
+        self.wallTime = time.perf_counter() - self.start
+        if self.path:
+            self.dump(self.path)
+
+
+    def dump(self, path: str) -> None:
+        if not path.endswith(".csv"):
+            with open(path, "w") as file:
+                json.dump(self.get_report(), file, indent=1)
+            return
+        with open(path, "w", newline="") as file:
+            writer: csv.DictWriter = csv.DictWriter(file, fieldnames=["entity", "tag", "tagName", "events", "seconds", "mean"])
+            writer.writeheader()
+            writer.writerows(self.get_handlers())
+        with open(os.path.splitext(path)[0] + ".queues.csv", "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["time", "future", "deferred"])
+            writer.writerows(self.queues)
@@ -2,10 +2,8 @@ from __future__ import annotations
 
 from typing import List
 import random
-import time
 import os
 from datetime import datetime
-from tabulate import tabulate
 
 from cloudsim.core import CloudSim
 from cloudsim.Cloudlet import Cloudlet
@@ -27,7 +25,7 @@ from workflowsim.WorkflowEngine import WorkflowEngine
 from workflowsim.WorkflowPlanner import WorkflowPlanner
 from workflowsim.utils.ClusteringParameters import ClusteringParameters
 from workflowsim.utils.OverheadParameters import OverheadParameters
-from workflowsim.utils.Parameters import Parameters, SchedulingAlgorithm, PlanningAlgorithm, ClassType
+from workflowsim.utils.Parameters import Parameters, SchedulingAlgorithm, PlanningAlgorithm, ClassType, RandomStream
 from workflowsim.utils.ReplicaCatalog import ReplicaCatalog
 from workflowsim.utils.metrices import Metrics
 from workflowsim.CustomVMGenerator import CustomVMGenerator
@@ -48,8 +46,8 @@ class HEFTExample():
 
         # create VMs
         vm: List[CondorVM] = [None]*vms
-        currentTimeMillis = int(time.time() * 1000)  # Get current time in milliseconds
-        bwRandom: random.Random = random.Random(currentTimeMillis)
+        # Seeded from the master seed if one is set, from the OS otherwise
+        bwRandom: random.Random = Parameters.getRandom(RandomStream.VM)
 
         for i in range(vms):
             ratio: float = 0.5 # bwRandom.random()  # Generate a random float between 0.0 and 1.0
@@ -118,6 +116,8 @@ class HEFTExample():
 
             table.append([job_id, task_ids, status, data_center_id, vm_id, time, start_time, finish_time, depth])
 
+        # tabulate is only needed for the final report, keep it off the import path
+        from tabulate import tabulate
         headers = ["Job ID", "Task ID", "STATUS", "Data center ID", "VM ID", "Time", "Start Time", "Finish Time", "Depth"]
         table_str = tabulate(table, headers, tablefmt="grid")
 
@@ -0,0 +1,91 @@
+from typing import Dict, List
+
+import pytest
+
+from cloudsim.Cloudlet import Cloudlet
+from cloudsim.CloudletScheduler import CloudletScheduler
+from cloudsim.CloudletSchedulerSpaceShared import CloudletSchedulerSpaceShared
+from cloudsim.CloudletSchedulerTimeShared import CloudletSchedulerTimeShared
+from cloudsim.context import SimulationContext
+from cloudsim.core import CloudSim
+from cloudsim.UtilizationModel import UtilizationModelFull
+
+# Every PE of the VM runs at this many MIPS
+MIPS: float = 1000.0
+
+
+def create_cloudlet(cloudletId: int, length: int, pes: int = 1) -> Cloudlet:
+    full = UtilizationModelFull()
+    return Cloudlet(cloudletId, length, pes, 0, 0, full, full, full)
+
+
+def run(scheduler: CloudletScheduler, cloudlets: List[Cloudlet], pes: int, cancelAt: float = None,
+        cancelId: int = None) -> Dict[int, float]:
+    # Drives the scheduler the way the datacenter does: the clock jumps to the next
+    # event the scheduler asks for and the VM is updated there. Returns the finish time
+    # of each cloudlet that completed.
+    mipsShare: List[float] = [MIPS] * pes
+    finishTimes: Dict[int, float] = {}
+    with SimulationContext():
+        CloudSim.init(num_user=1, cal=None, traceFlag=False)
+        scheduler.update_vm_processing(0.0, mipsShare)
+        for cloudlet in cloudlets:
+            # The cloudlet is charged to some resource before it is submitted, any entity does here
+            cloudlet.set_resource_parameter(CloudSim.get_cloud_info_service_entity_id(), 0.0)
+            scheduler.cloudlet_submit(cloudlet, 0.0)
+        nextEvent: float = scheduler.update_vm_processing(0.0, mipsShare)
+        while nextEvent != float('inf'):
+            if cancelAt is not None and cancelAt < nextEvent:
+                CloudSim._clock = cancelAt
+                scheduler.cloudlet_cancel(cancelId)
+                cancelAt = None
+            else:
+                CloudSim._clock = nextEvent
+            nextEvent = scheduler.update_vm_processing(CloudSim.clock(), mipsShare)
+            while scheduler.is_finished_cloudlets():
+                cloudlet = scheduler.get_next_finished_cloudlet()
+                finishTimes[cloudlet.get_cloudlet_id()] = cloudlet.get_finish_time()
+    return finishTimes
+
+
+def test_space_shared_equal_lengths():
+    finishTimes = run(CloudletSchedulerSpaceShared(), [create_cloudlet(0, 10000), create_cloudlet(1, 10000)], 2)
+    assert finishTimes == pytest.approx({0: 10.0, 1: 10.0}, abs=1e-6)
+
+
+def test_space_shared_more_cloudlets_than_pes():
+    # 2 waits for the first free PE, at 10, and runs 5 seconds there
+    cloudlets = [create_cloudlet(0, 10000), create_cloudlet(1, 20000), create_cloudlet(2, 5000)]
+    finishTimes = run(CloudletSchedulerSpaceShared(), cloudlets, 2)
+    assert finishTimes == pytest.approx({0: 10.0, 1: 20.0, 2: 15.0}, abs=1e-6)
+
+
+def test_space_shared_wide_cloudlet_waits_for_its_pes():
+    # 1 needs both PEs, it starts once 0 is done. Its length is per PE, 20 seconds on each
+    cloudlets = [create_cloudlet(0, 10000), create_cloudlet(1, 20000, 2)]
+    finishTimes = run(CloudletSchedulerSpaceShared(), cloudlets, 2)
+    assert finishTimes == pytest.approx({0: 10.0, 1: 30.0}, abs=1e-6)
+
+
+def test_space_shared_cancel_mid_run():
+    # Cancelling 0 at 4 frees the PE, 1 starts then and runs 10 seconds
+    cloudlets = [create_cloudlet(0, 10000), create_cloudlet(1, 10000)]
+    finishTimes = run(CloudletSchedulerSpaceShared(), cloudlets, 1, cancelAt=4.0, cancelId=0)
+    assert finishTimes == pytest.approx({1: 14.0}, abs=1e-6)
+    assert cloudlets[0].get_cloudlet_status() == Cloudlet.CANCELED
+
+
+def test_time_shared_oversubscription():
+    # 3 cloudlets on 2 PEs get 2/3 of a PE each until 0 and 1 finish at 15, then 2
+    # has 10000 MI left at the full 1000 MIPS
+    cloudlets = [create_cloudlet(0, 10000), create_cloudlet(1, 10000), create_cloudlet(2, 20000)]
+    finishTimes = run(CloudletSchedulerTimeShared(), cloudlets, 2)
+    assert finishTimes == pytest.approx({0: 15.0, 1: 15.0, 2: 25.0}, abs=1e-6)
+
+
+def test_time_shared_cancel_speeds_up_the_rest():
+    # Both run at half speed, 1 has done 2000 MI at 4 and finishes its 8000 MI alone
+    cloudlets = [create_cloudlet(0, 10000), create_cloudlet(1, 10000)]
+    finishTimes = run(CloudletSchedulerTimeShared(), cloudlets, 1, cancelAt=4.0, cancelId=0)
+    assert finishTimes == pytest.approx({1: 12.0}, abs=1e-6)
+    assert cloudlets[0].get_cloudlet_status() == Cloudlet.CANCELED
@@ -0,0 +1,89 @@
+import io
+import threading
+
+from cloudsim.context import SimulationContext
+from cloudsim.Log import Log
+from workflowsim.failure import FailureMonitor, FailureParameters, FailureRecord
+from workflowsim.utils.ReplicaCatalog import ReplicaCatalog
+
+
+def fill(site: str, vmId: int) -> None:
+    # Records are kept per VM in this mode, with a statistic per VM
+    FailureParameters.monitorMode = FailureParameters.FTCMonitor.MONITOR_VM
+    FailureMonitor.init()
+    FailureMonitor.post_failure_record(FailureRecord(1.0, 1, 0, 1, vmId, vmId, 0))
+    ReplicaCatalog.init(ReplicaCatalog.FileSystem.LOCAL)
+    ReplicaCatalog.add_file_to_storage(site + ".dat", site)
+
+
+def snapshot(site: str, vmId: int) -> dict:
+    return {
+        "vm2record": list(FailureMonitor.vm2record),
+        "type2record": list(FailureMonitor.type2record),
+        "jobid2record": list(FailureMonitor.jobid2record),
+        "vm2statistic": list(FailureMonitor.vm2statistic),
+        "type2statistic": list(FailureMonitor.type2statistic),
+        "records": len(FailureMonitor.recordList),
+        "files": ReplicaCatalog.get_files_at(site),
+        "sites": ReplicaCatalog.get_storage_list(site + ".dat"),
+        "vm": vmId,
+    }
+
+
+def test_contexts_do_not_share_state():
+    first, second = SimulationContext(), SimulationContext()
+    with first:
+        fill("first", 1)
+        expected = snapshot("first", 1)
+    with second:
+        # Nothing of the first context is visible in a new one
+        assert FailureMonitor.vm2record == {} and FailureMonitor.vm2statistic == {}
+        assert ReplicaCatalog.site2files == {} and ReplicaCatalog.dataReplicaCatalog == {}
+        fill("second", 2)
+        other = snapshot("second", 2)
+    with first:
+        assert snapshot("first", 1) == expected
+        assert ReplicaCatalog.get_files_at("second") == []
+        assert 2 not in FailureMonitor.vm2record
+    with second:
+        assert snapshot("second", 2) == other
+        assert ReplicaCatalog.get_files_at("first") == []
+        assert 1 not in FailureMonitor.vm2record
+
+
+def test_nested_context_leaves_outer_state():
+    with SimulationContext():
+        fill("outer", 1)
+        expected = snapshot("outer", 1)
+        with SimulationContext():
+            fill("inner", 2)
+        assert snapshot("outer", 1) == expected
+        assert ReplicaCatalog.get_files_at("inner") == []
+        assert ReplicaCatalog.has_replica("outer.dat", "outer")
+
+
+def test_log_state_is_per_context():
+    output = io.StringIO()
+    Log.set_output(output)
+    with SimulationContext():
+        # A new context starts enabled, at every level, on stdout
+        assert not Log.is_disabled() and Log.get_level() == Log.DEBUG and Log.output is None
+        Log.disable()
+        Log.set_level(Log.ERROR)
+    assert not Log.is_disabled() and Log.get_level() == Log.DEBUG and Log.get_output() is output
+    Log.set_output(None)
+
+
+def test_second_thread_waits_for_active_context():
+    entered = threading.Event()
+
+    def enter() -> None:
+        with SimulationContext():
+            entered.set()
+
+    with SimulationContext():
+        thread = threading.Thread(target=enter)
+        thread.start()
+        assert not entered.wait(0.2)
+    thread.join(5)
+    assert entered.is_set()
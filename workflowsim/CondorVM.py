@@ -20,6 +20,8 @@ class CondorVM(Vm.Vm):
         self.costPerStorage: float = costPerStorage
         self.costPerBw: float = costPerBw
         self.state: int = WorkflowSimTags.VM_STATUS_IDLE  # Initialize VM state as IDLE at the beginning
+        # Jobs submitted to the VM, it is IDLE as long as one of its numberOfPes slots is free
+        self.busySlots: int = 0
 
     
     def get_cost(self) -> float:
@@ -43,4 +45,18 @@ class CondorVM(Vm.Vm):
 
 
     def get_state(self) -> int:
-        return self.state
\ No newline at end of file
+        return self.state
+
+
+    def get_free_slots(self) -> int:
+        return max(0, self.get_number_of_pes() - self.busySlots)
+
+
+    def acquire_slot(self) -> None:
+        self.busySlots += 1
+        self.state = WorkflowSimTags.VM_STATUS_IDLE if self.get_free_slots() > 0 else WorkflowSimTags.VM_STATUS_BUSY
+
+
+    def release_slot(self) -> None:
+        self.busySlots = max(0, self.busySlots - 1)
+        self.state = WorkflowSimTags.VM_STATUS_IDLE
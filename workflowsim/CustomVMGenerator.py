@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import List
 from cloudsim.CloudletSchedulerSpaceShared import CloudletSchedulerSpaceShared
+from cloudsim.CloudletSchedulerTimeShared import CloudletSchedulerTimeShared
 from workflowsim.CondorVM import CondorVM
 from workflowsim.CustomVM import CustomVM
 
@@ -30,20 +31,22 @@ class CustomVMGenerator:
     
 
     @staticmethod
-    def create_custom_vms(userId: int, vms: int) -> List[CondorVM]:
+    def create_custom_vms(userId: int, vms: int, multiCore: bool = False) -> List[CondorVM]:
+        # multiCore gives each VM the PEs of its type and a time-shared cloudlet scheduler,
+        # so the workflow schedulers can run one job per PE. Otherwise every VM has one PE.
         vmList: List[CustomVM] = list()
         # first create regular condor vm
         list0: List[CondorVM] = CustomVMGenerator.create_condor_vm(userId, vms)
         vmType: int = 0
         for vm in list0:
-            cvm: CustomVM = CustomVMGenerator.get_vm(vmType//5, vm)
+            cvm: CustomVM = CustomVMGenerator.get_vm(vmType//5, vm, multiCore)
             vmType += 1
             vmList.append(cvm)
         return vmList
     
 
     @staticmethod
-    def get_vm(vmType: int, vm: CondorVM) -> CustomVM:
+    def get_vm(vmType: int, vm: CondorVM, multiCore: bool = False) -> CustomVM:
         pesNumber: int = 0
         memory: float = 0.0
         bandwidth: int = 0
@@ -118,5 +121,8 @@ class CustomVMGenerator:
         # maxVoltage = 30
         # minVoltage = 15
         cvm = CustomVM(vm, cost, costPerMem, costPerStorage, costPerBW, minFreq, maxFreq, minVoltage, maxVoltage, lambda_)
+        if multiCore:
+            cvm.set_number_of_pes(pesNumber)
+            cvm.set_cloudlet_scheduler(CloudletSchedulerTimeShared())
         
         return cvm
\ No newline at end of file
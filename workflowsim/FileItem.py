@@ -17,6 +17,8 @@ class FileType(Enum):
 
 
 class FileItem:
+    __slots__ = ("name", "size", "type")
+
     def __init__(self, name: str, size: float):
         self.name = name
         self.size = size
@@ -2,9 +2,15 @@ from typing import List
 from workflowsim.Task import Task
 
 class Job(Task):
+    __slots__ = ("taskList", "wastedTime", "recoveredTime", "stagedBytes")
+
     def __init__(self, job_id: int, job_length: int):
         super().__init__(job_id, job_length)
         self.taskList = []
+        self.wastedTime: float = 0.0
+        self.recoveredTime: float = 0.0
+        # Bytes of input transferred to the VM before the job could start
+        self.stagedBytes: float = 0.0
 
 
     def get_task_list(self) -> List[Task]:
@@ -20,4 +26,28 @@ class Job(Task):
 
 
     def get_parent_list(self) -> List[Task]:
-        return super().get_parentList()
\ No newline at end of file
+        return super().get_parentList()
+
+
+    def set_wasted_time(self, time: float):
+        self.wastedTime = time
+
+
+    def get_wasted_time(self) -> float:
+        return self.wastedTime
+
+
+    def set_recovered_time(self, time: float):
+        self.recoveredTime = time
+
+
+    def get_recovered_time(self) -> float:
+        return self.recoveredTime
+
+
+    def add_staged_bytes(self, size: float):
+        self.stagedBytes += size
+
+
+    def get_staged_bytes(self) -> float:
+        return self.stagedBytes
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 import math
-from typing import List, Dict, cast
+from typing import List, Dict, Tuple, cast
 from cloudsim.Cloudlet import Cloudlet
 from cloudsim.Log import Log
+from cloudsim.context import SimulationContext
 from workflowsim.Job import Job
 from workflowsim.Task import Task
 from workflowsim.failure import FailureMonitor, FailureRecord, FailureParameters
+from workflowsim.checkpoint import CheckpointParameters, CheckpointModel
 from workflowsim.utils.Parameters import Parameters
 from workflowsim.utils.OverheadParameters import OverheadParameters
 
 
 class ClusteringSizeEstimator:
+    MAX_K: int = 200
+    # Exact inputs -> optimal K, owned by the SimulationContext so runs don't share it
+    memo: Dict[Tuple[float, ...], int] = {}
+
     # return the makespan
     @staticmethod
     def f(clustering_size: float, task_runtime: float, system_overhead: float, theta: float, phi_gamma: float, phi_ts: float) -> float:
@@ -29,15 +35,33 @@ class ClusteringSizeEstimator:
     # return the optimal K
     @staticmethod
     def estimateK(task_runtime: float, system_overhead: float, theta: float, phi_gamma: float, phi_ts: float) -> int:
-        optimalK: int = 0
-        minM: float = float("inf")
-        for k in range(1, 200):
-            M: float = ClusteringSizeEstimator.f(k, task_runtime, system_overhead, theta, phi_gamma, phi_ts)
-            if (M < minM):
-                minM = M
-                optimalK = k
+        key: Tuple[float, ...] = (task_runtime, system_overhead, theta, phi_gamma, phi_ts)
+        optimalK: int = ClusteringSizeEstimator.memo.get(key)
+        if optimalK is None:
+            optimalK = ClusteringSizeEstimator.search(task_runtime, system_overhead, theta, phi_gamma, phi_ts)
+            ClusteringSizeEstimator.memo[key] = optimalK
         return optimalK
-    
+
+
+    # evaluate f over every candidate size at once instead of one k at a time
+    @staticmethod
+    def search(task_runtime: float, system_overhead: float, theta: float, phi_gamma: float, phi_ts: float) -> int:
+        import numpy as np
+        k = np.arange(1, ClusteringSizeEstimator.MAX_K, dtype=float)
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            d = (k * task_runtime + system_overhead) * (phi_ts - 1)
+            M = d / k * np.exp(np.power(d / theta, phi_gamma))
+        M = np.where(np.isnan(M), np.inf, M)
+        best: int = int(np.argmin(M))
+        if not M[best] < float("inf"):
+            return 0
+        return best + 1
+
+
+    @staticmethod
+    def clear_memo() -> None:
+        ClusteringSizeEstimator.memo.clear()
+
 
 
 class ReclusteringEngine:
@@ -62,7 +86,7 @@ class ReclusteringEngine:
         jobList: List = list()
         algorithm = FailureParameters.get_ft_clustering_algorithm()
         if algorithm == FailureParameters.get_ft_clustering_algorithm().FTCLUSTERING_NOOP:
-            jobList.append(ReclusteringEngine.create_job(id, job, job.get_cloudlet_length(), job.get_task_list(), True))
+            jobList.append(ReclusteringEngine.create_job(id, job, ReclusteringEngine.get_retry_length(job, job.get_task_list()), job.get_task_list(), True))
         # Dynamic clustering.
         elif algorithm in [FailureParameters.get_ft_clustering_algorithm().FTCLUSTERING_DC, FailureParameters.get_ft_clustering_algorithm().FTCLUSTERING_DR]:
             jobList = ReclusteringEngine.dc_reclustering(jobList, job, id, job.get_task_list())
@@ -80,6 +104,17 @@ class ReclusteringEngine:
         return jobList
     
     
+    @staticmethod
+    def get_retry_length(job: Job, taskList: List[Task]) -> int:
+        # Without checkpoints the whole job is executed again
+        if not CheckpointParameters.is_enabled():
+            return job.get_cloudlet_length()
+        length: int = 0
+        for task in taskList:
+            length += CheckpointModel.get_remaining_length(task)
+        return length
+
+
     @staticmethod
     def get_depth_map(taskList: List[Task]) -> Dict[int, List[Task]]:
         map: Dict[int, List[Task]] = {}
@@ -157,7 +192,7 @@ class ReclusteringEngine:
         record.delayLength = ReclusteringEngine.get_cumulative_delay(job.depth)
         suggestedK: int = FailureMonitor.get_clustering_factor(record)
         if suggestedK == 0:
-            jobList.append(ReclusteringEngine.create_job(id, job, job.get_cloudlet_length(), allTaskList, True))
+            jobList.append(ReclusteringEngine.create_job(id, job, ReclusteringEngine.get_retry_length(job, allTaskList), allTaskList, True))
         else:
             actualK: int = 0
             taskList: List[Task] = []
@@ -168,7 +203,7 @@ class ReclusteringEngine:
                 if actualK < suggestedK:
                     actualK += 1
                     taskList.append(task)
-                    length += task.get_cloudlet_length()
+                    length += CheckpointModel.get_remaining_length(task)
                 else:
                     newJob.set_task_list(taskList)
                     taskList: List[Task] = []
@@ -194,7 +229,7 @@ class ReclusteringEngine:
         for task in job.get_task_list():
             if task.get_cloudlet_status() == Cloudlet.FAILED:
                 newTaskList.append(task)
-                length += task.get_cloudlet_length()
+                length += CheckpointModel.get_remaining_length(task)
         jobList.append(ReclusteringEngine.create_job(id, job, length, newTaskList, True))
         return jobList
     
@@ -247,3 +282,6 @@ class ReclusteringEngine:
     @staticmethod
     def update_dependencies(job: Job, jobList: List[Job]) -> None:
         pass
+
+
+SimulationContext.register(ClusteringSizeEstimator, ('memo',))
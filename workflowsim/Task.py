@@ -7,8 +7,14 @@ from cloudsim.UtilizationModel import UtilizationModelFull
 
 
 class Task(Cloudlet):
+    # UtilizationModelFull has no state, every task shares this one
+    UTILIZATION_FULL: UtilizationModelFull = UtilizationModelFull()
+
+    __slots__ = ("taskId", "taskLength", "childList", "parentList", "fileList", "impact", "taskFinishTime", "type",
+                 "priority", "depth", "checkpointedLength")
+
     def __init__(self, taskId: int, taskLength: int):
-        super().__init__(taskId, taskLength, 1, 0, 0, UtilizationModelFull(), UtilizationModelFull(), UtilizationModelFull())
+        super().__init__(taskId, taskLength, 1, 0, 0, Task.UTILIZATION_FULL, Task.UTILIZATION_FULL, Task.UTILIZATION_FULL)
         self.taskId: int = taskId
         self.taskLength: int = taskLength
         self.childList: List[Task] = []
@@ -19,6 +25,7 @@ class Task(Cloudlet):
         self.type: str = None
         self.priority: int = 0
         self.depth: int = 0
+        self.checkpointedLength: int = 0
 
     def __str__(self):
         return f"Task ID: {self.taskId}, Task Length: {self.taskLength}, " \
@@ -114,6 +121,14 @@ class Task(Cloudlet):
 
     def get_taskFinishTime(self) -> float:
         return self.taskFinishTime
+
+
+    def set_checkpointed_length(self, length: int):
+        self.checkpointedLength = length
+
+
+    def get_checkpointed_length(self) -> int:
+        return self.checkpointedLength
     
 
     def get_processingCost(self) -> float:
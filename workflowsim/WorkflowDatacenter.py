@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Tuple, cast
+from typing import List, Dict, Tuple, cast
 import math
 
 from cloudsim.Cloudlet import Cloudlet
@@ -13,17 +13,26 @@ from cloudsim.Storage import Storage
 from cloudsim.core import CloudSim, CloudSimTags, SimEvent
 from cloudsim.Log import Log
 from workflowsim.utils.ReplicaCatalog import ReplicaCatalog
-from workflowsim.utils.Parameters import Parameters, CostModel, ClassType, FileType
+from workflowsim.utils.Parameters import Parameters, CostModel, ClassType
 from workflowsim.Job import Job
 from workflowsim.Task import Task
 from workflowsim.CustomVM import CustomVM
 from workflowsim.FileItem import FileItem
+from workflowsim.checkpoint import CheckpointParameters, CheckpointModel
+from workflowsim.transfer import TransferParameters, NetworkParameters, FlowModel, Flow
+from workflowsim.WorkflowSimTags import WorkflowSimTags
 
 
 class WorkflowDatacenter(Datacenter):
     def __init__(self, name: str, characteristics: DatacenterCharacteristics, vmAllocationPolicy: VmAllocationPolicy,
                  storageList: List[Storage], schedulingInterval: float) -> None:
         super().__init__(name, characteristics, vmAllocationPolicy, storageList, schedulingInterval)
+        # Stage-in transfers that share link bandwidth, see TransferParameters
+        self.flowModel: FlowModel = FlowModel()
+        self.stagingJobs: Dict[Job, CustomVM] = {}
+        # VMs with cloudlets to run or to collect -> (host index, vm index) so completions
+        # are returned in host order. Idle VMs are neither updated nor checked.
+        self.activeVms: Dict[Vm, Tuple[int, int]] = {}
 
 
     def process_cloudlet_submit(self, ev: SimEvent, ack: float) -> None:
@@ -32,9 +41,9 @@ class WorkflowDatacenter(Datacenter):
         job: Job = cast(Job, ev.get_data())
         if (job.is_finished()):
             name: str = CloudSim.get_entity_name(job.get_user_id())
-            Log.print_line(f"""{self.get_name()}: Warning - Cloudlet #{job.get_cloudlet_id()} 
-                    owned by {name} is already completed/finished""")
-            Log.print_line("Therefore, it is not being executed again.\n")
+            Log.warning("""%s: Warning - Cloudlet #%s 
+                    owned by %s is already completed/finished""", self.get_name(), job.get_cloudlet_id(), name)
+            Log.warning("Therefore, it is not being executed again.\n")
             if (ack):
                 data: Tuple[int, int, int] = [self.get_id(), job.get_cloudlet_id(), CloudSimTags.FALSE]
                 # unique tag = operation tag
@@ -58,27 +67,152 @@ class WorkflowDatacenter(Datacenter):
             self.stage_in_file2filesystem(job)
         # Add data transfer time (communication cost)
         fileTransferTime: float = 0.0
+        staging: bool = False
         if (job.get_class_type()==ClassType.COMPUTE):
-            fileTransferTime = self.process_data_stage_in_for_compute_job(job.get_fileList(), job)
+            if TransferParameters.is_enabled():
+                staging = self.start_stage_in(job, vm)
+            else:
+                fileTransferTime = self.process_data_stage_in_for_compute_job(job.get_fileList(), job)
+        if (not staging):
+            self.start_execution(job, vm, fileTransferTime)
+        if (ack):
+            data: Tuple[int, int, int] = [self.get_id(), job.get_cloudlet_length(), CloudSimTags.TRUE]
+            self.send_now(job.get_user_id(), CloudSimTags.CLOUDLET_SUBMIT_ACK, data)
+        self.check_cloudlet_completion()
+
+
+    def start_execution(self, job: Job, vm: CustomVM, fileTransferTime: float) -> None:
+        # Time spent writing checkpoints is charged like the transfer time
+        checkpointTime: float = 0.0
+        if (job.get_class_type()!=ClassType.STAGE_IN and CheckpointParameters.is_enabled()):
+            checkpointTime = CheckpointModel.get_job_checkpoint_time(job, vm.get_mips())
+        self.activate_vm(vm)
         scheduler: CloudletScheduler = vm.get_cloudlet_scheduler()
-        estimatedFinishTime: float = scheduler.cloudlet_submit(job, fileTransferTime)
+        estimatedFinishTime: float = scheduler.cloudlet_submit(job, fileTransferTime + checkpointTime)
         self.update_task_exec_time(job, vm)
         # if this cloudlet is in the exec queue
         if (estimatedFinishTime > 0.0 and not math.isinf(estimatedFinishTime)):
             self.send(self.get_id(), estimatedFinishTime, CloudSimTags.VM_DATACENTER_EVENT)
         else:
-            Log.print_line("Warning: You schedule cloudlet to a busy VM.")
-        if (ack):
-            data: Tuple[int, int, int] = [self.get_id(), job.get_cloudlet_length(), CloudSimTags.TRUE]
-            self.send_now(job.get_user_id(), CloudSimTags.CLOUDLET_SUBMIT_ACK, data)
-        self.check_cloudlet_completion()
+            Log.warning("Warning: You schedule cloudlet to a busy VM.")
+
+
+    def activate_vm(self, vm: Vm) -> None:
+        if vm in self.activeVms:
+            return
+        host: Host = vm.get_host()
+        # Bring the scheduler to the last update, where it would be had it been updated while idle
+        vm.update_vm_processing(self.get_last_process_time(), host.get_allocated_mips_for_vm(vm))
+        hostList: List[Host] = self.get_vm_allocation_policy().get_host_list()
+        self.activeVms[vm] = (hostList.index(host), host.get_vm_list().index(vm))
+
+
+    def start_stage_in(self, job: Job, vm: CustomVM) -> bool:
+        # Starts one flow per missing input file, returns False if there is nothing to transfer
+        requiredFiles: List[FileItem] = job.get_fileList()
+        flows: List[Flow] = []
+        for file in requiredFiles:
+            if (not file.is_real_input_file(requiredFiles)):
+                continue
+            siteList: List[str] = ReplicaCatalog.get_storage_list(file.get_name())
+            if (len(siteList) == 0):
+                raise Exception(file.get_name() + " does not exist")
+            links: List[str] = None
+            file_system = ReplicaCatalog.get_file_system()
+            if file_system == ReplicaCatalog.FileSystem.SHARED:
+                maxRate: float = float('-inf')
+                for storage in self.get_storage_list():
+                    maxRate = max(storage.get_max_transfer_rate(), maxRate)
+                self.flowModel.set_capacity(FlowModel.link_out(self.get_name()), maxRate)
+                links = [FlowModel.link_out(self.get_name())]
+            elif file_system == ReplicaCatalog.FileSystem.LOCAL:
+                site: str = str(vm.get_id())
+                if ReplicaCatalog.has_replica(file.get_name(), site):
+                    continue
+                candidates: List[Tuple[str, float]] = []
+                for other in siteList:
+                    if other == self.get_name():
+                        continue
+                    if other == Parameters.SOURCE:
+                        capacity: float = TransferParameters.get_source_bandwidth()
+                        candidates.append((other, capacity if capacity > 0 else float('inf')))
+                    else:
+                        datacenterId, siteBw = self.get_site_bandwidth(other, job.get_user_id())
+                        candidates.append((other, min(siteBw, NetworkParameters.get_bandwidth(datacenterId, self.get_id()))))
+                if not candidates:
+                    continue
+                source: str = self.flowModel.pick_source(candidates)
+                self.flowModel.set_capacity(FlowModel.link_in(site), vm.get_bw())
+                for other, capacity in candidates:
+                    if other == source and not math.isinf(capacity):
+                        self.flowModel.set_capacity(FlowModel.link_out(source), capacity)
+                links = [FlowModel.link_in(site), FlowModel.link_out(source)]
+            if links is not None and file.get_size() > 0:
+                flows.append(Flow(job, file.get_name(), file.get_size() / float(Consts.MILLION), links))
+                job.add_staged_bytes(file.get_size())
+        if not flows:
+            return False
+        self.flowModel.advance(CloudSim.clock())
+        for flow in flows:
+            self.flowModel.add_flow(flow)
+        self.stagingJobs[job] = vm
+        self.schedule_stage_in_update()
+        return True
+
+
+    def schedule_stage_in_update(self) -> None:
+        delay: float = self.flowModel.reallocate()
+        if not math.isinf(delay):
+            self.schedule(self.get_id(), delay, WorkflowSimTags.STAGE_IN_UPDATE, self.flowModel.version)
+
+
+    def process_stage_in_update(self, ev: SimEvent) -> None:
+        if ev.get_data() != self.flowModel.version:
+            # The active flows changed after this event was scheduled
+            return
+        self.flowModel.advance(CloudSim.clock())
+        ready: List[Job] = []
+        for flow in self.flowModel.pop_finished():
+            if ReplicaCatalog.get_file_system() == ReplicaCatalog.FileSystem.LOCAL:
+                ReplicaCatalog.add_file_to_storage(flow.fileName, str(flow.job.get_vm_id()))
+            if flow.job not in ready and not self.flowModel.has_flows(flow.job):
+                ready.append(flow.job)
+        self.schedule_stage_in_update()
+        if ready:
+            self.update_cloudlet_processing()
+            for job in ready:
+                self.start_execution(job, self.stagingJobs.pop(job), 0.0)
+            self.check_cloudlet_completion()
+
+
+    def process_other_event(self, ev: SimEvent) -> None:
+        if ev is not None and ev.get_tag() == WorkflowSimTags.STAGE_IN_UPDATE:
+            self.process_stage_in_update(ev)
+        else:
+            super().process_other_event(ev)
+
+
+    def process_cloudlet_cancel(self, cloudlet_id: int, userId: int, vm_id: int) -> None:
+        # A job still waiting for its input is not known to the VM yet
+        for job in self.stagingJobs:
+            if job.get_cloudlet_id() == cloudlet_id and job.get_vm_id() == vm_id:
+                del self.stagingJobs[job]
+                self.flowModel.advance(CloudSim.clock())
+                self.flowModel.remove_job(job)
+                self.schedule_stage_in_update()
+                job.set_cloudlet_status(Cloudlet.CANCELED)
+                self.send_now(userId, CloudSimTags.CLOUDLET_CANCEL, job)
+                return
+        super().process_cloudlet_cancel(cloudlet_id, userId, vm_id)
 
 
     def update_task_exec_time(self, job: Job, vm: Vm) -> None:
         startTime: float = job.get_exec_start_time()
         for task in job.get_task_list():
             task.set_exec_start_time(startTime)
-            taskRuntime: float = task.get_cloudlet_length() / vm.get_mips()
+            # A retried task resumes from its last checkpoint
+            computeTime: float = CheckpointModel.get_remaining_length(task) / vm.get_mips()
+            taskRuntime: float = computeTime + CheckpointModel.get_checkpoint_time(computeTime)
             startTime += taskRuntime
             # Because CloudSim would not let us update end time here
             task.set_taskFinishTime(startTime)
@@ -113,6 +247,7 @@ class WorkflowDatacenter(Datacenter):
                         rate: float = storage.get_max_transfer_rate()
                         maxRate = max(rate, maxRate)
                     time += file.get_size() / float(Consts.MILLION) / maxRate
+                    job.add_staged_bytes(file.get_size())
                 elif file_system == ReplicaCatalog.FileSystem.LOCAL:
                     vmId: int = job.get_vm_id()
                     userId: int = job.get_user_id()
@@ -132,26 +267,46 @@ class WorkflowDatacenter(Datacenter):
                             # transfers from the source to the VM is limited to the VM bw only
                             bwth = vm.get_bw()
                         else:
-                            # transfers between two VMs is limited to both VMs
-                            bwth = min(vm.get_bw(), self.get_vm_allocation_policy().get_host(int(site), userId).get_vm(int(site), userId).get_bw())
+                            # transfers between two VMs is limited to both VMs and the network between their datacenters
+                            datacenterId, siteBw = self.get_site_bandwidth(site, userId)
+                            bwth = min(vm.get_bw(), siteBw, NetworkParameters.get_bandwidth(datacenterId, self.get_id()))
                         maxBwth = max(bwth, maxBwth)
                     if requiredFileStagein and maxBwth > 0.0:
                         time += file.size / float(Consts.MILLION) / maxBwth
+                        job.add_staged_bytes(file.size)
                     #  For the case when storage is too small it is not handled here
                     ReplicaCatalog.add_file_to_storage(file.name, str(vmId))
         return time
     
 
+    def get_site_bandwidth(self, site: str, userId: int) -> Tuple[int, float]:
+        # Datacenter of a replica site and the bandwidth of the site itself. Sites are VM ids,
+        # which may belong to another datacenter, or the name of a datacenter's storage
+        if not site.isdigit():
+            return CloudSim.get_entity_id(site), float('inf')
+        vmId: int = int(site)
+        host: Host = self.get_vm_allocation_policy().get_host(vmId, userId)
+        if host is not None:
+            return self.get_id(), host.get_vm(vmId, userId).get_bw()
+        datacenterId: int = CloudSim.get_entity(userId).get_vms_to_datacenters_map()[vmId]
+        datacenter: Datacenter = cast(Datacenter, CloudSim.get_entity(datacenterId))
+        return datacenterId, datacenter.get_vm_allocation_policy().get_host(vmId, userId).get_vm(vmId, userId).get_bw()
+
+
     def update_cloudlet_processing(self) -> None:
         if CloudSim.clock() < 0.111 or CloudSim.clock() > self.get_last_process_time() + 0.01:
-            hostList: List[Host] = self.get_vm_allocation_policy().get_host_list()
             smaller_time = float('inf')
-            # For each host...
-            for host in hostList:
-                # Inform VMs to update processing
-                time = host.update_vms_processing(CloudSim.clock())
+            # Inform the VMs with cloudlets to update processing
+            for vm in list(self.activeVms):
+                host: Host = vm.get_host()
+                if host is None:
+                    # destroyed
+                    del self.activeVms[vm]
+                    continue
+                time = vm.update_vm_processing(CloudSim.clock(), host.get_allocated_mips_for_vm(vm))
                 # What time do we expect that the next cloudlet will finish?
-                smaller_time = min(time, smaller_time)
+                if time > 0.0 and time < smaller_time:
+                    smaller_time = time
             # Ensure a minimal interval before scheduling the event
             if smaller_time < CloudSim.clock() + 0.11:
                 smaller_time = CloudSim.clock() + 0.11
@@ -161,24 +316,21 @@ class WorkflowDatacenter(Datacenter):
 
 
     def check_cloudlet_completion(self) -> None:
-        hostList: List[Host] = self.get_vm_allocation_policy().get_host_list()
-        for host in hostList:
-            for vm in host.get_vm_list():
-                while vm.get_cloudlet_scheduler().is_finished_cloudlets():
-                    cl: Cloudlet = vm.get_cloudlet_scheduler().get_next_finished_cloudlet()
-                    if cl is not None:
-                        self.send_now(cl.get_user_id(), CloudSimTags.CLOUDLET_RETURN, cl)
-                        self.register(cl)
+        for vm in sorted(self.activeVms, key=self.activeVms.get):
+            scheduler: CloudletScheduler = vm.get_cloudlet_scheduler()
+            while scheduler.is_finished_cloudlets():
+                cl: Cloudlet = scheduler.get_next_finished_cloudlet()
+                if cl is not None:
+                    self.send_now(cl.get_user_id(), CloudSimTags.CLOUDLET_RETURN, cl)
+                    self.register(cl)
+            if scheduler.is_idle():
+                del self.activeVms[vm]
 
 
     def register(self, cl: Cloudlet) -> None:
         tl: Task = cast(Task, cl)
-        fList: List[FileItem] = tl.get_fileList()
-        for file in fList:
-            if file.get_type().value == FileType.OUTPUT:  # Check if it's an output file
-                file_system = ReplicaCatalog.get_file_system()
-                if file_system == ReplicaCatalog.FileSystem.SHARED:
-                    ReplicaCatalog.add_file_to_storage(file.get_name(), self.get_name())
-                elif file_system == ReplicaCatalog.FileSystem.LOCAL:
-                    vmId = cl.get_vm_id()
-                    ReplicaCatalog.add_file_to_storage(file.get_name(), str(vmId))
\ No newline at end of file
+        file_system = ReplicaCatalog.get_file_system()
+        if file_system == ReplicaCatalog.FileSystem.SHARED:
+            ReplicaCatalog.register_outputs(tl, self.get_name())
+        elif file_system == ReplicaCatalog.FileSystem.LOCAL:
+            ReplicaCatalog.register_outputs(tl, str(cl.get_vm_id()))
\ No newline at end of file
@@ -12,6 +12,8 @@ from workflowsim.Job import Job
 from workflowsim.Task import Task
 from workflowsim.ReclusteringEngine import ReclusteringEngine
 from workflowsim.WorkflowSimTags import WorkflowSimTags
+from workflowsim.transfer import NetworkParameters
+from workflowsim.trace import TraceParameters, JobTraceWriter
 
 
 class WorkflowEngine(SimEntity):
@@ -24,6 +26,8 @@ class WorkflowEngine(SimEntity):
         self.vmList: List[Vm.Vm] = []
         self.schedulerId: List[int] = []
         self.scheduler: List[WorkflowScheduler] = []
+        # Opened with the first returned job when TraceParameters is set
+        self.traceWriter: JobTraceWriter = None
 
         for i in range(schedulers):
             wfs: WorkflowScheduler = WorkflowScheduler(f"{name}_Scheduler_{i}")
@@ -91,6 +95,10 @@ class WorkflowEngine(SimEntity):
             newId: int = len(self.jobsList) + len(self.jobsSubmittedList)
             self.jobsList.extend(ReclusteringEngine.process(job, newId))
         self.jobsReceivedList.append(job)
+        if TraceParameters.is_enabled():
+            if self.traceWriter is None:
+                self.traceWriter = JobTraceWriter.open(TraceParameters.get_path(), TraceParameters.get_batch_size())
+            self.traceWriter.write(job)
         self.jobsSubmitted -= 1
         if len(self.jobsList)==0 and self.jobsSubmitted==0:
             for i in range(len(self.get_scheduler_ids())):
@@ -101,9 +109,9 @@ class WorkflowEngine(SimEntity):
 
     def process_other_event(self, ev: SimEvent):
         if ev is None:
-            Log.print_line(f"{self.name}.process_other_event(): Error - an event is null")
+            Log.error("%s.process_other_event(): Error - an event is null", self.name)
             return
-        Log.print_line(f"{self.name}.process_other_event(): Error - event unknown by this DatacenterBroker.")
+        Log.error("%s.process_other_event(): Error - event unknown by this DatacenterBroker.", self.name)
 
 
     def has_job_list_contains_id(self, jobList: List[Job], cloudlet_id: int):
@@ -147,6 +155,8 @@ class WorkflowEngine(SimEntity):
             if op.get_wed_delay() is not None:
                 delay = op.get_wed_delay(submittedList)
             delay_base: float = delay
+            # send_now adds the network delay itself, schedule does not
+            latency: float = NetworkParameters.get_message_delay(self.get_id(), self.schedulerId[i])
             size: int = len(submittedList)
             if interval > 0 and interval <= size:
                 index: int = 0
@@ -155,21 +165,23 @@ class WorkflowEngine(SimEntity):
                     sub_list.append(submittedList[index])
                     index += 1
                     if index % interval == 0:
-                        self.schedule(self.schedulerId[i], delay, CloudSimTags.CLOUDLET_SUBMIT, sub_list)
+                        self.schedule(self.schedulerId[i], delay + latency, CloudSimTags.CLOUDLET_SUBMIT, sub_list)
                         delay += delay_base
                         sub_list = []
                 if len(sub_list)!=0:
-                    self.schedule(self.schedulerId[i], delay, CloudSimTags.CLOUDLET_SUBMIT, sub_list)
+                    self.schedule(self.schedulerId[i], delay + latency, CloudSimTags.CLOUDLET_SUBMIT, sub_list)
             elif len(submittedList)!=0:
                 self.send_now(self.schedulerId[i], CloudSimTags.CLOUDLET_SUBMIT, submittedList)
 
 
     def shutdown_entity(self):
-        Log.print_line(f"{self.name} is shutting down...")
+        if self.traceWriter is not None:
+            self.traceWriter.close()
+        Log.info("%s is shutting down...", self.name)
 
 
     def start_entity(self):
-        Log.print_line(f"{self.name} is starting...")
+        Log.info("%s is starting...", self.name)
         self.schedule(self.id, 0, CloudSimTags.RESOURCE_CHARACTERISTICS_REQUEST)
 
 
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from xml.etree import ElementTree as ET
-from typing import List, Final, Dict
+from collections import OrderedDict
+from typing import List, Final, Dict, Tuple
+import os
 import threading
 from cloudsim.Log import Log
 from workflowsim.utils.Parameters import *
@@ -18,6 +20,13 @@ with warnings.catch_warnings():
 
 
 class WorkflowParser:
+    # Parsed DAX documents kept by preload(), shared by every simulation of the process.
+    # The tasks are still built for each run since the simulation changes them. Keyed
+    # like ResultCache.fileHashes, so a file changed on disk is parsed again, and the
+    # least recently used documents are dropped past MAX_DOCUMENTS.
+    MAX_DOCUMENTS: int = 64
+    documents: OrderedDict[Tuple[str, int, int], ET.Element] = OrderedDict()
+
     def __init__(self, userId):
         ## User id. used to create a new task.
         self.userId: Final[int] = userId
@@ -52,6 +61,37 @@ class WorkflowParser:
                 self.parseXmlFile(path)
 
 
+    @staticmethod
+    def get_document_key(path: str) -> Tuple[str, int, int]:
+        stat: os.stat_result = os.stat(path)
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+    @staticmethod
+    def preload(path: str) -> ET.Element:
+        key: Tuple[str, int, int] = WorkflowParser.get_document_key(path)
+        root: ET.Element = WorkflowParser.documents.get(key)
+        if root is not None:
+            WorkflowParser.documents.move_to_end(key)
+            return root
+        root = ET.parse(path).getroot()
+        # An older version of the same file is not needed anymore
+        for stale in [other for other in WorkflowParser.documents if other[0] == key[0]]:
+            del WorkflowParser.documents[stale]
+        WorkflowParser.documents[key] = root
+        while len(WorkflowParser.documents) > WorkflowParser.MAX_DOCUMENTS:
+            WorkflowParser.documents.popitem(last=False)
+        return root
+
+
+    @staticmethod
+    def get_root(path: str) -> ET.Element:
+        root: ET.Element = WorkflowParser.documents.get(WorkflowParser.get_document_key(path))
+        if root is None:
+            root = ET.parse(path).getroot()
+        return root
+
+
     def set_depth(self, task: Task, depth: int) -> None :
         if (depth > task.get_depth()):
             task.set_depth(depth)
@@ -60,9 +100,8 @@ class WorkflowParser:
 
 
     def parseXmlFile(self, path: str) -> None :
-        # Parse the XML file using ElementTree
-        tree = ET.parse(path)
-        root = tree.getroot()
+        # Parse the XML file using ElementTree, unless it was preloaded
+        root = WorkflowParser.get_root(path)
         mName2Task: Dict[str, Task] = {}
         # iterate over children of root
         for childnode in root:
@@ -79,7 +118,7 @@ class WorkflowParser:
                         runtime = 100
                     length = int(runtime)
                 else:
-                    Log.print_line(f"Cannot find runtime for {node_id}, set it to be 0")
+                    Log.warning("Cannot find runtime for %s, set it to be 0", node_id)
                 # Apply runtime scaling, by default it is 1.0
                 length *= Parameters.getRuntimeScale()
                 mFileList: List[FileItem] = []
@@ -96,7 +135,7 @@ class WorkflowParser:
                         if (filesize is not None):
                             size = float(filesize)
                         else :
-                            Log.print_line(f"File size not found for {filename}")
+                            Log.warning("File size not found for %s", filename)
                         if (size == 0) :
                             size = 1  # Avoid CloudSim issue with size 0
                         if (size < 0) :
@@ -95,9 +95,9 @@ class WorkflowPlanner(SimEntity):
 
     def process_other_event(self, ev: SimEvent) -> None:
         if (ev is None):
-            Log.print_line(f"{self.get_name()}.process_other_event(): Error - an event is null.")
+            Log.error("%s.process_other_event(): Error - an event is null.", self.get_name())
             return
-        Log.print_line(f"{self.get_name()}.process_other_event(): Error - event unknown by this DatacenterBroker.")
+        Log.error("%s.process_other_event(): Error - event unknown by this DatacenterBroker.", self.get_name())
 
 
     def finish_execution(self) -> None:
@@ -105,12 +105,12 @@ class WorkflowPlanner(SimEntity):
 
 
     def shutdown_entity(self) -> None:
-        Log.print_line(self.get_name() + " is shutting down...")
+        Log.info("%s is shutting down...", self.get_name())
 
 
     def start_entity(self) -> None:
-        Log.print_line(f"Starting WorkflowSim {Parameters.getVersion()}")
-        Log.print_line(self.get_name() + " is starting...")
+        Log.info("Starting WorkflowSim %s", Parameters.getVersion())
+        Log.info("%s is starting...", self.get_name())
         self.schedule(self.get_id(), 0, WorkflowSimTags.START_SIMULATION)
 
 
@@ -1,19 +1,23 @@
 from __future__ import annotations
 
-from typing import List, cast
+from typing import List, Dict, cast
 
 from cloudsim.Cloudlet import Cloudlet
+from cloudsim.DataCenter import Datacenter, DatacenterCharacteristics
 from cloudsim.DatacenterBroker import DatacenterBroker
 from cloudsim.core import CloudSim, CloudSimTags, SimEvent
 from cloudsim.Log import Log
 import cloudsim.lists as lists
 from workflowsim.failure import FailureGenerator
-from workflowsim.scheduling import BaseSchedulingAlgorithm, StaticSchedulingAlgorithm
+from workflowsim.scheduling import BaseSchedulingAlgorithm, StaticSchedulingAlgorithm, DataAwareSchedulingAlgorithm
 from workflowsim.utils.Parameters import Parameters, SchedulingAlgorithm
 from workflowsim.utils.OverheadParameters import OverheadParameters
 from workflowsim.WorkflowSimTags import WorkflowSimTags
 from workflowsim.Job import Job
 from workflowsim.CustomVM import CustomVM
+from workflowsim.speculation import SpeculationModel
+from workflowsim.transfer import NetworkParameters
+from workflowsim.federation import FederationParameters, FederationModel, PlacementPolicy
 
 
 class WorkflowScheduler(DatacenterBroker):
@@ -21,11 +25,17 @@ class WorkflowScheduler(DatacenterBroker):
         super().__init__(name)
         self.workflowEngineId: int = 0
         self.processCloudletSubmitHasShown: bool = False
+        # cloudlet id -> copies of a speculatively executed job that are still running
+        self.speculativeCopies: Dict[int, List[Job]] = {}
+        # cloudlet id -> losing copy whose cancellation has not been confirmed yet
+        self.cancelledCopies: Dict[int, Job] = {}
+        # vm id -> datacenters still to try if the placement policy's choice refuses the VM
+        self.placementCandidates: Dict[int, List[int]] = {}
 
 
     def bind_scheduler_datacenter(self, datacenterId: int) -> None:
         if datacenterId <= 0:
-            Log.print_line("Error in data center id")
+            Log.error("Error in data center id")
             return
         self.datacenterIdsList.append(datacenterId)
 
@@ -52,6 +62,8 @@ class WorkflowScheduler(DatacenterBroker):
             self.process_cloudlet_submit(ev)
         elif tag == WorkflowSimTags.CLOUDLET_UPDATE:
             self.process_cloudlet_update(ev)
+        elif tag == CloudSimTags.CLOUDLET_CANCEL:
+            self.process_cloudlet_cancel(ev)
         else:
             self.process_other_event(ev)
 
@@ -59,11 +71,54 @@ class WorkflowScheduler(DatacenterBroker):
     def get_scheduler(self, name: SchedulingAlgorithm) -> BaseSchedulingAlgorithm:
         if name == SchedulingAlgorithm.STATIC:
             algorithm: BaseSchedulingAlgorithm = StaticSchedulingAlgorithm()
+        elif name == SchedulingAlgorithm.DATA:
+            algorithm: BaseSchedulingAlgorithm = DataAwareSchedulingAlgorithm()
         else:
             algorithm: BaseSchedulingAlgorithm = StaticSchedulingAlgorithm()
         return algorithm
 
 
+    def process_resource_characteristics(self, ev: SimEvent) -> None:
+        if FederationParameters.get_policy() == PlacementPolicy.FIRST_FIT:
+            super().process_resource_characteristics(ev)
+            return
+        characteristics: DatacenterCharacteristics = cast(DatacenterCharacteristics, ev.get_data())
+        self.get_datacenter_characteristics_list()[characteristics.get_id()] = characteristics
+        if len(self.get_datacenter_characteristics_list()) == len(self.get_datacenter_ids_list()):
+            self.create_vms_by_placement()
+
+
+    def create_vms_by_placement(self) -> None:
+        datacenters: List[Datacenter] = [cast(Datacenter, CloudSim.get_entity(datacenterId)) for datacenterId in self.get_datacenter_ids_list()]
+        placement: Dict[int, List[int]] = FederationModel.place(self.get_vm_list(), datacenters)
+        requestedVms: int = 0
+        for vm in self.get_vm_list():
+            if vm.get_id() in self.get_vms_to_datacenters_map():
+                continue
+            candidates: List[int] = placement[vm.get_id()]
+            Log.debug("%s: %s Trying to Create VM #%s in %s", CloudSim.clock(), self.get_name(), vm.get_id(),
+                      CloudSim.get_entity_name(candidates[0]))
+            self.send_now(candidates[0], CloudSimTags.VM_CREATE_ACK, vm)
+            self.placementCandidates[vm.get_id()] = candidates[1:]
+            requestedVms += 1
+        # Every datacenter is part of some VM's ranking, the spill over in process_vm_create is not needed
+        self.set_datacenter_requested_ids_list(list(self.get_datacenter_ids_list()))
+        self.set_vms_requested(requestedVms)
+        self.set_vms_acks(0)
+
+
+    def retry_vm_placement(self, vmId: int) -> bool:
+        candidates: List[int] = self.placementCandidates.get(vmId)
+        if not candidates:
+            return False
+        datacenterId: int = candidates.pop(0)
+        Log.debug("%s: %s Trying to Create VM #%s in %s", CloudSim.clock(), self.get_name(), vmId,
+                  CloudSim.get_entity_name(datacenterId))
+        self.send_now(datacenterId, CloudSimTags.VM_CREATE_ACK, lists.VmList.get_by_id(self.get_vm_list(), vmId))
+        self.set_vms_requested(self.get_vms_requested() + 1)
+        return True
+
+
     def process_vm_create(self, ev: SimEvent) -> None:
         data: List[int] = cast(List[int], ev.get_data())
         datacenter_id, vm_id, result = data[0], data[1], data[2]
@@ -71,9 +126,14 @@ class WorkflowScheduler(DatacenterBroker):
             self.get_vms_to_datacenters_map()[vm_id] = datacenter_id
             if lists.VmList.get_by_id(self.get_vm_list(), vm_id) is not None:
                 self.get_vms_created_list().append(lists.VmList.get_by_id(self.get_vm_list(), vm_id))
-                Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: VM #{vm_id} has been created in Datacenter #{datacenter_id}, Host #{lists.VmList.get_by_id(self.vmsCreatedList, vm_id).get_host().get_id()}")
+                if Log.is_enabled_for(Log.DEBUG):
+                    Log.debug("%s: %s: VM #%s has been created in Datacenter #%s, Host #%s", CloudSim.clock(), self.get_name(),
+                              vm_id, datacenter_id, lists.VmList.get_by_id(self.vmsCreatedList, vm_id).get_host().get_id())
         else:
-            Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: Creation of VM #{vm_id} failed in Datacenter #{datacenter_id}")
+            Log.warning("%s: %s: Creation of VM #%s failed in Datacenter #%s", CloudSim.clock(), self.get_name(), vm_id, datacenter_id)
+            if self.retry_vm_placement(vm_id):
+                self.increment_vms_acks()
+                return
         self.increment_vms_acks()
         if len(self.get_vms_created_list()) == len(self.get_vm_list()) - self.get_vms_destroyed():
             self.submit_cloudlets()
@@ -86,7 +146,7 @@ class WorkflowScheduler(DatacenterBroker):
                 if len(self.get_vms_created_list()) > 0:
                     self.submit_cloudlets()
                 else:
-                    Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: None of the required VMs could be created. Aborting")
+                    Log.error("%s: %s: None of the required VMs could be created. Aborting", CloudSim.clock(), self.get_name())
                     self.finish_execution()
 
 
@@ -100,36 +160,101 @@ class WorkflowScheduler(DatacenterBroker):
         scheduledList: List[Cloudlet] = scheduler.get_scheduled_list()
         for cloudlet in scheduledList:
             vm_id: int = cloudlet.get_vm_id()
-            delay: float = 0.0
+            datacenterId: int = self.get_vms_to_datacenters_map()[vm_id]
+            delay: float = NetworkParameters.get_message_delay(self.get_id(), datacenterId)
             op: OverheadParameters = Parameters.getOverheadParams()
             if op.get_queue_delay() is not None:
-                delay = op.get_queue_delay(cloudlet)
-            self.schedule(self.get_vms_to_datacenters_map()[vm_id], delay, CloudSimTags.CLOUDLET_SUBMIT, cloudlet)
+                delay += op.get_queue_delay(cloudlet)
+            self.schedule(datacenterId, delay, CloudSimTags.CLOUDLET_SUBMIT, cloudlet)
         self.set_cloudlet_list([cloudlet for cloudlet in self.get_cloudlet_list() if cloudlet not in scheduledList])
         self.get_cloudlet_submitted_list().extend(scheduledList)
         self.cloudletsSubmitted += len(scheduledList)
+        self.submit_backup_copies(scheduledList)
+
+
+    def submit_backup_copies(self, scheduledList: List[Cloudlet]) -> None:
+        # Idle VMs that no queued job is waiting for can host a backup copy
+        reserved = {cloudlet.get_vm_id() for cloudlet in self.get_cloudlet_list()}
+        idleVms: List[CustomVM] = [vm for vm in self.get_vms_created_list()
+                                   if vm.get_state() == WorkflowSimTags.VM_STATUS_IDLE and vm.get_id() not in reserved]
+        for cloudlet in scheduledList:
+            if not idleVms:
+                break
+            job: Job = cast(Job, cloudlet)
+            vm: CustomVM = cast(CustomVM, lists.VmList.get_by_id(self.get_vms_created_list(), job.get_vm_id()))
+            if not SpeculationModel.need_backup(job, vm):
+                continue
+            # A free slot next to the original copy is no backup
+            backupVm: CustomVM = SpeculationModel.select_backup_vm(job, [vm for vm in idleVms if vm.get_id() != job.get_vm_id()])
+            if backupVm is None:
+                continue
+            backupVm.acquire_slot()
+            if backupVm.get_state() == WorkflowSimTags.VM_STATUS_BUSY:
+                idleVms.remove(backupVm)
+            backup: Job = SpeculationModel.create_backup(job, backupVm.get_id())
+            self.speculativeCopies[job.get_cloudlet_id()] = [job, backup]
+            Log.debug("%s: %s: Speculatively runs job #%s on VM #%s", CloudSim.clock(), self.get_name(), job.get_cloudlet_id(),
+                      backupVm.get_id())
+            datacenterId: int = self.get_vms_to_datacenters_map()[backupVm.get_id()]
+            delay: float = NetworkParameters.get_message_delay(self.get_id(), datacenterId)
+            op: OverheadParameters = Parameters.getOverheadParams()
+            if op.get_queue_delay() is not None:
+                delay += op.get_queue_delay(backup)
+            self.schedule(datacenterId, delay, CloudSimTags.CLOUDLET_SUBMIT, backup)
+            self.get_cloudlet_submitted_list().append(backup)
+            self.cloudletsSubmitted += 1
 
 
     def process_cloudlet_return(self, ev: SimEvent) -> None:
         cloudlet: Cloudlet = cast(Cloudlet, ev.get_data())
         job: Job = cast(Job, cloudlet)
+        if self.cancelledCopies.get(job.get_cloudlet_id()) is job:
+            # The losing copy finished before it could be cancelled
+            del self.cancelledCopies[job.get_cloudlet_id()]
+            self.release_cloudlet(job)
+            return
         # Generate a failure if the failure rate is not zero
         FailureGenerator.generate(job)
+        copies: List[Job] = self.speculativeCopies.get(job.get_cloudlet_id())
+        if copies is not None:
+            copies.remove(job)
+            if job.get_cloudlet_status() == Cloudlet.FAILED and copies:
+                # The other copy may still succeed, only its result is reported
+                self.release_cloudlet(job)
+                return
+            for other in copies:
+                self.cancelledCopies[other.get_cloudlet_id()] = other
+                self.send_now(self.get_vms_to_datacenters_map()[other.get_vm_id()], CloudSimTags.CLOUDLET_CANCEL,
+                              [other.get_cloudlet_id(), other.get_user_id(), other.get_vm_id()])
+            del self.speculativeCopies[job.get_cloudlet_id()]
         self.get_cloudlet_received_list().append(cloudlet)
-        self.get_cloudlet_submitted_list().remove(cloudlet)
-        vm: CustomVM = cast(CustomVM, self.get_vms_created_list()[cloudlet.get_vm_id()])
-        vm.set_state(WorkflowSimTags.VM_STATUS_IDLE)
-        delay: float = 0.0
+        delay: float = NetworkParameters.get_message_delay(self.get_id(), self.workflowEngineId)
         op: OverheadParameters = Parameters.getOverheadParams()
         if op.get_post_delay() is not None:
-            delay = op.get_post_delay(job)
+            delay += op.get_post_delay(job)
         self.schedule(self.workflowEngineId, delay, CloudSimTags.CLOUDLET_RETURN, cloudlet)
+        self.release_cloudlet(job)
+
+
+    def process_cloudlet_cancel(self, ev: SimEvent) -> None:
+        cloudlet: Cloudlet = cast(Cloudlet, ev.get_data())
+        # None means the copy had already finished, its CLOUDLET_RETURN releases the VM
+        if cloudlet is None or self.cancelledCopies.get(cloudlet.get_cloudlet_id()) is not cloudlet:
+            return
+        del self.cancelledCopies[cloudlet.get_cloudlet_id()]
+        self.release_cloudlet(cast(Job, cloudlet))
+
+
+    def release_cloudlet(self, job: Job) -> None:
+        self.get_cloudlet_submitted_list().remove(job)
+        vm: CustomVM = cast(CustomVM, lists.VmList.get_by_id(self.get_vms_created_list(), job.get_vm_id()))
+        vm.release_slot()
         self.cloudletsSubmitted -= 1
         self.schedule(self.get_id(), 0.0, WorkflowSimTags.CLOUDLET_UPDATE)
 
 
     def start_entity(self) -> None:
-        Log.print_line(f"{self.get_name()} is starting...")
+        Log.info("%s is starting...", self.get_name())
         gis_id: int = CloudSim.get_cloud_info_service_entity_id()
         # Send the registration to GIS
         self.send_now(gis_id, CloudSimTags.REGISTER_RESOURCE, self.get_id())
@@ -137,7 +262,7 @@ class WorkflowScheduler(DatacenterBroker):
 
     def shutdown_entity(self) -> None:
         self.clear_datacenters()
-        Log.print_line(f"{self.get_name()} is shutting down...")
+        Log.info("%s is shutting down...", self.get_name())
 
 
     def submit_cloudlets(self) -> None:
@@ -153,7 +278,11 @@ class WorkflowScheduler(DatacenterBroker):
 
 
     def process_resource_characteristics_request(self, ev: SimEvent) -> None:
+        if not self.get_datacenter_ids_list():
+            # Nothing bound explicitly, the scheduler federates over every datacenter
+            self.set_datacenter_ids_list([datacenter.get_id() for datacenter in FederationModel.get_datacenters()])
         self.set_datacenter_characteristics_list(dict())
-        Log.print_line(f"{CloudSim.clock()}: {self.get_name()}: Cloud Resource List received with {len(self.get_datacenter_ids_list())} resource(s).")
+        Log.info("%s: %s: Cloud Resource List received with %s resource(s).", CloudSim.clock(), self.get_name(),
+                 len(self.get_datacenter_ids_list()))
         for datacenterId in self.get_datacenter_ids_list():
             self.send_now(datacenterId, CloudSimTags.RESOURCE_CHARACTERISTICS, self.get_id())
\ No newline at end of file
@@ -1,3 +1,6 @@
+from cloudsim.profiler import EventProfiler
+
+
 class WorkflowSimTags:
     # Starting constant value for cloud-related tags
     BASE = 1000
@@ -11,6 +14,10 @@ class WorkflowSimTags:
     JOB_SUBMIT = BASE + 1
     CLOUDLET_UPDATE = BASE + 5
     CLOUDLET_CHECK = BASE + 6
+    STAGE_IN_UPDATE = BASE + 7
 
     def __init__(self):
         raise NotImplementedError("WorkflowSim Tags cannot be instantiated")
+
+
+EventProfiler.register_tags(WorkflowSimTags)
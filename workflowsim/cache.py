@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Tuple
+
+
+class ResultCache:
+    # Results of finished simulations on disk, one JSON file per configuration
+    # fingerprint. Reading an entry refreshes its modification time and the least
+    # recently used entries are removed once the directory grows past maxBytes.
+    # Several processes may share a directory: entries are renamed into place, and an
+    # entry removed by another process is simply a miss.
+
+    # Bumped whenever a change to the simulator changes its results
+    VERSION: int = 1
+    MAX_BYTES: int = 256 * 1024 * 1024
+    # (path, mtime, size) -> sha256 of the file, so a DAX is only hashed once per process
+    fileHashes: Dict[Tuple[str, int, int], str] = {}
+
+    def __init__(self, path: str, maxBytes: int = MAX_BYTES):
+        self.path: str = path
+        self.maxBytes: int = maxBytes
+        os.makedirs(path, exist_ok=True)
+
+
+    @staticmethod
+    def get_file_hash(path: str) -> str:
+        stat: os.stat_result = os.stat(path)
+        key: Tuple[str, int, int] = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        digest: str = ResultCache.fileHashes.get(key)
+        if digest is None:
+            sha: hashlib._Hash = hashlib.sha256()
+            with open(path, "rb") as file:
+                for chunk in iter(lambda: file.read(1 << 20), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            ResultCache.fileHashes[key] = digest
+        return digest
+
+
+    @staticmethod
+    def get_fingerprint(document: Dict[str, Any]) -> str:
+        document = dict(document, cacheVersion=ResultCache.VERSION)
+        return hashlib.sha256(json.dumps(document, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+    def get_entry(self, fingerprint: str) -> str:
+        return os.path.join(self.path, fingerprint + ".json")
+
+
+    def get(self, fingerprint: str) -> Dict[str, Any]:
+        entry: str = self.get_entry(fingerprint)
+        try:
+            with open(entry) as file:
+                result: Dict[str, Any] = json.load(file)
+            os.utime(entry)
+        except (FileNotFoundError, ValueError):
+            return None
+        return result
+
+
+    def put(self, fingerprint: str, result: Dict[str, Any]) -> None:
+        entry: str = self.get_entry(fingerprint)
+        tmp: str = f"{entry}.{os.getpid()}.tmp"
+        with open(tmp, "w") as file:
+            json.dump(result, file)
+        os.replace(tmp, entry)
+        self.evict()
+
+
+    def get_entries(self) -> List[Tuple[float, int, str]]:
+        # (last use, size, path) of every entry, least recently used first
+        entries: List[Tuple[float, int, str]] = []
+        for name in os.listdir(self.path):
+            if not name.endswith(".json"):
+                continue
+            entry: str = os.path.join(self.path, name)
+            try:
+                stat: os.stat_result = os.stat(entry)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort()
+        return entries
+
+
+    def get_size(self) -> int:
+        return sum(size for _, size, _ in self.get_entries())
+
+
+    def evict(self) -> None:
+        entries: List[Tuple[float, int, str]] = self.get_entries()
+        size: int = sum(size for _, size, _ in entries)
+        for _, entrySize, entry in entries:
+            if size <= self.maxBytes:
+                break
+            try:
+                os.remove(entry)
+            except FileNotFoundError:
+                pass
+            size -= entrySize
+
+
+    def clear(self) -> None:
+        for _, _, entry in self.get_entries():
+            try:
+                os.remove(entry)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Tuple
+from cloudsim.context import SimulationContext
+from workflowsim.Task import Task
+from workflowsim.Job import Job
+
+
+class CheckpointParameters:
+    # Seconds of computation between two checkpoints of a task, 0 disables checkpointing
+    interval: float = 0.0
+    # Seconds spent writing one checkpoint
+    overhead: float = 0.0
+
+    @staticmethod
+    def init(interval: float, overhead: float = 0.0) -> None:
+        if interval < 0 or overhead < 0:
+            raise ValueError("Checkpoint interval and overhead can't be negative")
+        CheckpointParameters.interval = interval
+        CheckpointParameters.overhead = overhead
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return CheckpointParameters.interval > 0
+
+    @staticmethod
+    def get_interval() -> float:
+        return CheckpointParameters.interval
+
+    @staticmethod
+    def get_overhead() -> float:
+        return CheckpointParameters.overhead
+
+
+class CheckpointModel:
+    # A task computes for `interval` seconds, writes a checkpoint for `overhead`
+    # seconds, and repeats. No checkpoint is written once the task is done. On a
+    # retry only the work after the last completed checkpoint is executed again.
+
+    @staticmethod
+    def get_checkpoint_count(computeTime: float) -> int:
+        if not CheckpointParameters.is_enabled() or computeTime <= 0:
+            return 0
+        return max(0, math.ceil(computeTime / CheckpointParameters.get_interval()) - 1)
+
+
+    @staticmethod
+    def get_checkpoint_time(computeTime: float) -> float:
+        return CheckpointModel.get_checkpoint_count(computeTime) * CheckpointParameters.get_overhead()
+
+
+    @staticmethod
+    def get_remaining_length(task: Task) -> int:
+        return max(0, task.get_cloudlet_length() - task.get_checkpointed_length())
+
+
+    @staticmethod
+    def get_job_checkpoint_time(job: Job, mips: float) -> float:
+        time: float = 0.0
+        for task in job.get_task_list():
+            time += CheckpointModel.get_checkpoint_time(CheckpointModel.get_remaining_length(task) / mips)
+        return time
+
+
+    @staticmethod
+    def process_failed_job(job: Job, failureTimes: Dict[Task, float]) -> None:
+        wasted: float = 0.0
+        recovered: float = 0.0
+        for task in job.get_task_list():
+            start: float = task.get_exec_start_time()
+            end: float = task.get_taskFinishTime()
+            if task in failureTimes:
+                lost, saved = CheckpointModel.rollback(task, start, end, failureTimes[task])
+                wasted += lost
+                recovered += saved
+            elif CheckpointParameters.is_enabled():
+                # A finished task ends on a consistent state, keep its output for the retry
+                recovered += end - start
+                task.set_checkpointed_length(task.get_cloudlet_length())
+            else:
+                wasted += end - start
+        job.set_wasted_time(job.get_wasted_time() + wasted)
+        job.set_recovered_time(job.get_recovered_time() + recovered)
+
+
+    @staticmethod
+    def rollback(task: Task, start: float, end: float, failureTime: float) -> Tuple[float, float]:
+        elapsed: float = max(0.0, min(failureTime, end) - start)
+        if not CheckpointParameters.is_enabled():
+            return elapsed, 0.0
+        segment: float = CheckpointParameters.get_interval() + CheckpointParameters.get_overhead()
+        # Checkpoints this attempt would have written, and how many were written before the failure
+        total: int = int((end - start) // segment)
+        done: int = min(int(elapsed // segment), total)
+        computeTime: float = (end - start) - total * CheckpointParameters.get_overhead()
+        savedTime: float = done * CheckpointParameters.get_interval()
+        if computeTime > 0 and done > 0:
+            saved: int = int(CheckpointModel.get_remaining_length(task) * savedTime / computeTime)
+            task.set_checkpointed_length(task.get_checkpointed_length() + saved)
+        return elapsed - done * segment, savedTime
+
+
+SimulationContext.register(CheckpointParameters, ('interval', 'overhead'))
@@ -78,9 +78,9 @@ class BasicClustering():
                                 self.allFileList.append(file)
                         elif file.get_type().value == FileType.OUTPUT:
                             self.allFileList.append(file)
-                for fileName in task.get_required_files():
-                    if fileName not in job.get_required_files():
-                        job.get_required_files().append(fileName)
+                if task.requires_files():
+                    for fileName in task.get_required_files():
+                        job.add_required_file(fileName)
             job.set_cloudlet_length(length)
             job.set_user_id(userId)
             job.set_depth(depth)
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import cloudsim.Vm as Vm
+from cloudsim.context import SimulationContext
+from cloudsim.core import CloudSim
+from cloudsim.DataCenter import DatacenterCharacteristics
+from cloudsim.HarddriveStorage import HarddriveStorage
+from cloudsim.Log import Log
+from cloudsim.Pe import Pe
+from cloudsim.Storage import Storage
+from cloudsim.VmAllocationPolicy import VmAllocationPolicySimple
+from cloudsim.VmScheduler import VmSchedulerTimeShared
+from cloudsim.provisioners import RamProvisionerSimple, BwProvisionerSimple, PeProvisionerSimple
+from workflowsim.CustomVM import CustomVM
+from workflowsim.CustomVMGenerator import CustomVMGenerator
+from workflowsim.Job import Job
+from workflowsim.WorkflowDatacenter import WorkflowDatacenter
+from workflowsim.WorkflowEngine import WorkflowEngine
+from workflowsim.WorkflowPlanner import WorkflowPlanner
+from workflowsim.cache import ResultCache
+from workflowsim.failure import FailureParameters, FailureMonitor
+from workflowsim.utils.ClusteringParameters import ClusteringParameters
+from workflowsim.utils.DistributionGenerator import DistributionGenerator
+from workflowsim.utils.OverheadParameters import OverheadParameters
+from workflowsim.utils.Parameters import Parameters, SchedulingAlgorithm, PlanningAlgorithm
+from workflowsim.utils.ReplicaCatalog import ReplicaCatalog
+from workflowsim.utils.metrices import Metrics
+
+
+class Experiment:
+    # One simulation described by a plain dict, so that it can be read from JSON and
+    # shipped to a worker process:
+    #   dax         path of the DAX file
+    #   vms         number of VMs
+    #   planner     PlanningAlgorithm, HEFT by default
+    #   scheduler   SchedulingAlgorithm, STATIC by default so the plan is kept
+    #   clustering  None or {"method": "HORIZONTAL", "num": 20, "size": 0}
+    #   failure     None or {"mode": "FAILURE_VM", "monitor": "MONITOR_ALL", "distribution": "WEIBULL",
+    #                        "scale": 100.0, "shape": 1.0, "depths": 20}
+    #   seed        master seed, see Parameters.getStreamSeed
+    DEFAULTS: Dict[str, Any] = {
+        "vms": 5,
+        "planner": PlanningAlgorithm.HEFT,
+        "scheduler": SchedulingAlgorithm.STATIC,
+        "clustering": None,
+        "failure": None,
+        "seed": 0,
+    }
+    # Generators built per VM for the failure modes not tied to a job depth
+    DEPTHS: int = 20
+
+    @staticmethod
+    def normalize(config: Dict[str, Any]) -> Dict[str, Any]:
+        if not config.get("dax"):
+            raise ValueError("An experiment needs a dax")
+        unknown: List[str] = [key for key in config if key != "dax" and key not in Experiment.DEFAULTS]
+        if unknown:
+            raise ValueError(f"Unknown experiment settings: {', '.join(sorted(unknown))}")
+        normalized: Dict[str, Any] = dict(Experiment.DEFAULTS)
+        normalized.update(config)
+        if normalized["planner"] not in vars(PlanningAlgorithm).values():
+            raise ValueError(f"Unknown planner: {normalized['planner']}")
+        if normalized["scheduler"] not in vars(SchedulingAlgorithm).values():
+            raise ValueError(f"Unknown scheduler: {normalized['scheduler']}")
+        if isinstance(normalized["clustering"], str):
+            normalized["clustering"] = {"method": normalized["clustering"]}
+        return normalized
+
+
+    @staticmethod
+    def create_datacenter(name: str, hosts: int = 20) -> WorkflowDatacenter:
+        # Same hosts as the HEFT example: two 20000 MIPS PEs, 2 GB of RAM each
+        hostList: List[Vm.Host] = []
+        for i in range(hosts):
+            peList: List[Pe] = [Pe(0, PeProvisionerSimple(20000)), Pe(1, PeProvisionerSimple(20000))]
+            hostList.append(Vm.Host(i, RamProvisionerSimple(2048), BwProvisionerSimple(10000), 1000000,
+                                    peList, VmSchedulerTimeShared(peList)))
+        characteristics: DatacenterCharacteristics = DatacenterCharacteristics("x86", "Linux", "Xen", hostList,
+                                                                               10.0, 3.0, 0.05, 0.1, 0.1)
+        storage: HarddriveStorage = HarddriveStorage(name, 1e12)
+        storage.set_max_transfer_rate(15)
+        storageList: List[Storage] = [storage]
+        return WorkflowDatacenter(name, characteristics, VmAllocationPolicySimple(hostList), storageList, 0)
+
+
+    @staticmethod
+    def create_overheads() -> OverheadParameters:
+        # No overheads, as in the HEFT example
+        return OverheadParameters(0, None, None, None, None, 0)
+
+
+    @staticmethod
+    def create_clustering(clustering: Dict[str, Any]) -> ClusteringParameters:
+        if not clustering:
+            return ClusteringParameters(0, 0, ClusteringParameters.ClusteringMethod.NONE, None)
+        return ClusteringParameters(clustering.get("num", 0), clustering.get("size", 0),
+                                    clustering.get("method", ClusteringParameters.ClusteringMethod.NONE), None)
+
+
+    @staticmethod
+    def init_failures(failure: Dict[str, Any], vms: int) -> None:
+        if not failure:
+            return
+        mode: FailureParameters.FTCFailure = FailureParameters.FTCFailure[failure.get("mode", "FAILURE_VM")]
+        monitor: FailureParameters.FTCMonitor = FailureParameters.FTCMonitor[failure.get("monitor", "MONITOR_ALL")]
+        distribution: str = failure.get("distribution", "WEIBULL")
+        rows: int = vms if mode in (FailureParameters.FTCFailure.FAILURE_VM, FailureParameters.FTCFailure.FAILURE_VM_JOB) else 1
+        depths: int = 1
+        if mode in (FailureParameters.FTCFailure.FAILURE_JOB, FailureParameters.FTCFailure.FAILURE_VM_JOB):
+            depths = failure.get("depths", Experiment.DEPTHS)
+        generators: List[List[DistributionGenerator]] = [
+            [DistributionGenerator(distribution, failure.get("scale", 100.0), failure.get("shape", 1.0))
+             for _ in range(depths)] for _ in range(rows)]
+        FailureParameters.init(FailureParameters.FTCluteringAlgorithm.FTCLUSTERING_NOOP, monitor, mode, generators,
+                               DistributionGenerator.DistributionFamily[distribution])
+        FailureMonitor.init()
+
+
+    @staticmethod
+    def describe_vms(vms: int) -> List[Dict[str, Any]]:
+        return [{"mips": vm.mips, "pes": vm.numberOfPes, "ram": vm.ram, "bw": vm.bw, "size": vm.size, "cost": vm.cost,
+                 "costPerMem": vm.costPerMem, "costPerStorage": vm.costPerStorage, "costPerBw": vm.costPerBw,
+                 "freq": [vm.minFreq, vm.maxFreq], "volt": [vm.minVolt, vm.maxVolt], "lambda": vm.lambdaValue}
+                for vm in CustomVMGenerator.create_custom_vms(0, vms)]
+
+
+    @staticmethod
+    def describe_overheads(op: OverheadParameters) -> Dict[str, Any]:
+        delays: Dict[str, Any] = {}
+        for name, generators in (("wed", op.get_wed_delay()), ("queue", op.get_queue_delay()),
+                                 ("post", op.get_post_delay()), ("cluster", op.get_clust_delay())):
+            delays[name] = {str(depth): [g.dist, g.scale, g.shape] for depth, g in (generators or {}).items()}
+        return {"interval": op.get_wed_interval(), "bandwidth": op.get_bandwidth(), "delays": delays}
+
+
+    @staticmethod
+    def get_fingerprint(config: Dict[str, Any]) -> str:
+        # Everything a run depends on: the DAX content rather than its path, the Parameters,
+        # the VMs CustomVMGenerator builds, the overheads, the clustering and the failures
+        config = Experiment.normalize(config)
+        cp: ClusteringParameters = Experiment.create_clustering(config["clustering"])
+        return ResultCache.get_fingerprint({
+            "version": Parameters.getVersion(),
+            "dax": ResultCache.get_file_hash(config["dax"]),
+            "parameters": {"vm": config["vms"], "scheduler": config["scheduler"], "planner": config["planner"],
+                           "seed": config["seed"]},
+            "vms": Experiment.describe_vms(config["vms"]),
+            "overheads": Experiment.describe_overheads(Experiment.create_overheads()),
+            "clustering": [cp.get_clusters_num(), cp.get_clusters_size(), str(cp.get_clustering_method())],
+            "failure": config["failure"],
+        })
+
+
+    @staticmethod
+    def run(config: Dict[str, Any], cache: ResultCache = None, trace: bool = False) -> Dict[str, Any]:
+        # With a cache, a configuration that ran before is answered from it. A run
+        # without a seed draws different numbers every time, so it is never cached.
+        # The job trace, a row per job received, is only returned when asked for.
+        config = Experiment.normalize(config)
+        if config["seed"] is None:
+            cache = None
+        fingerprint: str = None
+        if cache is not None:
+            fingerprint = Experiment.get_fingerprint(config)
+            result: Dict[str, Any] = cache.get(fingerprint)
+            if result is not None:
+                result["cached"] = True
+                if not trace:
+                    del result["trace"]
+                return result
+        result = Experiment.simulate(config)
+        if cache is not None:
+            cache.put(fingerprint, result)
+        result["cached"] = False
+        if not trace:
+            del result["trace"]
+        return result
+
+
+    @staticmethod
+    def simulate(config: Dict[str, Any]) -> Dict[str, Any]:
+        # Runs in a fresh SimulationContext, whatever was set up before is left untouched,
+        # the log included
+        with SimulationContext():
+            Log.disable()
+            op: OverheadParameters = Experiment.create_overheads()
+            Parameters.init(vm=config["vms"], dax=config["dax"], runtime=None, datasize=None, op=op,
+                            cp=Experiment.create_clustering(config["clustering"]), scheduler=config["scheduler"],
+                            planner=config["planner"], rMethod=None, dl=0, seed=config["seed"])
+            ReplicaCatalog.init(fs=ReplicaCatalog.FileSystem.LOCAL)
+            Experiment.init_failures(config["failure"], config["vms"])
+            CloudSim.init(num_user=1, cal=datetime.now(), traceFlag=False)
+
+            datacenter: WorkflowDatacenter = Experiment.create_datacenter("Datacenter_0")
+            planner: WorkflowPlanner = WorkflowPlanner("planner_0", 1)
+            engine: WorkflowEngine = planner.get_workflow_engine()
+            vmList: List[CustomVM] = CustomVMGenerator.create_custom_vms(engine.get_scheduler_id(0), config["vms"])
+            engine.submit_vm_list(vmList, 0)
+            engine.bind_scheduler_datacenter(datacenter.get_id(), 0)
+
+            start: float = time.perf_counter()
+            CloudSim.start_simulation()
+            jobs: List[Job] = engine.get_jobs_received_list()
+            CloudSim.stop_simulation()
+            wallTime: float = time.perf_counter() - start
+            return Experiment.summarize(jobs, vmList, wallTime)
+
+
+    @staticmethod
+    def summarize(jobs: List[Job], vms: List[CustomVM], wallTime: float) -> Dict[str, Any]:
+        return {
+            "jobs": len(jobs),
+            "makespan": Metrics.get_makespan(jobs),
+            "cost": Metrics.get_cost(vms, jobs),
+            "energy": Metrics.get_energy_consumed(jobs, vms),
+            "wastedWork": Metrics.get_wasted_work(jobs),
+            "wallTime": wallTime,
+            "digest": Metrics.get_trace_digest(jobs),
+            "trace": [list(row) for row in Metrics.get_trace(jobs)],
+        }
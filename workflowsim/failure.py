@@ -1,18 +1,23 @@
 from __future__ import annotations
 
-import numpy as np
-from scipy.stats import lognorm, weibull_min, gamma, norm
-from typing import List, Dict, Union, Final
+from typing import List, Dict, Deque, Tuple, Union, Final, TYPE_CHECKING
+from collections import deque
 from enum import Enum, auto
 from cloudsim.Cloudlet import Cloudlet
 from cloudsim.Log import Log
+from cloudsim.context import SimulationContext
 from workflowsim.utils.DistributionGenerator import DistributionGenerator
+from workflowsim.utils.Parameters import Parameters, RandomStream
 from workflowsim.Task import Task
 from workflowsim.Job import Job
+from workflowsim.checkpoint import CheckpointModel
+
+if TYPE_CHECKING:
+    from scipy.stats import lognorm, weibull_min, gamma, norm
 
 
 class FailureRecord:
-    def __init__(self, length: float, failedTasksNum: int, depth: int, allTaskNum: int, vmId: int, jobId: int, workflowId: int, delayLength: float):
+    def __init__(self, length: float, failedTasksNum: int, depth: int, allTaskNum: int, vmId: int, jobId: int, workflowId: int, delayLength: float = 0.0):
         self.length: float = length
         self.failedTasksNum: int = failedTasksNum
         self.depth: int= depth
@@ -28,19 +33,64 @@ class FailureRecord:
             workflowId={self.workflowId}, delayLength={self.delayLength}"
 
 
+class FailureStatistic:
+    # Running totals of failed and executed tasks for one monitoring key. When
+    # window > 0 the rate is computed over the last `window` records only.
+    def __init__(self, window: int = 0):
+        self.window: int = window
+        self.sumFailures: int = 0
+        self.sumJobs: int = 0
+        self.windowFailures: int = 0
+        self.windowJobs: int = 0
+        self.recent: Deque[Tuple[int, int]] = deque()
+
+    def add(self, failedTasksNum: int, allTaskNum: int) -> None:
+        self.sumFailures += failedTasksNum
+        self.sumJobs += allTaskNum
+        if self.window > 0:
+            self.recent.append((failedTasksNum, allTaskNum))
+            self.windowFailures += failedTasksNum
+            self.windowJobs += allTaskNum
+            if len(self.recent) > self.window:
+                oldFailures, oldJobs = self.recent.popleft()
+                self.windowFailures -= oldFailures
+                self.windowJobs -= oldJobs
+
+    def get_failures(self) -> int:
+        return self.windowFailures if self.window > 0 else self.sumFailures
+
+    def get_jobs(self) -> int:
+        return self.windowJobs if self.window > 0 else self.sumJobs
+
+    def get_rate(self) -> float:
+        failures: int = self.get_failures()
+        if failures == 0:
+            return 0
+        return float(failures) / float(self.get_jobs())
+
+
 class FailureMonitor:
-    vm2record: Dict[int, List[FailureRecord]]
-    type2record: Dict[int, List[FailureRecord]]
-    jobid2record: Dict[int, FailureRecord]
-    recordList: List[FailureRecord]
+    vm2record: Dict[int, List[FailureRecord]] = {}
+    type2record: Dict[int, List[FailureRecord]] = {}
+    jobid2record: Dict[int, FailureRecord] = {}
+    recordList: List[FailureRecord] = []
     index2job: Dict
+    # Aggregates kept up to date by post_failure_record so analyze is O(1)
+    window: int = 0
+    allStatistic: FailureStatistic = FailureStatistic()
+    vm2statistic: Dict[int, FailureStatistic] = {}
+    type2statistic: Dict[int, FailureStatistic] = {}
 
     @staticmethod
-    def init():
+    def init(window: int = 0):
         FailureMonitor.vm2record = {}
         FailureMonitor.type2record = {}
         FailureMonitor.jobid2record = {}
         FailureMonitor.recordList = []
+        FailureMonitor.window = window
+        FailureMonitor.allStatistic = FailureStatistic(window)
+        FailureMonitor.vm2statistic = {}
+        FailureMonitor.type2statistic = {}
 
     @staticmethod
     def get_K(d: float, a: float, t: float) -> float:
@@ -73,40 +123,38 @@ class FailureMonitor:
         if FailureParameters.get_monitor_mode() == FailureParameters.FTCMonitor.MONITOR_VM:
             if record.vmId not in FailureMonitor.vm2record:
                 FailureMonitor.vm2record[record.vmId] = []
+                FailureMonitor.vm2statistic[record.vmId] = FailureStatistic(FailureMonitor.window)
             FailureMonitor.vm2record[record.vmId].append(record)
+            FailureMonitor.vm2statistic[record.vmId].add(record.failedTasksNum, record.allTaskNum)
         elif FailureParameters.get_monitor_mode() == FailureParameters.FTCMonitor.MONITOR_JOB:
             if record.depth not in FailureMonitor.type2record:
                 FailureMonitor.type2record[record.depth] = []
+                FailureMonitor.type2statistic[record.depth] = FailureStatistic(FailureMonitor.window)
             FailureMonitor.type2record[record.depth].append(record)
+            FailureMonitor.type2statistic[record.depth].add(record.failedTasksNum, record.allTaskNum)
         elif FailureParameters.get_monitor_mode() == FailureParameters.FTCMonitor.MONITOR_NONE:
             pass
 
         FailureMonitor.recordList.append(record)
+        FailureMonitor.allStatistic.add(record.failedTasksNum, record.allTaskNum)
 
     @staticmethod
-    def analyze(type: int) -> float:
-        sumFailures = 0
-        sumJobs = 0
+    def get_statistic(type: int) -> FailureStatistic:
+        mode = FailureParameters.get_monitor_mode()
+        if mode == FailureParameters.FTCMonitor.MONITOR_ALL:
+            return FailureMonitor.allStatistic
+        elif mode == FailureParameters.FTCMonitor.MONITOR_JOB:
+            return FailureMonitor.type2statistic.get(type)
+        elif mode == FailureParameters.FTCMonitor.MONITOR_VM:
+            return FailureMonitor.vm2statistic.get(type)
+        return None
 
-        if FailureParameters.get_monitor_mode() == FailureParameters.FTCMonitor.MONITOR_ALL:
-            for record in FailureMonitor.recordList:
-                sumFailures += record.failedTasksNum
-                sumJobs += record.allTaskNum
-        elif FailureParameters.get_monitor_mode() == FailureParameters.FTCMonitor.MONITOR_JOB:
-            if type in FailureMonitor.type2record:
-                for record in FailureMonitor.type2record[type]:
-                    sumFailures += record.failedTasksNum
-                    sumJobs += record.allTaskNum
-        elif FailureParameters.get_monitor_mode() == FailureParameters.FTCMonitor.MONITOR_VM:
-            if type in FailureMonitor.vm2record:
-                for record in FailureMonitor.vm2record[type]:
-                    sumFailures += record.failedTasksNum
-                    sumJobs += record.allTaskNum
-
-        if sumFailures == 0:
+    @staticmethod
+    def analyze(type: int) -> float:
+        statistic: FailureStatistic = FailureMonitor.get_statistic(type)
+        if statistic is None:
             return 0
-        alpha = float(sumFailures) / float(sumJobs)
-        return alpha
+        return statistic.get_rate()
 
 
 
@@ -150,6 +198,10 @@ class FailureParameters:
         FailureParameters.failureMode = failure
         FailureParameters.generators = failureGenerators
         FailureParameters.distribution = dist
+        if Parameters.getSeed() is not None:
+            for vmIndex, row in enumerate(failureGenerators or []):
+                for depth, generator in enumerate(row):
+                    generator.set_rng(Parameters.getNumpyRandom(RandomStream.FAILURE, vmIndex, depth))
 
     @staticmethod
     def get_failure_generators() -> List[List[DistributionGenerator]]:
@@ -201,6 +253,10 @@ class FailureGenerator:
 
     @staticmethod
     def get_distribution(alpha: float, beta: float) -> Union[lognorm, weibull_min, gamma, norm, None]:
+        # SciPy is imported here rather than at module load so that runs
+        # without failure injection (FAILURE_NONE) never pay for it
+        import numpy as np
+        from scipy.stats import lognorm, weibull_min, gamma, norm
         distribution = None
         failureDistribution = FailureParameters.get_failure_distribution()
         if failureDistribution == DistributionGenerator.DistributionFamily.LOGNORMAL:
@@ -223,6 +279,11 @@ class FailureGenerator:
 
     @staticmethod
     def check_failure_status(task: Task, vmId: int):
+        return FailureGenerator.get_failure_time(task, vmId) >= 0
+
+    @staticmethod
+    def get_failure_time(task: Task, vmId: int) -> float:
+        # Returns the time the task failed at, or -1 if it ran through
         generator: DistributionGenerator = None
         failureGeneratorMode = FailureParameters.get_failure_generator_mode()
         if failureGeneratorMode == FailureParameters.FTCFailure.FAILURE_ALL:
@@ -234,7 +295,7 @@ class FailureGenerator:
         elif failureGeneratorMode == FailureParameters.FTCFailure.FAILURE_VM_JOB:
             generator = FailureParameters.get_generator(vmId, task.get_depth())
         else:
-            return False
+            return -1
 
         start = task.get_exec_start_time()
         end = task.get_taskFinishTime()
@@ -250,12 +311,12 @@ class FailureGenerator:
 
         for sampleId in range(len(samples)):
             if end < samples[sampleId]:
-                return False  # No failure
+                return -1  # No failure
             if start <= samples[sampleId]:
                 generator.get_next_sample()
-                return True  # Has a failure
+                return float(samples[sampleId])  # Has a failure
 
-        return False
+        return -1
 
     @staticmethod
     def generate(job: Job):
@@ -264,21 +325,33 @@ class FailureGenerator:
             return jobFailed
 
         try:
+            failureTimes: Dict[Task, float] = {}
             for task in job.get_task_list():
                 failedTaskSum = 0
-                if FailureGenerator.check_failure_status(task, job.get_vm_id()):
+                failureTime = FailureGenerator.get_failure_time(task, job.get_vm_id())
+                if failureTime >= 0:
                     jobFailed = True
                     failedTaskSum += 1
                     task.set_cloudlet_status(Cloudlet.FAILED)
+                    failureTimes[task] = failureTime
 
                 record = FailureRecord(0, failedTaskSum, task.get_depth(), 1, job.get_vm_id(), task.get_cloudlet_id(), job.get_user_id())
                 FailureMonitor.post_failure_record(record)
 
             if jobFailed:
                 job.set_cloudlet_status(Cloudlet.FAILED)
+                # Account for the lost work and keep whatever was checkpointed for the retry
+                CheckpointModel.process_failed_job(job, failureTimes)
             else:
                 job.set_cloudlet_status(Cloudlet.SUCCESS)
         except Exception as e:
             Log.print_line(str(e))
 
         return jobFailed
+
+
+SimulationContext.register(FailureMonitor, ('vm2record', 'type2record', 'jobid2record', 'recordList', 'window',
+                                            'allStatistic', 'vm2statistic', 'type2statistic'))
+SimulationContext.register(FailureParameters, ('generators', 'FTClusteringAlgorithm', 'monitorMode', 'failureMode',
+                                               'distribution'))
+SimulationContext.register(FailureGenerator, ('failureSizeExtension',))
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import List, Dict
+import cloudsim.Vm as Vm
+from cloudsim.core import CloudSim
+from cloudsim.context import SimulationContext
+from cloudsim.DataCenter import Datacenter
+from cloudsim.NetworkTopology import NetworkTopology
+
+
+class PlacementPolicy:
+    # Fill the datacenters one after the other, the broker's original behaviour
+    FIRST_FIT = 'FIRST_FIT'
+    ROUND_ROBIN = 'ROUND_ROBIN'
+    # Cheapest datacenter (cost per second) first
+    COST = 'COST'
+    # Datacenter closest to the VM's scheduler in the NetworkTopology first
+    LATENCY = 'LATENCY'
+
+
+class FederationParameters:
+    policy: str = PlacementPolicy.FIRST_FIT
+
+    @staticmethod
+    def init(policy: str) -> None:
+        if policy not in (PlacementPolicy.FIRST_FIT, PlacementPolicy.ROUND_ROBIN,
+                          PlacementPolicy.COST, PlacementPolicy.LATENCY):
+            raise ValueError(f"Unknown placement policy: {policy}")
+        FederationParameters.policy = policy
+
+    @staticmethod
+    def get_policy() -> str:
+        return FederationParameters.policy
+
+
+class FederationModel:
+    # Placement is planned from the free capacity of the hosts, the same way a
+    # datacenter checks whether a host is suitable for a VM. The plan is a pure
+    # function of the VM and datacenter lists, so the planner and the broker
+    # arrive at the same placement without sharing state. A VM the datacenter
+    # still refuses is retried on the next datacenter of its ranking.
+
+    @staticmethod
+    def get_datacenters() -> List[Datacenter]:
+        return [entity for entity in CloudSim.get_entity_list() if isinstance(entity, Datacenter)]
+
+
+    @staticmethod
+    def rank_datacenters(vm: Vm.Vm, datacenters: List[Datacenter], index: int) -> List[Datacenter]:
+        policy: str = FederationParameters.get_policy()
+        if policy == PlacementPolicy.ROUND_ROBIN and datacenters:
+            start: int = index % len(datacenters)
+            return datacenters[start:] + datacenters[:start]
+        if policy == PlacementPolicy.COST:
+            return sorted(datacenters, key=lambda dc: dc.get_characteristics().get_cost_per_second())
+        if policy == PlacementPolicy.LATENCY:
+            return sorted(datacenters, key=lambda dc: NetworkTopology.get_delay(vm.get_user_id(), dc.get_id()))
+        return list(datacenters)
+
+
+    @staticmethod
+    def reserve(hosts: List[List[float]], vm: Vm.Vm) -> bool:
+        # hosts holds [pe capacity, mips, ram, bw, storage] still available on every host
+        for free in hosts:
+            if (free[0] >= vm.get_mips() and free[1] >= vm.get_current_requested_total_mips()
+                    and free[2] >= vm.get_current_requested_ram() and free[3] >= vm.get_current_requested_bw()
+                    and free[4] >= vm.get_size()):
+                free[1] -= vm.get_current_requested_total_mips()
+                free[2] -= vm.get_current_requested_ram()
+                free[3] -= vm.get_current_requested_bw()
+                free[4] -= vm.get_size()
+                return True
+        return False
+
+
+    @staticmethod
+    def place(vmList: List[Vm.Vm], datacenters: List[Datacenter] = None) -> Dict[int, List[int]]:
+        # vm id -> datacenter ids in the order they should be tried, the planned one first
+        if datacenters is None:
+            datacenters = FederationModel.get_datacenters()
+        capacity: Dict[int, List[List[float]]] = {}
+        for datacenter in datacenters:
+            capacity[datacenter.get_id()] = [[host.get_vm_scheduler().get_pe_capacity(), host.get_available_mips(),
+                                              host.get_ram_provisioner().get_available_ram(),
+                                              host.get_bw_provisioner().get_available_bw(), host.get_storage()]
+                                             for host in datacenter.get_host_list()]
+        placement: Dict[int, List[int]] = {}
+        for index, vm in enumerate(vmList):
+            ranked: List[int] = [dc.get_id() for dc in FederationModel.rank_datacenters(vm, datacenters, index)]
+            for datacenterId in ranked:
+                if FederationModel.reserve(capacity[datacenterId], vm):
+                    ranked.remove(datacenterId)
+                    ranked.insert(0, datacenterId)
+                    break
+            placement[vm.get_id()] = ranked
+        return placement
+
+
+SimulationContext.register(FederationParameters, ('policy',))
@@ -11,6 +11,8 @@ from workflowsim.Task import Task
 from workflowsim.CustomVM import CustomVM
 from workflowsim.utils.Parameters import FileType
 from workflowsim.FileItem import FileItem
+from workflowsim.federation import FederationModel
+from workflowsim.transfer import NetworkParameters
 
 
 
@@ -58,18 +60,26 @@ class HEFTPlanningAlgorithm(BasePlanningAlgorithm):
             self.task = task 
             self.rank = rank
 
-    computationCosts: Dict[Task, Dict[CustomVM, float]] = dict()
-    transferCosts: Dict[Task, Dict[Task, float]] = dict()
-    averageBandwidth: float = 0.0
-    rank: Dict[Task, float] = dict()
-    earliestFinishTimes: Dict[Task, float] = dict()
-    schedules : Dict[CustomVM, List[HEFTPlanningAlgorithm.Event]] = dict()
+    def __init__(self):
+        super().__init__()
+        # Per planner, so that runs sharing a process don't see each other's costs
+        self.computationCosts: Dict[Task, Dict[CustomVM, float]] = dict()
+        self.transferCosts: Dict[Task, Dict[Task, float]] = dict()
+        self.averageBandwidth: float = 0.0
+        self.rank: Dict[Task, float] = dict()
+        self.earliestFinishTimes: Dict[Task, float] = dict()
+        self.schedules: Dict[CustomVM, List[HEFTPlanningAlgorithm.Event]] = dict()
 
 
     def run(self) -> None:
-        Log.print_line(f"HEFT planner running with {len(self.get_task_list())} tasks.")
+        Log.info("HEFT planner running with %s tasks.", len(self.get_task_list()))
 
         self.averageBandwidth = self.calculate_average_bandwidth()
+        # vm id -> planned datacenter, only needed when the VMs are spread over several
+        self.vmDatacenters: Dict[int, int] = {}
+        if len(FederationModel.get_datacenters()) > 1:
+            for vmId, candidates in FederationModel.place(self.get_vm_list()).items():
+                self.vmDatacenters[vmId] = candidates[0]
         for vmObject in self.get_vm_list():
             vm: CustomVM = cast(CustomVM, vmObject)
             self.schedules[vm] = []
@@ -99,7 +109,7 @@ class HEFTPlanningAlgorithm(BasePlanningAlgorithm):
                     costsVm[vm] = float('inf')
                 else:
                     costsVm[vm] = task.get_cloudlet_total_length() / vm.get_mips()
-            HEFTPlanningAlgorithm.computationCosts[task] = costsVm
+            self.computationCosts[task] = costsVm
 
     
     def calculate_transfer_costs(self):
@@ -120,10 +130,10 @@ class HEFTPlanningAlgorithm(BasePlanningAlgorithm):
         child_files: List[FileItem] = child.get_fileList()
         acc: float = 0.0
         for parent_file in parent_files:
-            if parent_file.get_type() != FileType.OUTPUT:
+            if parent_file.get_type().value != FileType.OUTPUT:
                 continue
             for child_file in child_files:
-                if child_file.get_type() == FileType.INPUT and child_file.get_name() == parent_file.get_name():
+                if child_file.get_type().value == FileType.INPUT and child_file.get_name() == parent_file.get_name():
                     acc += child_file.get_size()
                     break
         # File size is in bytes, acc in MB
@@ -132,6 +142,19 @@ class HEFTPlanningAlgorithm(BasePlanningAlgorithm):
         return (acc * 8) / self.averageBandwidth
 
 
+    def get_transfer_cost(self, parent: Task, child: Task, vm: CustomVM) -> float:
+        # Data leaving the parent's datacenter is also limited by the network between the two
+        cost: float = self.transferCosts[parent][child]
+        src: int = self.vmDatacenters.get(parent.get_vm_id())
+        dest: int = self.vmDatacenters.get(vm.get_id())
+        if cost == 0.0 or src is None or dest is None or src == dest:
+            return cost
+        bw: float = NetworkParameters.get_bandwidth(src, dest)
+        if bw < self.averageBandwidth:
+            cost *= self.averageBandwidth / bw
+        return cost + NetworkParameters.get_message_delay(src, dest)
+
+
     def calculate_ranks(self):
         for task in self.get_task_list():
             self.calculate_rank(task)
@@ -173,7 +196,7 @@ class HEFTPlanningAlgorithm(BasePlanningAlgorithm):
             for parent in task.get_parentList():
                 ready_time: float = self.earliestFinishTimes[parent]
                 if parent.get_vm_id() != vm.get_id():
-                    ready_time += self.transferCosts[parent][task]
+                    ready_time += self.get_transfer_cost(parent, task, vm)
                 min_ready_time = max(min_ready_time, ready_time)
 
             finish_time = self.find_finish_time(task, vm, min_ready_time, False)
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from typing import List, Dict
+from typing import List, Dict, Tuple, cast
 from abc import ABC, abstractmethod
 from cloudsim.Cloudlet import Cloudlet 
 import cloudsim.Vm as Vm
+from cloudsim.Consts import Consts
 from cloudsim.Log import Log
 from workflowsim.CustomVM import CustomVM
+from workflowsim.Job import Job
 from workflowsim.WorkflowSimTags import WorkflowSimTags
+from workflowsim.utils.Parameters import ClassType
+from workflowsim.utils.ReplicaCatalog import ReplicaCatalog
 
 
 class BaseSchedulingAlgorithm(ABC):
@@ -56,10 +60,61 @@ class StaticSchedulingAlgorithm(BaseSchedulingAlgorithm):
         for i in range(size):
             cloudlet: Cloudlet = self.get_cloudlet_list()[i]
             if cloudlet.get_vm_id() < 0 or cloudlet.get_vm_id() not in mId2Vm:
-                Log.print_line(f"Cloudlet {cloudlet.get_cloudlet_id()} is not matched. It is possible a stage-in job")
+                Log.warning("Cloudlet %s is not matched. It is possible a stage-in job", cloudlet.get_cloudlet_id())
                 cloudlet.set_vm_id(0)
             vm: CustomVM = mId2Vm[cloudlet.get_vm_id()]
             if vm.get_state() == WorkflowSimTags.VM_STATUS_IDLE:
-                vm.set_state(WorkflowSimTags.VM_STATUS_BUSY)
+                vm.acquire_slot()
                 self.get_scheduled_list().append(cloudlet)
-                Log.print_line(f"Schedules {cloudlet.get_cloudlet_id()} with {cloudlet.get_cloudlet_length()} to VM {cloudlet.get_vm_id()}")
\ No newline at end of file
+                Log.debug("Schedules %s with %s to VM %s", cloudlet.get_cloudlet_id(), cloudlet.get_cloudlet_length(), cloudlet.get_vm_id())
+
+
+class DataAwareSchedulingAlgorithm(BaseSchedulingAlgorithm):
+    # Sends each job to the idle VM that already holds the most bytes of its input,
+    # ties are broken by the estimated finish time (stage-in plus compute). A VM
+    # stays a candidate until all of its slots are taken.
+    def __init__(self):
+        super().__init__()
+
+
+    def run(self) -> None:
+        idleVms: List[CustomVM] = [vm for vm in self.get_vm_list()
+                                   if vm is not None and vm.get_state() == WorkflowSimTags.VM_STATUS_IDLE]
+        for cloudlet in self.get_cloudlet_list():
+            if not idleVms:
+                break
+            job: Job = cast(Job, cloudlet)
+            best: CustomVM = None
+            bestScore: Tuple[float, float] = None
+            for vm in idleVms:
+                resident, missing = self.get_input_size(job, vm)
+                score: Tuple[float, float] = (-resident, self.get_finish_time(job, vm, missing))
+                if bestScore is None or score < bestScore:
+                    best = vm
+                    bestScore = score
+            best.acquire_slot()
+            if best.get_state() == WorkflowSimTags.VM_STATUS_BUSY:
+                idleVms.remove(best)
+            job.set_vm_id(best.get_id())
+            self.get_scheduled_list().append(job)
+            Log.debug("Schedules %s with %s to VM %s", job.get_cloudlet_id(), job.get_cloudlet_length(), best.get_id())
+
+
+    def get_input_size(self, job: Job, vm: CustomVM) -> Tuple[float, float]:
+        # Bytes of input already on the VM and bytes still to be staged in
+        if job.get_class_type() == ClassType.STAGE_IN or ReplicaCatalog.get_file_system() != ReplicaCatalog.FileSystem.LOCAL:
+            return 0.0, 0.0
+        site: str = str(vm.get_id())
+        resident: float = 0.0
+        missing: float = 0.0
+        for file in job.get_fileList():
+            if file.is_real_input_file(job.get_fileList()):
+                if ReplicaCatalog.has_replica(file.get_name(), site):
+                    resident += file.get_size()
+                else:
+                    missing += file.get_size()
+        return resident, missing
+
+
+    def get_finish_time(self, job: Job, vm: CustomVM, missing: float) -> float:
+        return missing / float(Consts.MILLION) / vm.get_bw() + job.get_cloudlet_length() / vm.get_mips()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import socketserver
+import sys
+import threading
+from typing import Any, Dict, List, TextIO
+
+from workflowsim.cache import ResultCache
+from workflowsim.experiment import Experiment
+from workflowsim.WorkflowParser import WorkflowParser
+
+
+class SimulationServer:
+    # A long lived worker that answers run requests, one JSON object per line. A request
+    # is an Experiment config with an optional "id" echoed in the response:
+    #   {"id": 7, "dax": "data/Montage_25.xml", "vms": 5, "seed": 1}
+    #   {"id": 7, "status": "ok", "jobs": 26, "makespan": 117.12, ...}
+    # The modules, and every workflow once seen, stay loaded between requests, each run
+    # gets a fresh SimulationContext. "trace": true adds the job trace to the response.
+
+    def __init__(self, preload: List[str] = None, cache: ResultCache = None):
+        # Simulations share process wide state such as the Log, so they run one at a time
+        self.lock: threading.Lock = threading.Lock()
+        self.cache: ResultCache = cache
+        for path in preload or []:
+            WorkflowParser.preload(path)
+
+
+    def handle(self, line: str) -> str:
+        response: Dict[str, Any] = {}
+        try:
+            request: Dict[str, Any] = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object")
+            response["id"] = request.pop("id", None)
+            trace: bool = bool(request.pop("trace", False))
+            with self.lock:
+                if request.get("dax"):
+                    WorkflowParser.preload(request["dax"])
+                response.update(Experiment.run(request, self.cache, trace))
+            response["status"] = "ok"
+        except Exception as e:
+            response["status"] = "error"
+            response["error"] = f"{type(e).__name__}: {e}"
+        return json.dumps(response)
+
+
+    def serve_stream(self, input: TextIO, output: TextIO) -> None:
+        for line in input:
+            if line.strip():
+                output.write(self.handle(line) + "\n")
+                output.flush()
+
+
+    def serve_stdin(self) -> None:
+        # stdout carries the responses, whatever the simulator prints goes to stderr
+        output: TextIO = sys.stdout
+        sys.stdout = sys.stderr
+        try:
+            self.serve_stream(sys.stdin, output)
+        finally:
+            sys.stdout = output
+
+
+    def create_handler(self) -> type:
+        server: SimulationServer = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    line = line.decode("utf-8")
+                    if line.strip():
+                        self.wfile.write((server.handle(line) + "\n").encode("utf-8"))
+                        self.wfile.flush()
+
+        return RequestHandler
+
+
+    def serve_socket(self, path: str) -> None:
+        # Unix domain socket, a client may keep its connection open for many requests
+        if os.path.exists(path):
+            os.unlink(path)
+        with socketserver.ThreadingUnixStreamServer(path, self.create_handler()) as server:
+            try:
+                server.serve_forever()
+            finally:
+                os.unlink(path)
+
+
+    def serve_port(self, port: int) -> None:
+        # Only bound to the loopback interface, the server runs whatever dax path it is sent
+        with socketserver.ThreadingTCPServer(("127.0.0.1", port), self.create_handler()) as server:
+            server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Answer simulation requests sent as JSON lines")
+    parser.add_argument("--preload", nargs="*", default=[], help="DAX files or glob patterns to parse at start")
+    parser.add_argument("--cache", help="directory of cached results, answered without simulating")
+    parser.add_argument("--cache-size", type=int, default=ResultCache.MAX_BYTES // (1024 * 1024),
+                        help="size of the cache in MB, least recently used results are removed first")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--socket", help="listen on this Unix domain socket instead of stdin")
+    group.add_argument("--port", type=int, help="listen on this localhost TCP port instead of stdin")
+    args = parser.parse_args()
+    preload: List[str] = [path for pattern in args.preload
+                          for path in (sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern])]
+    cache: ResultCache = ResultCache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+    server: SimulationServer = SimulationServer(preload, cache)
+    try:
+        if args.socket:
+            server.serve_socket(args.socket)
+        elif args.port:
+            server.serve_port(args.port)
+        else:
+            server.serve_stdin()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
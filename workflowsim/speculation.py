@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import copy
+import math
+from typing import List
+import cloudsim.Vm as Vm
+from cloudsim.Consts import Consts
+from cloudsim.context import SimulationContext
+from workflowsim.Job import Job
+from workflowsim.CustomVM import CustomVM
+from workflowsim.failure import FailureMonitor, FailureParameters
+from workflowsim.utils.Parameters import ClassType
+from workflowsim.utils.ReplicaCatalog import ReplicaCatalog
+
+
+class SpeculationParameters:
+    # Expected runtime (seconds) above which a backup copy of a job is launched, 0 disables speculation
+    threshold: float = 0.0
+
+    @staticmethod
+    def init(threshold: float) -> None:
+        if threshold < 0:
+            raise ValueError("Speculation threshold can't be negative")
+        SpeculationParameters.threshold = threshold
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return SpeculationParameters.threshold > 0
+
+    @staticmethod
+    def get_threshold() -> float:
+        return SpeculationParameters.threshold
+
+
+class SpeculationModel:
+    # A job fails if any of its tasks fails. The per-task failure rate observed by
+    # the FailureMonitor and the VM's own failure rate (lambdaValue, per second) are
+    # combined into the probability p that one attempt fails. Every failed attempt is
+    # retried from scratch, so the expected runtime is T / (1 - p).
+
+    @staticmethod
+    def get_runtime(job: Job, vm: Vm.Vm) -> float:
+        return job.get_cloudlet_length() / vm.get_mips()
+
+
+    @staticmethod
+    def get_failure_probability(job: Job, vm: Vm.Vm) -> float:
+        if FailureParameters.get_monitor_mode() == FailureParameters.FTCMonitor.MONITOR_VM:
+            rate: float = FailureMonitor.analyze(vm.get_id())
+        else:
+            rate: float = FailureMonitor.analyze(job.get_depth())
+        success: float = (1.0 - rate) ** max(1, len(job.get_task_list()))
+        if isinstance(vm, CustomVM):
+            success *= math.exp(-vm.lambdaValue * SpeculationModel.get_runtime(job, vm))
+        return 1.0 - success
+
+
+    @staticmethod
+    def get_expected_runtime(job: Job, vm: Vm.Vm) -> float:
+        p: float = SpeculationModel.get_failure_probability(job, vm)
+        if p >= 1.0:
+            return float('inf')
+        return SpeculationModel.get_runtime(job, vm) / (1.0 - p)
+
+
+    @staticmethod
+    def need_backup(job: Job, vm: Vm.Vm) -> bool:
+        # Stage-in jobs populate the replica catalog and are never duplicated
+        if not SpeculationParameters.is_enabled() or job.get_class_type() == ClassType.STAGE_IN:
+            return False
+        if SpeculationModel.get_failure_probability(job, vm) <= 0.0:
+            return False
+        return SpeculationModel.get_expected_runtime(job, vm) > SpeculationParameters.get_threshold()
+
+
+    @staticmethod
+    def get_stage_in_time(job: Job, vm: Vm.Vm) -> float:
+        # Input data that has no replica on this VM yet has to be transferred first
+        if ReplicaCatalog.get_file_system() != ReplicaCatalog.FileSystem.LOCAL:
+            return 0.0
+        size: float = 0.0
+        for file in job.get_fileList():
+            if file.is_real_input_file(job.get_fileList()):
+                if not ReplicaCatalog.has_replica(file.get_name(), str(vm.get_id())):
+                    size += file.get_size()
+        if size == 0.0:
+            return 0.0
+        return size / float(Consts.MILLION) / vm.get_bw()
+
+
+    @staticmethod
+    def select_backup_vm(job: Job, candidates: List[Vm.Vm]) -> Vm.Vm:
+        # Prefer the VM that would finish the copy first, including its stage-in time
+        best: Vm.Vm = None
+        bestTime: float = float('inf')
+        for vm in candidates:
+            time: float = SpeculationModel.get_expected_runtime(job, vm) + SpeculationModel.get_stage_in_time(job, vm)
+            if time < bestTime:
+                best = vm
+                bestTime = time
+        return best
+
+
+    @staticmethod
+    def create_backup(job: Job, vmId: int) -> Job:
+        # Same cloudlet id, so the engine can't tell which copy came back, but
+        # separate execution state for the job and its tasks
+        backup: Job = copy.copy(job)
+        backup.resList = list(job.resList)
+        if job.history is not None:
+            backup.history = copy.copy(job.history)
+            backup.history.history = list(job.history.history)
+        taskList: List = []
+        for task in job.get_task_list():
+            clone = copy.copy(task)
+            clone.resList = list(task.resList)
+            taskList.append(clone)
+        backup.set_task_list(taskList)
+        backup.set_vm_id(vmId)
+        return backup
+
+
+SimulationContext.register(SpeculationParameters, ('threshold',))
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import glob
+import itertools
+import json
+import os
+import sys
+import traceback
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Set
+
+from workflowsim.cache import ResultCache
+from workflowsim.experiment import Experiment
+
+
+class ResultWriter(ABC):
+    # Results are streamed as runs finish and the file stays readable after a crash,
+    # so that an interrupted sweep can resume from it
+    COLUMNS: List[str] = ["key", "dax", "vms", "planner", "scheduler", "clustering", "failure", "seed",
+                          "status", "error", "jobs", "makespan", "cost", "energy", "wastedWork", "wallTime", "digest", "cached"]
+
+    @staticmethod
+    def open(path: str) -> ResultWriter:
+        if path.endswith(".csv"):
+            return CsvResultWriter(path)
+        return ParquetResultWriter(path)
+
+    @abstractmethod
+    def get_completed(self) -> Set[str]:
+        pass
+
+    @abstractmethod
+    def write(self, row: Dict[str, Any]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class CsvResultWriter(ResultWriter):
+    # One row per run, flushed as soon as it is written
+    def __init__(self, path: str):
+        self.path: str = path
+        self.file = None
+        self.writer: csv.DictWriter = None
+
+    def get_completed(self) -> Set[str]:
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, newline="") as file:
+            return {row["key"] for row in csv.DictReader(file) if row.get("status") == "ok"}
+
+    def write(self, row: Dict[str, Any]) -> None:
+        if self.file is None:
+            exists: bool = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+            if exists:
+                # A run killed mid-write leaves a partial last line
+                with open(self.path, "rb") as file:
+                    file.seek(-1, os.SEEK_END)
+                    partial: bool = file.read(1) != b"\n"
+            self.file = open(self.path, "a", newline="")
+            if exists and partial:
+                self.file.write("\n")
+            self.writer = csv.DictWriter(self.file, fieldnames=ResultWriter.COLUMNS, extrasaction="ignore")
+            if not exists:
+                self.writer.writeheader()
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class ParquetResultWriter(ResultWriter):
+    # A directory of Parquet parts, one per batch of finished runs. Parts are renamed
+    # into place once complete, pandas.read_parquet loads the directory.
+    BATCH_SIZE: int = 64
+
+    def __init__(self, path: str, batchSize: int = BATCH_SIZE):
+        self.path: str = path
+        self.batchSize: int = batchSize
+        self.rows: List[Dict[str, Any]] = []
+
+    def get_parts(self) -> List[str]:
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(os.path.join(self.path, name) for name in os.listdir(self.path) if name.endswith(".parquet"))
+
+    def get_completed(self) -> Set[str]:
+        import pyarrow.parquet as pq
+        completed: Set[str] = set()
+        for part in self.get_parts():
+            table = pq.read_table(part, columns=["key", "status"]).to_pydict()
+            completed.update(key for key, status in zip(table["key"], table["status"]) if status == "ok")
+        return completed
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self.rows.append(row)
+        if len(self.rows) >= self.batchSize:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        os.makedirs(self.path, exist_ok=True)
+        table = pa.table({column: [row.get(column) for row in self.rows] for column in ResultWriter.COLUMNS})
+        name: str = os.path.join(self.path, f"part-{len(self.get_parts()):05d}.parquet")
+        pq.write_table(table, name + ".tmp")
+        os.replace(name + ".tmp", name)
+        self.rows = []
+
+    def close(self) -> None:
+        self.flush()
+
+
+class Sweep:
+    @staticmethod
+    def expand(grid: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # Cartesian product of the grid values, a dax entry may be a glob pattern
+        axes: Dict[str, List[Any]] = {}
+        for name, values in grid.items():
+            if not isinstance(values, list):
+                values = [values]
+            if name == "dax":
+                values = [path for value in values for path in (sorted(glob.glob(value)) if glob.has_magic(value) else [value])]
+            axes[name] = values
+        return [dict(zip(axes, point)) for point in itertools.product(*axes.values())]
+
+
+    @staticmethod
+    def get_key(config: Dict[str, Any]) -> str:
+        try:
+            config = Experiment.normalize(config)
+        except ValueError:
+            # Invalid points still get a row, their error is reported by run_point
+            config = dict(Experiment.DEFAULTS, **config)
+        return json.dumps(config, sort_keys=True)
+
+
+    @staticmethod
+    def run_point(config: Dict[str, Any], cache: ResultCache = None) -> Dict[str, Any]:
+        # Runs in a worker process, failures are reported in the row rather than raised
+        row: Dict[str, Any] = {"key": Sweep.get_key(config)}
+        row.update(json.loads(row["key"]))
+        row["clustering"] = json.dumps(row["clustering"], sort_keys=True) if row["clustering"] else None
+        row["failure"] = json.dumps(row["failure"], sort_keys=True) if row["failure"] else None
+        try:
+            row.update(Experiment.run(config, cache))
+            row["status"] = "ok"
+        except Exception:
+            row["status"] = "error"
+            row["error"] = traceback.format_exc(limit=-1).strip().splitlines()[-1]
+        return row
+
+
+    @staticmethod
+    def run(points: Iterable[Dict[str, Any]], resultsPath: str, workers: int = None, resume: bool = True,
+            cache: ResultCache = None) -> int:
+        # Returns the number of runs done, points already in the results file are skipped
+        writer: ResultWriter = ResultWriter.open(resultsPath)
+        completed: Set[str] = writer.get_completed() if resume else set()
+        pending: Dict[str, Dict[str, Any]] = {}
+        for point in points:
+            key: str = Sweep.get_key(point)
+            if key not in completed:
+                pending.setdefault(key, point)
+        if resume and completed:
+            print(f"Resuming: {len(completed)} runs done, {len(pending)} left", file=sys.stderr)
+        done: int = 0
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(Sweep.run_point, point, cache) for point in pending.values()]
+                for future in as_completed(futures):
+                    row: Dict[str, Any] = future.result()
+                    writer.write(row)
+                    done += 1
+                    status: str = f"makespan {row['makespan']:.2f}" if row["status"] == "ok" else row["error"]
+                    print(f"[{done}/{len(pending)}] {row['dax']} vms={row['vms']} {row['planner']}/{row['scheduler']} "
+                          f"seed={row['seed']}: {status}", file=sys.stderr)
+        finally:
+            writer.close()
+        return done
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a parameter sweep over a process pool")
+    parser.add_argument("grid", help="JSON file mapping experiment settings to lists of values")
+    parser.add_argument("results", help="results file, .csv or a directory of Parquet parts")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes, one per CPU by default")
+    parser.add_argument("--no-resume", action="store_true", help="run every point even if it is in the results")
+    parser.add_argument("--cache", help="directory of cached results shared between sweeps")
+    parser.add_argument("--cache-size", type=int, default=ResultCache.MAX_BYTES // (1024 * 1024),
+                        help="size of the cache in MB, least recently used results are removed first")
+    args = parser.parse_args()
+    with open(args.grid) as file:
+        grid: Dict[str, Any] = json.load(file)
+    cache: ResultCache = ResultCache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+    Sweep.run(Sweep.expand(grid), args.results, args.workers, not args.no_resume, cache)
+
+
+if __name__ == "__main__":
+    main()
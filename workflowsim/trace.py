@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import csv
+import importlib.util
+import os
+from abc import ABC, abstractmethod
+from typing import Any, List, Tuple
+from cloudsim.context import SimulationContext
+from workflowsim.Job import Job
+
+
+class JobTraceWriter(ABC):
+    # Jobs are buffered as tuples and written batchSize at a time, so memory stays
+    # bounded however large the workflow. pandas.read_csv and pandas.read_parquet load
+    # the output as is.
+    COLUMNS: List[str] = ["jobId", "taskIds", "vmId", "datacenterId", "start", "finish", "cpuTime", "depth",
+                          "status", "bytesStaged"]
+    BATCH_SIZE: int = 4096
+
+    @staticmethod
+    def open(path: str, batchSize: int = BATCH_SIZE) -> JobTraceWriter:
+        if path.endswith(".csv"):
+            return CsvJobTraceWriter(path, batchSize)
+        return ParquetJobTraceWriter(path, batchSize)
+
+    def __init__(self, path: str, batchSize: int = BATCH_SIZE):
+        self.path: str = path
+        self.batchSize: int = batchSize
+        self.rows: List[Tuple[Any, ...]] = []
+        self.count: int = 0
+
+    @staticmethod
+    def get_row(job: Job) -> Tuple[Any, ...]:
+        return (job.get_cloudlet_id(), [task.get_cloudlet_id() for task in job.get_task_list()], job.get_vm_id(),
+                job.get_resource_id(), job.get_exec_start_time(), job.get_finish_time(), job.get_actual_cpu_time(),
+                job.get_depth(), job.get_cloudlet_status_string(), job.get_staged_bytes())
+
+    def write(self, job: Job) -> None:
+        self.rows.append(JobTraceWriter.get_row(job))
+        self.count += 1
+        if len(self.rows) >= self.batchSize:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.rows:
+            self.write_batch(self.rows)
+            self.rows = []
+
+    @abstractmethod
+    def write_batch(self, rows: List[Tuple[Any, ...]]) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def get_count(self) -> int:
+        return self.count
+
+
+class CsvJobTraceWriter(JobTraceWriter):
+    # Task ids are joined with spaces
+    def __init__(self, path: str, batchSize: int = JobTraceWriter.BATCH_SIZE):
+        super().__init__(path, batchSize)
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(JobTraceWriter.COLUMNS)
+
+    def write_batch(self, rows: List[Tuple[Any, ...]]) -> None:
+        self.writer.writerows((row[0], " ".join(map(str, row[1]))) + row[2:] for row in rows)
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.file is None:
+            return
+        self.flush()
+        self.file.close()
+        self.file = None
+
+
+class ParquetJobTraceWriter(JobTraceWriter):
+    # A single Parquet file with a row group per batch, task ids as a list column. It
+    # is written next to path and renamed into place on close, an unfinished
+    # simulation leaves no half written file behind.
+    def __init__(self, path: str, batchSize: int = JobTraceWriter.BATCH_SIZE):
+        ParquetJobTraceWriter.check()
+        super().__init__(path, batchSize)
+        self.writer = None
+        self.closed: bool = False
+
+    @staticmethod
+    def check() -> None:
+        # pyarrow is only imported when a batch is written, fail before the simulation instead
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError("A Parquet job trace needs pyarrow, install it or use a .csv path")
+
+    @staticmethod
+    def get_schema():
+        import pyarrow as pa
+        return pa.schema([("jobId", pa.int64()), ("taskIds", pa.list_(pa.int64())), ("vmId", pa.int64()),
+                          ("datacenterId", pa.int64()), ("start", pa.float64()), ("finish", pa.float64()),
+                          ("cpuTime", pa.float64()), ("depth", pa.int64()), ("status", pa.string()),
+                          ("bytesStaged", pa.float64())])
+
+    def write_batch(self, rows: List[Tuple[Any, ...]]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = ParquetJobTraceWriter.get_schema()
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path + ".tmp", schema)
+        columns: List[List[Any]] = [list(column) for column in zip(*rows)]
+        self.writer.write_table(pa.table(columns, schema=schema))
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.flush()
+        if self.writer is None:
+            # No job came back, the file still gets the columns
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(self.path + ".tmp", ParquetJobTraceWriter.get_schema())
+        self.writer.close()
+        os.replace(self.path + ".tmp", self.path)
+
+
+class TraceParameters:
+    # Path the WorkflowEngine streams a row per returned job to, None disables the
+    # trace. A path ending in .csv is written as CSV, anything else as one Parquet file.
+    path: str = None
+    # Rows kept in memory before they are written, one Parquet row group per batch
+    batchSize: int = JobTraceWriter.BATCH_SIZE
+
+    @staticmethod
+    def init(path: str, batchSize: int = JobTraceWriter.BATCH_SIZE) -> None:
+        if batchSize <= 0:
+            raise ValueError("Trace batch size must be positive")
+        if path is not None and not path.endswith(".csv"):
+            ParquetJobTraceWriter.check()
+        TraceParameters.path = path
+        TraceParameters.batchSize = batchSize
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return TraceParameters.path is not None
+
+    @staticmethod
+    def get_path() -> str:
+        return TraceParameters.path
+
+    @staticmethod
+    def get_batch_size() -> int:
+        return TraceParameters.batchSize
+
+
+SimulationContext.register(TraceParameters, ('path', 'batchSize'))
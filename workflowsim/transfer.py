@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from typing import List, Dict, Tuple
+from cloudsim.NetworkTopology import NetworkTopology
+from cloudsim.context import SimulationContext
+from workflowsim.Job import Job
+
+
+class TransferParameters:
+    # Concurrent stage-in transfers share link bandwidth when enabled, otherwise each
+    # file is charged size / bandwidth as if it had a dedicated link
+    enabled: bool = False
+    # Bandwidth (MB/s) of the link out of Parameters.SOURCE, 0 means unlimited
+    sourceBandwidth: float = 0.0
+
+    @staticmethod
+    def init(enabled: bool, sourceBandwidth: float = 0.0) -> None:
+        if sourceBandwidth < 0:
+            raise ValueError("Source bandwidth can't be negative")
+        TransferParameters.enabled = enabled
+        TransferParameters.sourceBandwidth = sourceBandwidth
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return TransferParameters.enabled
+
+    @staticmethod
+    def get_source_bandwidth() -> float:
+        return TransferParameters.sourceBandwidth
+
+
+class NetworkParameters:
+    # Messages between the engine, schedulers and datacenters are delayed by the
+    # NetworkTopology latency and inter-datacenter transfers are limited by its
+    # bandwidth when enabled. Entities have to be mapped with NetworkTopology.map_node.
+    enabled: bool = False
+
+    @staticmethod
+    def init(enabled: bool) -> None:
+        NetworkParameters.enabled = enabled
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return NetworkParameters.enabled and NetworkTopology.is_network_enabled()
+
+    @staticmethod
+    def get_message_delay(srcId: int, destId: int) -> float:
+        if srcId == destId or not NetworkParameters.is_enabled():
+            return 0.0
+        return NetworkTopology.get_delay(srcId, destId)
+
+    @staticmethod
+    def get_bandwidth(srcId: int, destId: int) -> float:
+        # Bandwidth available between two datacenters, inf if the network doesn't limit it
+        if srcId == destId or not NetworkParameters.is_enabled():
+            return float('inf')
+        bw: float = NetworkTopology.get_path_bw(srcId, destId)
+        return bw if bw > 0 else float('inf')
+
+
+class Flow:
+    def __init__(self, job: Job, fileName: str, size: float, links: List[str]):
+        self.job: Job = job
+        self.fileName: str = fileName
+        # Megabytes still to transfer
+        self.remaining: float = size
+        # Links the flow crosses, it gets a fair share on each of them
+        self.links: List[str] = links
+        self.rate: float = 0.0
+
+
+class FlowModel:
+    # Fluid model of the stage-in transfers of one datacenter. Rates are the max-min
+    # fair share of the link capacities and only change when a flow starts or ends,
+    # so the model needs one completion event per change of the active flow set.
+    MIN_REMAINING: float = 1e-9
+
+    def __init__(self):
+        self.capacity: Dict[str, float] = {}
+        self.flows: List[Flow] = []
+        self.lastUpdate: float = 0.0
+        # Bumped on every change, completion events carrying an older version are stale
+        self.version: int = 0
+
+    def set_capacity(self, link: str, capacity: float) -> None:
+        self.capacity[link] = capacity
+
+    def get_active_flows(self, link: str) -> int:
+        return sum(1 for flow in self.flows if link in flow.links)
+
+    def has_flows(self, job: Job) -> bool:
+        return any(flow.job is job for flow in self.flows)
+
+    def advance(self, now: float) -> None:
+        elapsed: float = now - self.lastUpdate
+        if elapsed > 0:
+            for flow in self.flows:
+                flow.remaining = max(0.0, flow.remaining - flow.rate * elapsed)
+        self.lastUpdate = now
+
+    def add_flow(self, flow: Flow) -> None:
+        self.flows.append(flow)
+
+    def remove_job(self, job: Job) -> None:
+        self.flows = [flow for flow in self.flows if flow.job is not job]
+
+    def pop_finished(self) -> List[Flow]:
+        finished: List[Flow] = [flow for flow in self.flows if flow.remaining <= FlowModel.MIN_REMAINING]
+        if finished:
+            self.flows = [flow for flow in self.flows if flow.remaining > FlowModel.MIN_REMAINING]
+        return finished
+
+    def reallocate(self) -> float:
+        # Progressive filling: saturate the most constrained link, freeze its flows, repeat
+        self.version += 1
+        unfrozen: List[Flow] = list(self.flows)
+        residual: Dict[str, float] = dict(self.capacity)
+        while unfrozen:
+            counts: Dict[str, int] = {}
+            for flow in unfrozen:
+                for link in flow.links:
+                    counts[link] = counts.get(link, 0) + 1
+            bottleneck: str = None
+            share: float = float('inf')
+            for link, count in counts.items():
+                linkShare: float = residual.get(link, float('inf')) / count
+                if linkShare < share:
+                    bottleneck = link
+                    share = linkShare
+            if bottleneck is None or share == float('inf'):
+                # Only unlimited links are left
+                for flow in unfrozen:
+                    flow.rate = float('inf')
+                break
+            frozen: List[Flow] = [flow for flow in unfrozen if bottleneck in flow.links]
+            for flow in frozen:
+                flow.rate = share
+                for link in flow.links:
+                    if link in residual:
+                        residual[link] -= share
+            unfrozen = [flow for flow in unfrozen if bottleneck not in flow.links]
+        return self.get_next_completion()
+
+    def get_next_completion(self) -> float:
+        # Seconds until the first active flow completes
+        delay: float = float('inf')
+        for flow in self.flows:
+            if flow.rate == float('inf'):
+                return 0.0
+            if flow.rate > 0:
+                delay = min(delay, flow.remaining / flow.rate)
+        return delay
+
+    @staticmethod
+    def link_out(site: str) -> str:
+        return "out:" + site
+
+    @staticmethod
+    def link_in(site: str) -> str:
+        return "in:" + site
+
+    def pick_source(self, sites: List[Tuple[str, float]]) -> str:
+        # The replica whose outgoing link would give the new flow the largest share
+        best: str = None
+        bestShare: float = -1.0
+        for site, capacity in sites:
+            share: float = capacity / (self.get_active_flows(FlowModel.link_out(site)) + 1)
+            if share > bestShare:
+                best = site
+                bestShare = share
+        return best
+
+
+SimulationContext.register(TransferParameters, ('enabled', 'sourceBandwidth'))
+SimulationContext.register(NetworkParameters, ('enabled',))
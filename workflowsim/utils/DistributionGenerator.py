@@ -1,6 +1,10 @@
-import numpy as np
+from __future__ import annotations
+
 from enum import Enum, auto
-from scipy.stats import gamma, lognorm, norm, weibull_min
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
 
 class DistributionGenerator:
     class DistributionFamily(Enum):
@@ -9,17 +13,29 @@ class DistributionGenerator:
         WEIBULL = auto()
         NORMAL = auto()
 
-    def __init__(self, dist: str, scale: float, shape: float, a: float = None, b: float = None, c: float = None):
+    def __init__(self, dist: str, scale: float, shape: float, a: float = None, b: float = None, c: float = None,
+                 rng: np.random.Generator = None):
         self.dist = dist
         self.scale = scale
         self.shape = shape
         self.scale_prior = scale
         self.shape_prior = shape
         self.likelihood_prior = c if c is not None else 0.0
+        self.SAMPLE_SIZE = 1500  # DistributionGenerator will automatically increase the size
+        # NumPy's global generator is used when no generator is given
+        self.rng = rng
+        import numpy as np  # numpy and scipy are only loaded once a generator is actually built
         self.samples = self.get_distribution_samples(scale, shape)
         self.cumulativeSamples = np.cumsum(self.samples)
         self.cursor = 0
-        self.SAMPLE_SIZE = 1500  # DistributionGenerator will automatically increase the size
+
+    def set_rng(self, rng: np.random.Generator) -> None:
+        # The samples drawn so far are redrawn from the new generator
+        import numpy as np
+        self.rng = rng
+        self.samples = self.get_distribution_samples(self.scale, self.shape)
+        self.cumulativeSamples = np.cumsum(self.samples)
+        self.cursor = 0
 
     def get_samples(self) -> np.ndarray:
         return self.samples
@@ -28,6 +44,7 @@ class DistributionGenerator:
         return self.cumulativeSamples
 
     def extend_samples(self):
+        import numpy as np
         new_samples = self.get_distribution_samples(self.scale, self.shape)
         self.samples = np.concatenate((self.samples, new_samples))
         self.cumulativeSamples = np.cumsum(self.samples)
@@ -36,6 +53,7 @@ class DistributionGenerator:
         return self.shape_prior / self.scale_prior
 
     def get_mean(self) -> float:
+        import numpy as np
         return np.mean(self.samples[:self.cursor])
 
     def get_likelihood_prior(self) -> float:
@@ -61,15 +79,18 @@ class DistributionGenerator:
         return result
 
     def vary_distribution(self, scale: float, shape: float):
+        import numpy as np
         self.scale = scale
         self.shape = shape
         self.samples = self.get_distribution_samples(scale, shape)
         self.cumulativeSamples = np.cumsum(self.samples)
 
     def concat(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        import numpy as np
         return np.concatenate((first, second))
 
     def get_next_sample(self) -> float:
+        import numpy as np
         while self.cursor >= len(self.samples):
             new_samples = self.get_distribution_samples(self.scale, self.shape)
             self.samples = self.concat(self.samples, new_samples)
@@ -80,14 +101,16 @@ class DistributionGenerator:
         return delay
 
     def get_distribution_samples(self, scale: float, shape: float) -> np.ndarray:
+        import numpy as np
+        from scipy.stats import gamma, lognorm, norm, weibull_min
         if self.dist == 'LOGNORMAL':
-            return lognorm.rvs(s=shape, scale=np.exp(scale), size=self.SAMPLE_SIZE)
+            return lognorm.rvs(s=shape, scale=np.exp(scale), size=self.SAMPLE_SIZE, random_state=self.rng)
         elif self.dist == 'GAMMA':
-            return gamma.rvs(a=shape, scale=scale, size=self.SAMPLE_SIZE)
+            return gamma.rvs(a=shape, scale=scale, size=self.SAMPLE_SIZE, random_state=self.rng)
         elif self.dist == 'WEIBULL':
-            return weibull_min.rvs(c=shape, scale=scale, size=self.SAMPLE_SIZE)
+            return weibull_min.rvs(c=shape, scale=scale, size=self.SAMPLE_SIZE, random_state=self.rng)
         elif self.dist == 'NORMAL':
-            return norm.rvs(loc=scale, scale=shape, size=self.SAMPLE_SIZE)
+            return norm.rvs(loc=scale, scale=shape, size=self.SAMPLE_SIZE, random_state=self.rng)
         else:
             return np.array([])
 
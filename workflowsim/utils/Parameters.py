@@ -1,8 +1,15 @@
-from typing import List, Union
+from __future__ import annotations
+
+from typing import List, Union, TYPE_CHECKING
 from enum import Enum
+import random
+from cloudsim.context import SimulationContext
 from workflowsim.utils.ClusteringParameters import ClusteringParameters
 from workflowsim.utils.OverheadParameters import OverheadParameters
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class SchedulingAlgorithm:
     MAXMIN = 'MAXMIN'
@@ -31,6 +38,13 @@ class ClassType:
     STAGE_OUT = 3
     CLEAN_UP = 4
 
+class RandomStream:
+    # Independent random number streams derived from the master seed, drawing more
+    # numbers from one of them leaves the others unchanged
+    VM = 'VM'
+    OVERHEAD = 'OVERHEAD'
+    FAILURE = 'FAILURE'
+
 class CostModel:
     DATACENTER = 1
     VM = 2
@@ -56,13 +70,15 @@ class Parameters:
     maxDepth: int = 0
     runtime_scale: float = 1.0
     costModel: CostModel = CostModel.DATACENTER
+    # Master seed, None leaves every stream seeded from the OS
+    seed: int = None
 
     def __init__(self):
         pass
 
     @staticmethod
     def init(vm: int, dax: Union[str, List[str]], runtime: str, datasize: str, op: OverheadParameters, cp: ClusteringParameters, 
-             scheduler: SchedulingAlgorithm, planner: PlanningAlgorithm, rMethod: str, dl: int) -> None:
+             scheduler: SchedulingAlgorithm, planner: PlanningAlgorithm, rMethod: str, dl: int, seed: int = None) -> None:
         Parameters.cParams: ClusteringParameters = cp
         Parameters.vmNum: int = vm
         if (isinstance(dax, str)):
@@ -77,6 +93,8 @@ class Parameters:
         Parameters.reduceMethod: str = rMethod
         Parameters.deadline: float = dl
         Parameters.maxDepth: int = 0
+        Parameters.seed = seed
+        Parameters.seedOverheads()
 
     @staticmethod
     def getOverheadParams() -> OverheadParameters:
@@ -154,6 +172,45 @@ class Parameters:
     def setCostModel(model: CostModel) -> None:
         Parameters.costModel = model
 
+    @staticmethod
+    def setSeed(seed: int) -> None:
+        # Parameters.init resets it. Set it after init and before the failure parameters
+        # are initialized, their generators are bound to their streams then
+        Parameters.seed = seed
+        Parameters.seedOverheads()
+
+    @staticmethod
+    def getSeed() -> int:
+        return Parameters.seed
+
+    @staticmethod
+    def getStreamSeed(stream: str, *index: object) -> int:
+        # Derived from a hash of the master seed, the stream and the index rather than
+        # drawn in sequence, so a stream does not depend on the order streams are created
+        if Parameters.seed is None:
+            return None
+        key: str = "/".join(str(part) for part in (Parameters.seed, stream) + index)
+        return random.Random(key).getrandbits(63)
+
+    @staticmethod
+    def getRandom(stream: str, *index: object) -> random.Random:
+        return random.Random(Parameters.getStreamSeed(stream, *index))
+
+    @staticmethod
+    def getNumpyRandom(stream: str, *index: object) -> np.random.Generator:
+        import numpy as np
+        return np.random.default_rng(Parameters.getStreamSeed(stream, *index))
+
+    @staticmethod
+    def seedOverheads() -> None:
+        op: OverheadParameters = Parameters.oParams
+        if op is None or Parameters.seed is None:
+            return
+        for name, delays in (("WED", op.WED_DELAY), ("QUEUE", op.QUEUE_DELAY), ("POST", op.POST_DELAY),
+                             ("CLUST", op.CLUST_DELAY)):
+            for depth, generator in (delays or {}).items():
+                generator.set_rng(Parameters.getNumpyRandom(RandomStream.OVERHEAD, name, depth))
+
     @staticmethod
     def getRuntimeScale() -> float:
         return Parameters.runtime_scale
@@ -163,6 +220,11 @@ class Parameters:
         return Parameters.daxPaths
 
 
+SimulationContext.register(Parameters, ('schedulingAlgorithm', 'planningAlgorithm', 'reduceMethod', 'vmNum', 'daxPath',
+                                        'daxPaths', 'runtimePath', 'datasizePath', 'oParams', 'cParams', 'deadline',
+                                        'bandwidths', 'maxDepth', 'runtime_scale', 'costModel', 'seed'))
+
+
 # Example usage
 if __name__ == "__main__":
     params = Parameters.init(10, "path_to_dax", "path_to_runtime", "path_to_datasize",
@@ -1,8 +1,13 @@
 from __future__ import annotations
+from cloudsim.context import SimulationContext
 from workflowsim.FileItem import FileItem
-from typing import List, Dict
+from workflowsim.utils.Parameters import FileType
+from typing import List, Dict, TYPE_CHECKING
 from enum import Enum
 
+if TYPE_CHECKING:
+    from workflowsim.Task import Task
+
 class ReplicaCatalog:
     class FileSystem(Enum):
         NONE: int = -1
@@ -10,13 +15,17 @@ class ReplicaCatalog:
         LOCAL: int = 1
     fileSystem: FileSystem = FileSystem.NONE
     fileName2File: Dict[str, FileItem] = dict()
-    dataReplicaCatalog: Dict[str, List[str]] = dict()
-    
+    # file -> sites holding a replica and site -> files it holds. The dicts are
+    # used as insertion ordered sets so lookups are O(1) and iteration is deterministic
+    dataReplicaCatalog: Dict[str, Dict[str, None]] = dict()
+    site2files: Dict[str, Dict[str, None]] = dict()
+
     @staticmethod
     def init(fs: FileSystem):
         ReplicaCatalog.fileSystem = fs
         ReplicaCatalog.fileName2File = dict()
         ReplicaCatalog.dataReplicaCatalog = dict()
+        ReplicaCatalog.site2files = dict()
 
     @staticmethod
     def get_file_system() -> FileSystem :
@@ -36,13 +45,39 @@ class ReplicaCatalog:
 
     @staticmethod
     def get_storage_list(file:str) -> List[str]:
-        return ReplicaCatalog.dataReplicaCatalog[file]
+        return list(ReplicaCatalog.dataReplicaCatalog.get(file, ()))
+
+    @staticmethod
+    def get_files_at(site: str) -> List[str]:
+        return list(ReplicaCatalog.site2files.get(site, ()))
+
+    @staticmethod
+    def has_replica(file: str, site: str) -> bool:
+        return site in ReplicaCatalog.dataReplicaCatalog.get(file, ())
 
     @staticmethod
     def add_file_to_storage(file: str, storage: str) -> None:
-        if file not in ReplicaCatalog.dataReplicaCatalog:
-            ReplicaCatalog.dataReplicaCatalog[file] = []
+        sites: Dict[str, None] = ReplicaCatalog.dataReplicaCatalog.get(file)
+        if sites is None:
+            sites = ReplicaCatalog.dataReplicaCatalog[file] = dict()
+        if storage in sites:
+            return
+        sites[storage] = None
+        files: Dict[str, None] = ReplicaCatalog.site2files.get(storage)
+        if files is None:
+            files = ReplicaCatalog.site2files[storage] = dict()
+        files[file] = None
+
+    @staticmethod
+    def add_files_to_storage(fileList: List[str], storage: str) -> None:
+        for file in fileList:
+            ReplicaCatalog.add_file_to_storage(file, storage)
+
+    @staticmethod
+    def register_outputs(task: Task, storage: str) -> None:
+        # All output files of a finished task or job now have a replica at storage
+        ReplicaCatalog.add_files_to_storage([file.get_name() for file in task.get_fileList()
+                                             if file.get_type().value == FileType.OUTPUT], storage)
+
 
-        storage_list: List[str] = ReplicaCatalog.get_storage_list(file)
-        if storage not in storage_list:
-            storage_list.append(storage)
\ No newline at end of file
+SimulationContext.register(ReplicaCatalog, ('fileSystem', 'fileName2File', 'dataReplicaCatalog', 'site2files'))
@@ -1,14 +1,29 @@
 from __future__ import annotations
 
-from typing import List, Dict, cast
+import hashlib
+from typing import List, Dict, Tuple, cast
 from cloudsim.Consts import Consts
 from cloudsim.Log import Log
 from workflowsim.CondorVM import CondorVM
 from workflowsim.Job import Job
 from workflowsim.CustomVM import CustomVM
+from workflowsim.failure import FailureParameters
 
 
 class Metrics:
+    @staticmethod
+    def get_trace(jobs: List[Job]) -> List[Tuple[int, int, int, float, float]]:
+        # What two runs have to agree on, job by job in the order they were received
+        return [(j.get_cloudlet_id(), j.get_vm_id(), j.get_cloudlet_status(), j.get_exec_start_time(), j.get_finish_time())
+                for j in jobs]
+
+
+    @staticmethod
+    def get_trace_digest(jobs: List[Job]) -> str:
+        # repr keeps every bit of the times, equal digests mean identical traces
+        return hashlib.sha256(repr(Metrics.get_trace(jobs)).encode("utf-8")).hexdigest()
+
+
     @staticmethod
     def get_makespan(jobs: List[Job]) -> float:
         start: float = float('inf')
@@ -99,10 +114,53 @@ class Metrics:
         return energy
     
 
+    @staticmethod
+    def get_wasted_work(jobs: List[Job]) -> float:
+        # Seconds of execution lost to failures and executed again
+        wasted: float = 0.0
+        for j in jobs:
+            wasted += j.get_wasted_time()
+        return wasted
+
+
+    @staticmethod
+    def get_recovered_work(jobs: List[Job]) -> float:
+        # Seconds of execution of failed jobs that retries did not have to redo
+        recovered: float = 0.0
+        for j in jobs:
+            recovered += j.get_recovered_time()
+        return recovered
+
+
+    @staticmethod
+    def get_datacenter_breakdown(jobs: List[Job], vms: List[CustomVM]) -> Dict[int, Dict[str, float]]:
+        # Jobs, makespan, busy time and cost of every datacenter that ran some of the jobs
+        groups: Dict[int, List[Job]] = dict()
+        for j in jobs:
+            groups.setdefault(j.get_resource_id(), []).append(j)
+        breakdown: Dict[int, Dict[str, float]] = dict()
+        for datacenterId, datacenterJobs in groups.items():
+            breakdown[datacenterId] = {
+                "jobs": len(datacenterJobs),
+                "makespan": Metrics.get_makespan(datacenterJobs),
+                "cpuTime": sum(j.get_actual_cpu_time() for j in datacenterJobs),
+                "cost": Metrics.get_cost(vms, datacenterJobs),
+            }
+        return breakdown
+
+
     @staticmethod
     def print_matrices(jobs: List[Job], vms: List[CustomVM]):
         Log.print_line("Makesapn: " + str(Metrics.get_makespan(jobs)))
         Log.print_line("Energy: " + str(Metrics.get_energy_consumed(jobs, vms)))
         Log.print_line("Utilization: " + str(Metrics.get_utilization(jobs, vms)))
         Log.print_line("Costs: " + str(Metrics.get_cost(vms, jobs)))
+        if FailureParameters.get_failure_generator_mode() != FailureParameters.FTCFailure.FAILURE_NONE:
+            Log.print_line("Wasted work: " + str(Metrics.get_wasted_work(jobs)))
+            Log.print_line("Recovered work: " + str(Metrics.get_recovered_work(jobs)))
+        breakdown: Dict[int, Dict[str, float]] = Metrics.get_datacenter_breakdown(jobs, vms)
+        if len(breakdown) > 1:
+            for datacenterId, values in sorted(breakdown.items()):
+                Log.print_line(f"Datacenter #{datacenterId}: jobs {values['jobs']}, makespan {values['makespan']}, "
+                               f"cpu time {values['cpuTime']}, cost {values['cost']}")
         Log.print_line("==========================================================")
\ No newline at end of file